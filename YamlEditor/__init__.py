@@ -1,3 +1,11 @@
 # init.py
-from .editor_window import GitHubActionsEditor
-__all__ = ['GitHubActionsEditor']
\ No newline at end of file
+# The editor window pulls in PyQt5, so it is only imported on first use.
+# This keeps Qt-free modules (preset_io, cli) importable without Qt.
+__all__ = ['GitHubActionsEditor']
+
+
+def __getattr__(name):
+    if name == 'GitHubActionsEditor':
+        from .editor_window import GitHubActionsEditor
+        return GitHubActionsEditor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
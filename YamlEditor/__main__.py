@@ -0,0 +1,5 @@
+import sys
+from YamlEditor.cli import main
+
+if __name__ == "__main__":
+    sys.exit(main())
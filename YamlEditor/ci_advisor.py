@@ -0,0 +1,537 @@
+import functools
+import re
+from collections import namedtuple
+from YamlEditor.job_data import Job, Step, steps_to_data
+from YamlEditor.job_graph import (
+    JOB_OVERHEAD_SECONDS, USES_STEP_SECONDS, estimate_duration, format_duration
+)
+from YamlEditor.matrix import effective_job_count, job_matrix
+from YamlEditor.preset_io import job_ids
+from YamlEditor.step_store import steps_digest
+from YamlEditor.undo_history import JobEdit
+
+# ----------------------------------------------------------------------
+# ci_advisor
+#    - Finds configurations in a preset that waste CI time and proposes
+#      a rewrite for each:
+#        "cache"         dependency installs with nothing caching them
+#        "shallow"       full-history checkouts no step appears to need
+#        "concurrency"   jobs that keep running when a newer push
+#                        supersedes them
+#        "shared-setup"  the same checkout + dependency install repeated
+#                        by several jobs; installed once upstream and
+#                        handed to them as an artifact
+#    - Savings are rough estimates of runner seconds per workflow run
+#      (matrix jobs count once per combination)
+#    - Rewrites are JobEdits against the job list the finding was made
+#      from, so they apply (and undo) like any other edit
+#    - No Qt imports
+# ----------------------------------------------------------------------
+
+# Kinds found from one job alone, and from the whole preset
+JOB_KINDS = ("cache", "shallow", "concurrency")
+KINDS = JOB_KINDS + ("shared-setup",)
+
+# Savings estimates (seconds)
+CACHE_SAVED_SECONDS = 45        # a dependency install with a warm cache
+FULL_HISTORY_SECONDS = 15       # fetching the whole history vs. one commit
+INSTALL_STEP_SECONDS = 60       # a dependency install without a cache
+ARTIFACT_SECONDS = 10           # uploading or downloading an artifact
+SUPERSEDED_SHARE = 0.2          # share of runs a newer push supersedes
+
+# A setup sequence needs this many jobs to be worth its own job
+MIN_SHARED_SETUP_JOBS = 3
+
+# A finding:
+#   kind      one of KINDS
+#   indices   positions of the jobs it concerns
+#   jobs      those jobs, as analyzed (a rewrite only applies to them)
+#   title     short imperative name of the rewrite
+#   message   what was found
+#   seconds   estimated runner seconds saved per workflow run
+#   data      what the rewrite needs (per kind)
+Finding = namedtuple("Finding", ["kind", "indices", "jobs", "title", "message", "seconds", "data"])
+
+
+class StaleFinding(Exception):
+    """The jobs a finding was made from have changed since."""
+
+
+# ----------------------------------------------------------------------
+# Dependency installs
+# ----------------------------------------------------------------------
+# ecosystem -> (install command pattern, setup action, `with` enabling its
+# cache, cache paths, lock files)
+ECOSYSTEMS = {
+    "pip": (r"\bpip3?\s+install\b(?!\s+(?:-U|--upgrade)\s+pip\s*$)", "actions/setup-python",
+            {"cache": "pip"}, "~/.cache/pip", "**/requirements*.txt"),
+    "poetry": (r"\bpoetry\s+install\b", "actions/setup-python",
+               {"cache": "poetry"}, "~/.cache/pypoetry", "**/poetry.lock"),
+    "npm": (r"\bnpm\s+(?:ci|install|i)\b", "actions/setup-node",
+            {"cache": "npm"}, "~/.npm", "**/package-lock.json"),
+    "yarn": (r"^\s*yarn(?:\s+install)?(?:\s+--?[\w-]+)*\s*$", "actions/setup-node",
+             {"cache": "yarn"}, "~/.cache/yarn", "**/yarn.lock"),
+    "pnpm": (r"\bpnpm\s+(?:install|i)\b", "actions/setup-node",
+             {"cache": "pnpm"}, "~/.local/share/pnpm/store", "**/pnpm-lock.yaml"),
+    "bundler": (r"\bbundle\s+install\b", "ruby/setup-ruby",
+                {"bundler-cache": True}, "vendor/bundle", "**/Gemfile.lock"),
+    "go": (r"\bgo\s+(?:mod\s+download|build|test)\b", "actions/setup-go",
+           {"cache": True}, "~/go/pkg/mod", "**/go.sum"),
+    "maven": (r"\bmvnw?\b", "actions/setup-java",
+              {"cache": "maven"}, "~/.m2/repository", "**/pom.xml"),
+    "gradle": (r"\bgradlew?\b", "actions/setup-java",
+               {"cache": "gradle"}, "~/.gradle/caches", "**/*.gradle*"),
+    "cargo": (r"\bcargo\s+(?:build|test|fetch)\b", None,
+              None, "~/.cargo/registry", "**/Cargo.lock"),
+}
+_INSTALL_PATTERNS = {
+    eco: re.compile(spec[0], re.MULTILINE) for eco, spec in ECOSYSTEMS.items()
+}
+
+# Installs that write into the workspace (node_modules), so their result
+# can be handed to other jobs as an artifact
+_WORKSPACE_INSTALLS = ("npm", "yarn", "pnpm")
+WORKSPACE_INSTALL_PATH = "node_modules"
+
+# Steps that read the git history, so a full checkout is needed
+_NEEDS_HISTORY = re.compile(
+    r"\bgit\s+(?:describe|log|rev-list|shortlog|blame|merge-base|diff|tag)\b"
+    r"|setuptools[_-]scm|versioneer|dunamai|semantic-release|gitversion"
+    r"|changelog|git-cliff|commitlint|changed-files|sonar",
+    re.IGNORECASE,
+)
+
+# Jobs that must not be cancelled half way
+_DEPLOYMENT = re.compile(r"deploy|release|publish", re.IGNORECASE)
+
+
+def _action(step):
+    """'owner/repo' of a `uses:` step (no version), or None."""
+    if type(step) is not Step or not isinstance(step.uses, str):
+        return None
+    return step.uses.split("@", 1)[0]
+
+
+def _is_checkout(step):
+    return _action(step) == "actions/checkout"
+
+
+def _run(step):
+    return step.run if type(step) is Step and isinstance(step.run, str) else ""
+
+
+_ANY_INSTALL = re.compile("|".join(f"(?:{spec[0]})" for spec in ECOSYSTEMS.values()),
+                          re.MULTILINE)
+
+
+@functools.lru_cache(maxsize=4096)
+def _installs_in(run):
+    if _ANY_INSTALL.search(run) is None:
+        return ()
+    return tuple(eco for eco, pattern in _INSTALL_PATTERNS.items() if pattern.search(run))
+
+
+def installs(step):
+    """The ecosystems whose dependencies a `run:` step installs."""
+    run = _run(step)
+    return _installs_in(run) if run else ()
+
+
+def _job_steps(job):
+    return job.steps if type(job.steps) is tuple else ()
+
+
+def _runner_count(job):
+    return effective_job_count(job) or 1
+
+
+def _with(step, **changes):
+    """step with its `with:` entries changed (None removes one)."""
+    data = step.to_dict()
+    with_ = dict(data.get("with") or {})
+    for key, value in changes.items():
+        if value is None:
+            with_.pop(key, None)
+        else:
+            with_[key] = value
+    if with_:
+        data["with"] = with_
+    else:
+        data.pop("with", None)
+    return Step.from_dict(data)
+
+
+def _with_keys(job, **changes):
+    """job with extra (non-slot) keys set, e.g. needs or concurrency."""
+    data = job.to_dict()
+    for key, value in changes.items():
+        data[key.replace("_", "-")] = value
+    return Job.from_dict(data)
+
+
+# ----------------------------------------------------------------------
+# Per-job checks
+# ----------------------------------------------------------------------
+def _caches(step, eco):
+    """True if an actions/cache step appears to cover eco's dependencies."""
+    _pattern, _setup, _enable, path, lock = ECOSYSTEMS[eco]
+    text = str(step.with_ or "")
+    return path in text or lock.rsplit("/", 1)[-1].strip("*").split("*")[0] in text
+
+
+def _setup_caches(step, enable):
+    with_ = step.with_ or {}
+    if any(key in with_ for key in enable):
+        return True     # set explicitly, possibly to off; respect it
+    # setup-go caches by default since v4
+    version = step.uses.partition("@")[2]
+    return _action(step) == "actions/setup-go" and not re.match(r"v[123]\b", version)
+
+
+def _uncached_installs(steps):
+    """[(ecosystem, index of its setup step or None, index of the install)]"""
+    caches = [s for s in steps if _action(s) in ("actions/cache", "actions/cache/restore")]
+    found = []
+    seen = set()
+    for position, step in enumerate(steps):
+        for eco in installs(step):
+            if eco in seen:
+                continue
+            seen.add(eco)
+            if any(_caches(s, eco) for s in caches):
+                continue
+            setup, enable = ECOSYSTEMS[eco][1:3]
+            setup_at = None
+            for i, s in enumerate(steps[:position]):
+                if setup is not None and _action(s) == setup:
+                    setup_at = i
+            if setup_at is not None and _setup_caches(steps[setup_at], enable):
+                continue
+            found.append((eco, setup_at, position))
+    return found
+
+
+def _full_checkouts(steps):
+    """Indexes of full-history checkouts, if no step appears to need them."""
+    full = tuple(i for i, s in enumerate(steps)
+                 if _is_checkout(s) and str((s.with_ or {}).get("fetch-depth")) == "0")
+    if full:
+        for step in steps:
+            if _NEEDS_HISTORY.search(_run(step)) or _NEEDS_HISTORY.search(_action(step) or ""):
+                return ()
+    return full
+
+
+def _memo(memo, check, steps):
+    """check(steps), computed once per steps tuple (jobs often share one)."""
+    key = (check, id(steps))
+    result = memo.get(key)
+    if result is None:
+        result = memo[key] = check(steps)
+    return result
+
+
+def _cache_findings(index, job, memo):
+    found = []
+    for eco, setup_at, position in _memo(memo, _uncached_installs, _job_steps(job)):
+        if setup_at is not None:
+            title = f"Enable {eco} caching in {ECOSYSTEMS[eco][1]}"
+        else:
+            title = f"Cache {eco} dependencies"
+        found.append(Finding(
+            "cache", (index,), (job,), title,
+            f"{_job_label(job, index)}: `{eco}` dependencies are installed without a cache",
+            CACHE_SAVED_SECONDS * _runner_count(job),
+            (eco, setup_at, position),
+        ))
+    return found
+
+
+def _shallow_findings(index, job, memo):
+    full = _memo(memo, _full_checkouts, _job_steps(job))
+    if not full:
+        return []
+    return [Finding(
+        "shallow", (index,), (job,), "Check out only the latest commit",
+        f"{_job_label(job, index)}: checks out the full history (fetch-depth: 0), "
+        "which no step appears to use",
+        FULL_HISTORY_SECONDS * len(full) * _runner_count(job),
+        full,
+    )]
+
+
+def _concurrency_findings(index, job, jid):
+    if "environment" in job or _DEPLOYMENT.search(str(job.name)):
+        return []
+    concurrency = job.get("concurrency")
+    if isinstance(concurrency, dict) and "cancel-in-progress" in concurrency:
+        return []
+    if concurrency is not None and not isinstance(concurrency, (dict, str)):
+        return []
+    seconds = estimate_duration(job) * _runner_count(job) * SUPERSEDED_SHARE
+    if concurrency is None:
+        message = "has no concurrency group; superseded runs keep running"
+    else:
+        message = "has a concurrency group without cancel-in-progress"
+    return [Finding(
+        "concurrency", (index,), (job,), "Cancel superseded pull request runs",
+        f"{_job_label(job, index)}: {message}",
+        round(seconds),
+        jid,
+    )]
+
+
+# ----------------------------------------------------------------------
+# Shared setup
+# ----------------------------------------------------------------------
+def _setup_sequence(job):
+    """
+    (checkout, setup) of a job that starts by checking out and installing
+    workspace dependencies: the leading checkout steps and the `uses:`
+    steps up to and including the first such install. None otherwise.
+    """
+    if any(key in job for key in ("strategy", "container", "services", "needs", "if")):
+        return None
+    steps = _job_steps(job)
+    n = 0
+    while n < len(steps) and _is_checkout(steps[n]):
+        n += 1
+    if n == 0:
+        return None
+    for i in range(n, len(steps)):
+        step = steps[i]
+        if type(step) is not Step:
+            return None
+        if any(eco in _WORKSPACE_INSTALLS for eco in installs(step)):
+            # The install is replaced by the artifact, so it must do nothing else
+            if set(step.keys()) - {"name", "run"}:
+                return None
+            for line in step.run.splitlines():
+                if line.strip() and not any(
+                    _INSTALL_PATTERNS[eco].search(line) for eco in _WORKSPACE_INSTALLS
+                ):
+                    return None
+            return steps[:n], steps[n:i + 1]
+        if step.uses is None or _is_checkout(step):
+            return None     # other work before the install
+    return None
+
+
+def _shared_setup_findings(jobs):
+    groups = {}     # (runner, digest) -> [job index]
+    for i, job in enumerate(jobs):
+        split = _setup_sequence(job)
+        if split is None:
+            continue
+        checkout, setup = split
+        runs_on = job.runs_on if isinstance(job.runs_on, str) else repr(job.runs_on)
+        key = (runs_on, steps_digest(steps_to_data(checkout + setup)))
+        groups.setdefault(key, []).append(i)
+
+    ids = taken = None
+    found = []
+    for (_runs_on, digest), users in groups.items():
+        if len(users) < MIN_SHARED_SETUP_JOBS:
+            continue
+        checkout, setup = _setup_sequence(jobs[users[0]])
+        upstream = (JOB_OVERHEAD_SECONDS + USES_STEP_SECONDS * (len(checkout) + len(setup) - 1)
+                    + INSTALL_STEP_SECONDS + ARTIFACT_SECONDS)
+        seconds = len(users) * (INSTALL_STEP_SECONDS - ARTIFACT_SECONDS) - upstream
+        if seconds <= 0:
+            continue
+        if ids is None:
+            ids = job_ids(jobs)
+            taken = set(ids)
+        name = "deps-" + digest.hex()[:8]
+        if name in taken:
+            continue
+        found.append(Finding(
+            "shared-setup", tuple(users), tuple(jobs[i] for i in users),
+            "Install dependencies once for these jobs",
+            f"{len(users)} jobs ({', '.join(ids[i] for i in users[:3])}"
+            f"{', ...' if len(users) > 3 else ''}) check out and install the same "
+            "dependencies; one upstream job could install them and share them as an artifact",
+            seconds,
+            name,
+        ))
+    return found
+
+
+# ----------------------------------------------------------------------
+# Analysis
+# ----------------------------------------------------------------------
+def _job_label(job, index):
+    return job.name if job.name else f"job {index + 1}"
+
+
+def analyze(jobs, kinds=KINDS, indices=None):
+    """
+    Findings for a preset's jobs, largest estimated saving first. With
+    indices, only findings concerning those jobs.
+    """
+    kinds = set(kinds)
+    found = []
+    memo = {}
+    ids = job_ids(jobs) if "concurrency" in kinds else None
+    for i in range(len(jobs)) if indices is None else indices:
+        job = jobs[i]
+        if "cache" in kinds:
+            found.extend(_cache_findings(i, job, memo))
+        if "shallow" in kinds:
+            found.extend(_shallow_findings(i, job, memo))
+        if "concurrency" in kinds:
+            found.extend(_concurrency_findings(i, job, ids[i]))
+    if "shared-setup" in kinds:
+        shared = _shared_setup_findings(jobs)
+        if indices is not None:
+            wanted = set(indices)
+            shared = [f for f in shared if wanted.intersection(f.indices)]
+        found.extend(shared)
+    found.sort(key=lambda f: -f.seconds)
+    return found
+
+
+def total_seconds(findings):
+    return sum(f.seconds for f in findings)
+
+
+def format_finding(finding):
+    return f"[{finding.kind}] {finding.message} (saves ~{format_duration(finding.seconds)}/run)"
+
+
+# ----------------------------------------------------------------------
+# Rewrites
+# ----------------------------------------------------------------------
+def _cache_step(eco):
+    _pattern, _setup, _enable, path, lock = ECOSYSTEMS[eco]
+    prefix = "${{ runner.os }}-" + eco + "-"
+    return Step.from_dict({
+        "name": f"Cache {eco} dependencies",
+        "uses": "actions/cache@v4",
+        "with": {
+            "path": path,
+            "key": prefix + "${{ hashFiles('" + lock + "') }}",
+            "restore-keys": prefix,
+        },
+    })
+
+
+def _rewrite_job(finding, job):
+    steps = list(_job_steps(job))
+    if finding.kind == "cache":
+        eco, setup_at, position = finding.data
+        enable = ECOSYSTEMS[eco][2]
+        if setup_at is not None:
+            steps[setup_at] = _with(steps[setup_at], **enable)
+        else:
+            steps.insert(position, _cache_step(eco))
+        return job.replace(steps=tuple(steps))
+    if finding.kind == "shallow":
+        for i in finding.data:
+            steps[i] = _with(steps[i], **{"fetch-depth": None})
+        return job.replace(steps=tuple(steps))
+    # concurrency
+    concurrency = job.get("concurrency")
+    if isinstance(concurrency, str):
+        concurrency = {"group": concurrency}
+    elif not isinstance(concurrency, dict):
+        # github.job is not set at job level, so the group names the job
+        # by its id
+        group = "${{ github.workflow }}-${{ github.ref }}-" + finding.data
+        if job_matrix(job) is not None:
+            # Without it the matrix's own jobs would cancel each other
+            group += "-${{ strategy.job-index }}"
+        concurrency = {"group": group}
+    concurrency = dict(concurrency)
+    concurrency["cancel-in-progress"] = "${{ github.event_name == 'pull_request' }}"
+    return _with_keys(job, concurrency=concurrency)
+
+
+def _rewrite_shared_setup(finding, jobs):
+    name = finding.data
+    first = jobs[finding.indices[0]]
+    checkout, setup = _setup_sequence(first)
+    archive = WORKSPACE_INSTALL_PATH + ".tar"
+    # Artifacts drop file modes (node_modules/.bin), so the install is
+    # shipped as a tarball
+    upstream = Job.from_dict({
+        "name": name,
+        "runs-on": first.to_dict()["runs-on"],
+        "steps": steps_to_data(checkout + setup) + [
+            {"name": "Pack dependencies", "run": f"tar -cf {archive} {WORKSPACE_INSTALL_PATH}"},
+            {"uses": "actions/upload-artifact@v4",
+             "with": {"name": name, "path": archive, "retention-days": 1}},
+        ],
+    })
+    fetch = (
+        Step.from_dict({"uses": "actions/download-artifact@v4", "with": {"name": name}}),
+        Step.from_dict({"name": "Unpack dependencies",
+                        "run": f"tar -xf {archive} && rm {archive}"}),
+    )
+    at = finding.indices[0]
+    edits = [JobEdit("add", at, None, upstream)]
+    for index, job in zip(finding.indices, finding.jobs):
+        checkout, setup = _setup_sequence(job)
+        n = len(checkout) + len(setup)
+        steps = checkout + setup[:-1] + fetch + _job_steps(job)[n:]
+        data = job.replace(steps=steps).to_dict()
+        data["needs"] = [name]
+        edits.append(JobEdit("replace", index + 1, job, Job.from_dict(data)))
+    return edits
+
+
+def is_current(jobs, finding):
+    """True if the jobs finding concerns are still in jobs, unchanged."""
+    return all(index < len(jobs) and jobs[index] is job
+               for index, job in zip(finding.indices, finding.jobs))
+
+
+def rewrite(jobs, finding):
+    """
+    The JobEdits (applied in order) that carry out finding's rewrite on
+    jobs. Raises StaleFinding if the jobs it concerns have changed.
+    """
+    if not is_current(jobs, finding):
+        raise StaleFinding(finding.title)
+    if finding.kind == "shared-setup":
+        return _rewrite_shared_setup(finding, jobs)
+    index, job = finding.indices[0], finding.jobs[0]
+    return [JobEdit("replace", index, job, _rewrite_job(finding, job))]
+
+
+def apply_edits(jobs, edits):
+    for kind, index, _old, new in edits:
+        if kind == "add":
+            jobs.insert(index, new)
+        elif kind == "remove":
+            del jobs[index]
+        else:
+            jobs[index] = new
+    return jobs
+
+
+def fix_all(jobs, kinds=KINDS):
+    """
+    Apply the rewrite of every finding of the given kinds.
+    Returns (new jobs list, the findings applied).
+    """
+    jobs = list(jobs)
+    applied = []
+    # The job a shared setup adds gets the other rewrites too
+    for kind in ("shared-setup", "cache", "shallow", "concurrency"):
+        if kind not in kinds:
+            continue
+        findings = analyze(jobs, (kind,))
+        while findings:
+            if kind == "shared-setup":
+                # Inserts a job, moving the others' jobs
+                batch = findings[:1]
+            else:
+                # One per job; a job's other findings of the kind (cache of
+                # several ecosystems) are found again after it
+                batch = list({f.indices[0]: f for f in reversed(findings)}.values())
+            for finding in batch:
+                apply_edits(jobs, rewrite(jobs, finding))
+            applied.extend(batch)
+            findings = analyze(jobs, (kind,))
+    return jobs, applied
@@ -0,0 +1,317 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from YamlEditor import ci_advisor, preset_io
+from YamlEditor.matrix import DEFAULT_MATRIX_BUDGET
+from YamlEditor.step_store import DEFAULT_ACTIONS_DIR
+
+# ----------------------------------------------------------------------
+# cli
+#    - Headless entry point: python -m YamlEditor compile SRC_DIR OUT_DIR
+#                            python -m YamlEditor graph PRESET
+#                            python -m YamlEditor advise PRESET
+#                            python -m YamlEditor validate PRESET...
+#    - Never imports PyQt5
+# ----------------------------------------------------------------------
+
+# Bump when the generated output changes, so cached outputs are rebuilt
+COMPILER_VERSION = 1
+
+# Per output directory record of what each output was built from
+MANIFEST_NAME = ".preset-manifest.json"
+
+PRESET_EXTENSIONS = (".yaml", ".yml")
+
+
+def _find_presets(source_dir, recursive):
+    """Return the sorted preset files under source_dir."""
+    found = []
+    if recursive:
+        for root, _dirs, files in os.walk(source_dir):
+            for f in files:
+                if f.endswith(PRESET_EXTENSIONS):
+                    found.append(os.path.join(root, f))
+    else:
+        for f in os.listdir(source_dir):
+            path = os.path.join(source_dir, f)
+            if f.endswith(PRESET_EXTENSIONS) and os.path.isfile(path):
+                found.append(path)
+    return sorted(found)
+
+
+def _output_name(source_dir, preset_file, output_dir):
+    """Mirror the preset's path relative to source_dir under output_dir."""
+    rel = os.path.relpath(preset_file, source_dir)
+    return os.path.join(output_dir, os.path.splitext(rel)[0] + ".yml")
+
+
+def _file_digest(file_name):
+    """sha256 of the file's content, as preset_io reports it for a load."""
+    h = hashlib.sha256()
+    with open(file_name, "rb") as f:
+        for chunk in iter(lambda: f.read(preset_io.READ_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _load_manifest(output_dir):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_NAME), "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(output_dir, manifest):
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def _compile_one(preset_file, output_name, triggers, dedup, actions_dir):
+    """
+    Worker entry point; must stay top-level so it can be pickled.
+    Returns the digest of the preset content that was compiled.
+    """
+    os.makedirs(os.path.dirname(output_name) or ".", exist_ok=True)
+    info = {}
+    preset_io.compile_preset_file(
+        preset_file, output_name, triggers, dedup, actions_dir, info=info
+    )
+    return info["content_hash"]
+
+
+def compile_directory(source_dir, output_dir, workers=None, triggers=None,
+                      recursive=False, force=False, log=print, dedup=None,
+                      actions_dir=DEFAULT_ACTIONS_DIR):
+    """
+    Compile every preset in source_dir into a workflow file in output_dir.
+    Presets whose content (and compile settings) did not change since the
+    last run are skipped. Returns (compiled, skipped, failed) counts.
+    dedup and actions_dir are passed to preset_io.compile_preset_file().
+    """
+    triggers = list(triggers or preset_io.DEFAULT_TRIGGERS)
+    settings_key = json.dumps([COMPILER_VERSION, triggers, dedup, actions_dir])
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = {} if force else _load_manifest(output_dir)
+    new_manifest = {}
+
+    # Decide what needs building. Size and mtime are checked first so an
+    # untouched file is skipped without being hashed.
+    pending = []
+    skipped = 0
+    for preset_file in _find_presets(source_dir, recursive):
+        output_name = _output_name(source_dir, preset_file, output_dir)
+        key = os.path.relpath(output_name, output_dir)
+        st = os.stat(preset_file)
+        entry = manifest.get(key)
+        up_to_date = False
+        if entry and entry.get("settings") == settings_key and os.path.exists(output_name):
+            if entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+                up_to_date = True
+            else:
+                digest = _file_digest(preset_file)
+                up_to_date = entry.get("digest") == digest
+                entry = dict(entry, size=st.st_size, mtime_ns=st.st_mtime_ns)
+        if up_to_date:
+            new_manifest[key] = entry
+            skipped += 1
+        else:
+            pending.append((preset_file, output_name, key, st))
+
+    compiled = failed = 0
+
+    # The digest is of the bytes the compile read: if the file changed
+    # since it was stat'ed, the next run sees the difference
+    def record(preset_file, key, st, digest):
+        new_manifest[key] = {
+            "source": preset_file,
+            "settings": settings_key,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "digest": digest,
+        }
+
+    if workers == 1 or len(pending) <= 1:
+        for preset_file, output_name, key, st in pending:
+            try:
+                digest = _compile_one(preset_file, output_name, triggers, dedup, actions_dir)
+            except Exception as e:
+                failed += 1
+                log(f"error: {preset_file}: {e}")
+            else:
+                compiled += 1
+                record(preset_file, key, st, digest)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(_compile_one, preset_file, output_name, triggers, dedup, actions_dir):
+                    (preset_file, output_name, key, st)
+                for preset_file, output_name, key, st in pending
+            }
+            for future in as_completed(futures):
+                preset_file, output_name, key, st = futures[future]
+                try:
+                    digest = future.result()
+                except Exception as e:
+                    failed += 1
+                    log(f"error: {preset_file}: {e}")
+                else:
+                    compiled += 1
+                    record(preset_file, key, st, digest)
+
+    _save_manifest(output_dir, new_manifest)
+    return compiled, skipped, failed
+
+
+# ----------------------------------------------------------------------
+# Command line
+# ----------------------------------------------------------------------
+def _positive_int(text):
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {text!r}")
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+
+def _cmd_compile(args):
+    if os.path.isabs(args.actions_dir) or ".." in args.actions_dir.split(os.sep):
+        print("error: --actions-dir must be inside the repository (a relative path)",
+              file=sys.stderr)
+        return 2
+    compiled, skipped, failed = compile_directory(
+        args.source_dir, args.output_dir,
+        workers=args.workers,
+        triggers=args.on,
+        recursive=args.recursive,
+        force=args.force,
+        dedup=args.dedup,
+        actions_dir=args.actions_dir,
+    )
+    print(f"compiled {compiled}, skipped {skipped} unchanged, failed {failed}")
+    return 1 if failed else 0
+
+
+def _cmd_graph(args):
+    from YamlEditor.job_graph import JobGraph, format_duration
+    from YamlEditor.matrix import PresetJobCount
+    _preset_name, jobs = preset_io.load_preset_file(args.preset)
+    graph = JobGraph(jobs)
+    analysis = graph.analyze(concurrency=args.runners or None)
+    job_count = PresetJobCount(jobs, args.matrix_budget)
+    print(analysis.summary())
+    print(job_count.summary())
+    for v, count in job_count.over_budget:
+        print(f"matrix over budget: {graph.ids[v]} expands to {count} jobs")
+    for cycle in graph.cycles:
+        print("cycle: " + " -> ".join(graph.ids[v] for v in cycle))
+    for v, ref in graph.missing:
+        print(f"unknown needs: {graph.ids[v]} needs {ref!r}")
+    if analysis.critical_path:
+        print("critical path:")
+        for v in analysis.critical_path:
+            print(f"  {graph.ids[v]:<40} start {format_duration(analysis.earliest_start[v]):>8}"
+                  f"  duration {format_duration(analysis.duration[v]):>8}")
+    return 1 if graph.cycles else 0
+
+
+def _cmd_advise(args):
+    from YamlEditor.job_graph import format_duration
+    kinds = args.kind or ci_advisor.KINDS
+    preset_name, jobs = preset_io.load_preset_file(args.preset)
+    findings = ci_advisor.analyze(jobs, kinds)
+    for finding in findings:
+        print(ci_advisor.format_finding(finding))
+    print(f"{len(findings)} finding(s), ~{format_duration(ci_advisor.total_seconds(findings))} "
+          "of runner time saved per run (estimated)")
+    if args.fix and findings:
+        jobs, applied = ci_advisor.fix_all(jobs, kinds)
+        output = args.output or args.preset
+        preset_io.save_preset_file(output, preset_name, jobs)
+        print(f"applied {len(applied)} rewrite(s) to {output}")
+    return 0
+
+
+def _cmd_validate(args):
+    from YamlEditor.schema_validator import PresetValidator, format_problem, summarize
+    validator = PresetValidator(workers=args.workers)
+    failed = False
+    try:
+        for preset_file in args.presets:
+            _preset_name, jobs = preset_io.load_preset_file(preset_file)
+            results = validator.validate(jobs)
+            for job_id, problems in zip(preset_io.job_ids(jobs), results):
+                for problem in problems:
+                    print(f"{preset_file}: {job_id}: {format_problem(problem)}")
+            print(f"{preset_file}: {summarize(results)}")
+            failed = failed or any(results)
+    finally:
+        validator.close()
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m YamlEditor",
+        description="Headless tools for GitHub Actions presets."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("compile", help="Compile a directory of presets into workflow files.")
+    p.add_argument("source_dir", help="Directory containing preset .yaml/.yml files")
+    p.add_argument("output_dir", help="Directory to write workflow files to")
+    p.add_argument("-j", "--workers", type=_positive_int, default=None,
+                   help="Worker processes (default: CPU count, 1 = no pool)")
+    p.add_argument("--on", action="append", metavar="EVENT",
+                   help="Workflow trigger event; repeatable (default: push)")
+    p.add_argument("-r", "--recursive", action="store_true",
+                   help="Also compile presets in subdirectories")
+    p.add_argument("-f", "--force", action="store_true",
+                   help="Rebuild every output, even if its preset is unchanged")
+    p.add_argument("--dedup", choices=preset_io.DEDUP_MODES, default=None,
+                   help="Write steps repeated across jobs once: as YAML anchors, or as "
+                        "local composite actions")
+    p.add_argument("--actions-dir", default=DEFAULT_ACTIONS_DIR,
+                   help="Where --dedup composite writes actions, relative to the "
+                        f"repository root (the current directory; default: {DEFAULT_ACTIONS_DIR})")
+    p.set_defaults(func=_cmd_compile)
+
+    p = sub.add_parser("graph", help="Analyze a preset's needs graph and critical path.")
+    p.add_argument("preset", help="Preset .yaml/.yml file")
+    p.add_argument("-n", "--runners", type=int, default=0,
+                   help="Concurrent runner limit (default: unlimited)")
+    p.add_argument("--matrix-budget", type=int, default=DEFAULT_MATRIX_BUDGET,
+                   help="Flag matrices and presets expanding to more runner jobs "
+                        f"(default: {DEFAULT_MATRIX_BUDGET}, 0 = no limit)")
+    p.set_defaults(func=_cmd_graph)
+
+    p = sub.add_parser("advise", help="Find CI time wasted by a preset and suggest rewrites.")
+    p.add_argument("preset", help="Preset .yaml/.yml file")
+    p.add_argument("-k", "--kind", action="append", choices=ci_advisor.KINDS,
+                   help="Only this kind of finding; repeatable (default: all)")
+    p.add_argument("--fix", action="store_true",
+                   help="Apply every rewrite and save the preset")
+    p.add_argument("-o", "--output", default=None,
+                   help="With --fix, write the rewritten preset here (default: in place)")
+    p.set_defaults(func=_cmd_advise)
+
+    p = sub.add_parser("validate", help="Check presets' jobs against the workflow schema.")
+    p.add_argument("presets", nargs="+", metavar="preset", help="Preset .yaml/.yml file")
+    p.add_argument("-j", "--workers", type=_positive_int, default=None,
+                   help="Worker processes for large presets (default: CPU count, 1 = no pool)")
+    p.set_defaults(func=_cmd_validate)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,333 @@
+import json
+import os
+import threading
+import zlib
+from YamlEditor.job_data import Job
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+    import msvcrt
+
+# ----------------------------------------------------------------------
+# edit_journal
+#    - Append-only log of edits to the presets, so unsaved work survives
+#      closing the editor or a crash
+#    - One line per record: "<crc32> <json>\n". A torn or corrupt tail
+#      (crash mid-write) is dropped when the journal is opened
+#    - Records are buffered and written + fsync'd in batches on a
+#      background thread
+#    - Only the records still needed for recovery are kept in memory;
+#      the file is rewritten with just those (compacted) once it has
+#      grown well past them
+#    - Each open journal is owned by one editor process (an exclusive lock
+#      on "<journal>.lock"); another editor running at the same time
+#      writes "journal-2.log" and so on, and recovers from the first file
+#      no running editor owns
+#    - No Qt imports; YAML support is imported only when a record needs
+#      it, so opening the journal at startup stays cheap
+#
+# Records (rev is the editor's edit revision of the preset after the edit):
+#    ["new", name, rev]                 an empty preset, never saved
+#    ["base", name, rev, path, hash]    the preset at rev is file path
+#                                       (with sha256 hash); later records
+#                                       apply on top of it
+#    ["add", name, rev, index, job]     job inserted at index
+#    ["set", name, rev, index, job]     job at index replaced
+#    ["rm", name, rev, index]           job at index removed
+#    ["mv", name, new_name]             preset renamed
+#    ["del", name]                      preset deleted
+# ----------------------------------------------------------------------
+DEFAULT_JOURNAL_PATH = os.path.join(
+    os.path.expanduser("~"), ".github_actions_editor", "journal.log"
+)
+
+# Seconds between batched writes
+SYNC_INTERVAL = 1.0
+
+# Compact once the file is this large and over twice the live records
+COMPACT_MIN_BYTES = 1024 * 1024
+
+# Editors that can journal at the same time (one file each)
+MAX_JOURNALS = 16
+
+_HEADS = ("new", "base")
+_OPS = ("add", "set", "rm")
+
+
+# ----------------------------------------------------------------------
+# Encoding
+# ----------------------------------------------------------------------
+def job_payload(job):
+    """A Job as stored in a record: its dict, or its YAML if JSON would lose data."""
+    data = job.to_dict()
+    try:
+        if json.loads(json.dumps(data)) == data:
+            return data
+    except (TypeError, ValueError):
+        pass
+    from YamlEditor import yaml_io
+    return {"$yaml": yaml_io.dump(data)}
+
+
+def job_from_payload(payload):
+    if isinstance(payload, dict) and set(payload) == {"$yaml"}:
+        from YamlEditor import yaml_io
+        payload = yaml_io.load(payload["$yaml"])
+    return Job.from_dict(payload)
+
+
+def encode_record(record):
+    text = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return b"%08x %s\n" % (zlib.crc32(text), text)
+
+
+def read_records(path):
+    """
+    Return (records, size): the records of a journal file up to the first
+    torn or corrupt line, and the byte length of that valid prefix.
+    """
+    records = []
+    size = 0
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return records, 0
+    with f:
+        for line in f:
+            if not line.endswith(b"\n") or len(line) < 10 or line[8:9] != b" ":
+                break
+            text = line[9:-1]
+            try:
+                if int(line[:8], 16) != zlib.crc32(text):
+                    break
+                record = json.loads(text)
+            except ValueError:
+                break
+            records.append(record)
+            size += len(line)
+    return records, size
+
+
+# ----------------------------------------------------------------------
+# Ownership
+# ----------------------------------------------------------------------
+def journal_paths(path):
+    """path, then the numbered journals used while it is owned: journal-2.log, ..."""
+    base, ext = os.path.splitext(path)
+    yield path
+    for n in range(2, MAX_JOURNALS + 1):
+        yield f"{base}-{n}{ext}"
+
+
+def _try_lock(f):
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def claim_journal(path):
+    """
+    (journal path, open lock file) for the first of journal_paths(path)
+    no other process holds; the lock lasts until the lock file is closed.
+    Raises OSError if every one is taken.
+    """
+    for candidate in journal_paths(path):
+        lock = open(candidate + ".lock", "a+b")
+        if _try_lock(lock):
+            return candidate, lock
+        lock.close()
+    raise OSError(f"every journal next to {path} is in use")
+
+
+# ----------------------------------------------------------------------
+# Live state
+# ----------------------------------------------------------------------
+class JournalState:
+    """
+    The records still needed to recover each preset:
+    { name -> [head record, op records...] }. Applying a record costs
+    O(1), except a save dropping the ops it covers.
+    """
+
+    def __init__(self):
+        self.presets = {}
+
+    def apply(self, record):
+        kind, name = record[0], record[1]
+        if kind in _HEADS:
+            ops = self.presets.get(name, ())
+            # A save at an older revision keeps the edits made after it
+            later = [op for op in ops[1:] if op[2] > record[2]] if kind == "base" else []
+            self.presets[name] = [record] + later
+        elif kind in _OPS:
+            if name in self.presets:
+                self.presets[name].append(record)
+        elif kind == "mv":
+            records = self.presets.pop(name, None)
+            if records is not None:
+                self.presets[record[2]] = records
+        elif kind == "del":
+            self.presets.pop(name, None)
+
+    def records(self):
+        """Every live record, with names brought up to date by renames."""
+        for name, records in self.presets.items():
+            for record in records:
+                yield [record[0], name] + record[2:]
+
+
+class Recovery:
+    """Unsaved work found in a journal for one preset."""
+
+    def __init__(self, name, records):
+        head = records[0]
+        self.name = name
+        self.path = head[3] if head[0] == "base" else None
+        self.content_hash = head[4] if head[0] == "base" else None
+        self.saved_revision = head[2] if head[0] == "base" else 0
+        self.revision = max(record[2] for record in records)
+        self.ops = records[1:]
+
+    def apply(self, jobs):
+        """Replay the edits onto jobs (the preset as of the head record)."""
+        for kind, _name, _rev, index, *job in self.ops:
+            if kind == "add":
+                jobs.insert(index, job_from_payload(job[0]))
+            elif kind == "set":
+                jobs[index] = job_from_payload(job[0])
+            elif kind == "rm":
+                del jobs[index]
+        return jobs
+
+
+# ----------------------------------------------------------------------
+# EditJournal
+# ----------------------------------------------------------------------
+class EditJournal:
+    def __init__(self, path=DEFAULT_JOURNAL_PATH, sync_interval=SYNC_INTERVAL):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # Only this process appends to and compacts the file it claims
+        self.path, self._lock_file = claim_journal(path)
+        self.sync_interval = sync_interval
+
+        records, size = read_records(self.path)
+        self._state = JournalState()
+        for record in records:
+            self._state.apply(record)
+        self._recovered = [
+            Recovery(name, records) for name, records in self._state.presets.items()
+            if records[0][0] == "new" or len(records) > 1
+        ]
+
+        self._lock = threading.Lock()       # _pending, _state
+        self._io_lock = threading.Lock()    # the file
+        self._pending = []
+        self._file = open(self.path, "ab")
+        if self._file.tell() != size:
+            self._file.truncate(size)       # drop a torn tail
+        self._size = size
+        if size >= COMPACT_MIN_BYTES:
+            self.compact()
+
+        self._wake = threading.Event()
+        self._closing = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="EditJournal", daemon=True)
+        self._thread.start()
+
+    def recovered(self):
+        """The Recovery of every preset with unsaved work at open time."""
+        return list(self._recovered)
+
+    # ------------------------------------------------------------------
+    # Records
+    # ------------------------------------------------------------------
+    def _append(self, record):
+        line = encode_record(record)
+        with self._lock:
+            self._state.apply(record)
+            self._pending.append(line)
+        self._wake.set()
+
+    def new_preset(self, name, revision):
+        self._append(["new", name, revision])
+
+    def base(self, name, revision, path, content_hash):
+        self._append(["base", name, revision, path, content_hash])
+
+    def add_job(self, name, revision, index, job):
+        self._append(["add", name, revision, index, job_payload(job)])
+
+    def set_job(self, name, revision, index, job):
+        self._append(["set", name, revision, index, job_payload(job)])
+
+    def remove_job(self, name, revision, index):
+        self._append(["rm", name, revision, index])
+
+    def rename_preset(self, name, new_name):
+        self._append(["mv", name, new_name])
+
+    def delete_preset(self, name):
+        self._append(["del", name])
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+    def _run(self):
+        while not self._closing.is_set():
+            self._wake.wait()
+            # Let a burst of edits collect into one write + fsync
+            self._closing.wait(self.sync_interval)
+            self._wake.clear()
+            self.sync()
+
+    def sync(self):
+        """Write and fsync the buffered records now."""
+        with self._io_lock:
+            with self._lock:
+                pending, self._pending = self._pending, []
+            if pending and self._file is not None:
+                data = b"".join(pending)
+                self._file.write(data)
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._size += len(data)
+        if self._size >= COMPACT_MIN_BYTES:
+            self.compact(only_if_smaller=True)
+
+    def compact(self, only_if_smaller=False):
+        """Rewrite the file with only the records still needed."""
+        from YamlEditor.preset_io import write_atomic
+        with self._io_lock:
+            if self._file is None:
+                return
+            with self._lock:
+                data = b"".join(encode_record(r) for r in self._state.records())
+                pending, self._pending = self._pending, []
+            if only_if_smaller and len(data) * 2 > self._size:
+                with self._lock:
+                    self._pending[:0] = pending
+                return
+            # Records appended meanwhile are already part of the state
+            self._file.close()
+            write_atomic(self.path, data)
+            self._file = open(self.path, "ab")
+            self._size = len(data)
+
+    def close(self):
+        """Stop the writer thread after writing out every record."""
+        self._closing.set()
+        self._wake.set()
+        self._thread.join()
+        self.sync()
+        with self._io_lock:
+            self._file.close()
+            self._file = None
+        self._lock_file.close()
@@ -1,63 +1,153 @@
+import contextlib
+import functools
+import os
 import sys
-import yaml
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QCoreApplication, QEvent, QThreadPool, QTimer
 from PyQt5.QtWidgets import (
-    QMainWindow, QSplitter, QFileDialog, QMessageBox
+    QMainWindow, QSplitter, QFileDialog, QMessageBox, QProgressDialog
 )
-from YamlEditor.job_editor_widget import JobEditorWidget
-from YamlEditor.job_list_widget import JobListWidget
 from YamlEditor.preset_manager_widget import PresetManagerWidget
+from YamlEditor.preset_watcher import PresetWatcher
+from YamlEditor.preset_writer import PresetWriter
+from YamlEditor.job_data import Job
+
+
+# Reloads changing more jobs than this refresh the job list in one go
+RELOAD_RESET_THRESHOLD = 200
+
+# Validate a preset this long after its last load or edit
+VALIDATE_DELAY_MS = 500
+
+# The window's style sheet, parsed once; it also covers every child widget
+STYLE_SHEET = """
+    QListWidget, QTreeWidget, QTreeView {
+        border: 1px solid #CCCCCC;
+    }
+    QPushButton {
+        background-color: #E0E0E0;
+        border: 1px solid #CCCCCC;
+        border-radius: 4px;
+        padding: 4px 8px;
+        color: #000000;
+    }
+    QPushButton:hover {
+        background-color: #D0D0D0;
+    }
+    QGroupBox {
+        background-color: #0B0B0B;
+        border: 1px solid #CCCCCC;
+        border-radius: 4px;
+        margin-top: 1em;
+    }
+    QGroupBox::title {
+        subcontrol-origin: margin;
+        subcontrol-position: top left;
+        left: 10px;
+        padding: 0 3px 0 3px;
+    }
+    QLabel {
+        font-size: 14px;
+        color: #ffffff;
+    }
+    QLineEdit, QPlainTextEdit, QComboBox {
+        background-color: #FFFFFF;
+        border: 1px solid #CCCCCC;
+        border-radius: 2px;
+    }
+    QSplitter::handle {
+        background: #cccccc;
+    }
+"""
 
 
 class GitHubActionsEditor(QMainWindow):
-    def __init__(self):
+    def __init__(self, library=None, profiler=None, matrix_budget=None,
+                 journal=None, undo_max_bytes=None, share_steps=False,
+                 validator=None, startup=None):
         super().__init__()
+        # Optional startup_profile.StartupProfile: times the phases below
+        self.startup = startup
+
         self.setWindowTitle("GitHub Actions Editor - Enhanced (Split Objects)")
         self.resize(1920, 1080)
 
-        # Data Model: dict of { preset_name -> list of job dicts }
+        # Data Model: dict of { preset_name -> list of Jobs }
         self.presets = {}
         self.current_preset = None
 
+        # Files backing presets: { preset_name -> path } and the reverse.
+        # Presets listed from the library are only in self.presets once loaded.
+        # The library (and the journal below) are opened once the window is
+        # up (_finish_startup), so the empty window paints without them.
+        self.preset_paths = {}
+        self._path_presets = {}
+        self.library = library
+
+        # Search postings over the jobs of every preset in self.presets,
+        # built on first use (search_index)
+        self._search_index = None
+
+        # Optional SlotProfiler: times every slot and _populate_jobs
+        self.profiler = profiler
+        if profiler is not None:
+            self._populate_jobs = profiler.wrap(self._populate_jobs)
+
+        # Dirty tracking: { preset_name -> edit revision } now and at last save
+        self._revisions = {}
+        self._saved_revisions = {}
+
+        # Every edit is journaled so unsaved work can be recovered on the
+        # next start. Recovered edits to presets not loaded yet wait here
+        # until their file is: { path -> Recovery }
+        self.journal = journal
+        self._recoveries = {}
+
+        # Undo/redo: { preset_name -> UndoHistory }, each bounded to
+        # about undo_max_bytes of jobs (None: the UndoHistory default)
+        self.undo_max_bytes = undo_max_bytes
+        self._histories = {}
+
+        # Background, atomic preset saving. Where each job sits in its
+        # preset's file: { preset_name -> PresetSource }, so a save can
+        # rewrite only the jobs edited since
+        self.writer = PresetWriter(self)
+        self._sources = {}
+
+        # Save repeated steps lists once, as YAML anchors/aliases
+        self.share_steps = share_steps
+
+        # Schema validation of loaded and edited presets, in the background.
+        # The validator caches results per job, so after an edit only the
+        # changed jobs are checked again: { preset_name -> PresetValidateTask }
+        # The validator is created on first use (validator)
+        self._validator = validator
+        self._validate_tasks = {}
+        self._validate_pending = set()
+        self._validate_timer = QTimer(self)
+        self._validate_timer.setSingleShot(True)
+        self._validate_timer.setInterval(VALIDATE_DELAY_MS)
+        self._validate_timer.timeout.connect(self._start_validations)
+
+        # CI advice found across a preset's jobs, recomputed after edits:
+        # { preset_name -> ((revision, id of the jobs list), findings) }
+        self._shared_advice = {}
+
+        # Background preset loads: { file name -> PresetLoadTask / percent }
+        self._load_tasks = {}
+        self._load_progress = {}
+        self._load_dialog = None
+        self._select_on_load = None
+
+        # Loaded files are watched and reloaded job by job when they change:
+        # { file name -> (PresetReloadTask, preset revision it started from) }
+        self.watcher = PresetWatcher(self)
+        self._reload_tasks = {}
+
         # ----------------------------
         # Styling
         # ----------------------------
-        self.setStyleSheet("""
-            QListWidget, QTreeWidget {
-                border: 1px solid #CCCCCC;
-            }
-            QPushButton {
-                background-color: #E0E0E0;
-                border: 1px solid #CCCCCC;
-                border-radius: 4px;
-                padding: 4px 8px;
-                color: #000000;
-            }
-            QPushButton:hover {
-                background-color: #D0D0D0;
-            }
-            QGroupBox {
-                background-color: #0B0B0B;
-                border: 1px solid #CCCCCC;
-                border-radius: 4px;
-                margin-top: 1em;
-            }
-            QGroupBox::title {
-                subcontrol-origin: margin;
-                subcontrol-position: top left;
-                left: 10px;
-                padding: 0 3px 0 3px;
-            }
-            QLabel {
-                font-size: 14px;
-                color: #ffffff;
-            }
-            QLineEdit, QPlainTextEdit, QComboBox {
-                background-color: #FFFFFF;
-                border: 1px solid #CCCCCC;
-                border-radius: 2px;
-            }
-        """)
+        with self._phase("style sheet"):
+            self.setStyleSheet(STYLE_SHEET)
 
         # ----------------------------
         # Main Splitter (2 columns)
@@ -66,29 +156,27 @@ class GitHubActionsEditor(QMainWindow):
         self.setCentralWidget(main_splitter)
         main_splitter.setHandleWidth(1)
         main_splitter.setChildrenCollapsible(False)
-        main_splitter.setStyleSheet("QSplitter::handle { background: #cccccc; }")
 
         # Left: PresetManagerWidget
-        self.preset_manager = PresetManagerWidget()
-        main_splitter.addWidget(self.preset_manager)
+        with self._phase("preset list"):
+            self.preset_manager = PresetManagerWidget()
+            main_splitter.addWidget(self.preset_manager)
 
         # Right: Another splitter (vertical)
         self.right_splitter = QSplitter(Qt.Vertical)  # Store a reference
         self.right_splitter.setHandleWidth(1)
         self.right_splitter.setChildrenCollapsible(False)
-        self.right_splitter.setStyleSheet("QSplitter::handle { background: #cccccc; }")
         main_splitter.addWidget(self.right_splitter)
 
         # Force left column ~300px, rest ~1620
         main_splitter.setSizes([300, 1620])
 
-        # Top: JobListWidget
-        self.job_list_widget = JobListWidget()
-        self.right_splitter.addWidget(self.job_list_widget)
-
-        # Bottom: JobEditorWidget
-        self.job_editor = JobEditorWidget()
-        self.right_splitter.addWidget(self.job_editor)
+        # Top: JobListWidget, bottom: JobEditorWidget. Both are hidden until
+        # a preset is selected, so they are built then (_show_job_panes).
+        # matrix_budget None: the matrix module's default
+        self.matrix_budget = matrix_budget
+        self.job_list_widget = None
+        self.job_editor = None
 
         # Hide the right splitter at first (if no preset selected)
         self.right_splitter.setVisible(False)
@@ -96,70 +184,531 @@ class GitHubActionsEditor(QMainWindow):
         # Connect signals
         self._connect_signals()
 
+        # Runs on the first turn of the event loop, after the first paint
+        QTimer.singleShot(0, self._finish_startup)
+
+    def _finish_startup(self):
+        """Open the library and journal and list the presets they know."""
+        with self._phase("library"):
+            if self.library is None:
+                self.library = self._open_library()
+        with self._phase("journal"):
+            if self.journal is None:
+                self.journal = self._open_journal()
+        # List every preset known to the library (index only, no files read)
+        with self._phase("library presets"):
+            self._populate_library()
+        with self._phase("journal recovery"):
+            self._recover_journal()
+
+    @property
+    def search_index(self):
+        if self._search_index is None:
+            from YamlEditor.search_index import SearchIndex
+            self._search_index = SearchIndex()
+        return self._search_index
+
+    @property
+    def validator(self):
+        if self._validator is None:
+            from YamlEditor.schema_validator import PresetValidator
+            self._validator = PresetValidator()
+        return self._validator
+
+    def _phase(self, name):
+        """Context manager timing a startup phase, when profiling startup."""
+        if self.startup is None:
+            return contextlib.nullcontext()
+        return self.startup.phase(name)
+
+    def _slot(self, slot):
+        """Return slot, wrapped for timing when profiling is enabled."""
+        if self.profiler is None:
+            return slot
+        return self.profiler.wrap(slot)
+
     def _connect_signals(self):
         # PresetManagerWidget signals
-        self.preset_manager.createRequested.connect(self._on_create_preset)
-        self.preset_manager.loadRequested.connect(self._on_load_preset)
-        self.preset_manager.presetDeleted.connect(self._on_delete_preset)
-        self.preset_manager.presetSelected.connect(self._on_preset_selected)
+        self.preset_manager.createRequested.connect(self._slot(self._on_create_preset))
+        self.preset_manager.loadRequested.connect(self._slot(self._on_load_preset))
+        self.preset_manager.presetDeleted.connect(self._slot(self._on_delete_preset))
+        self.preset_manager.presetSelected.connect(self._slot(self._on_preset_selected))
 
+        # Changes to loaded preset files on disk
+        self.watcher.changed.connect(self._slot(self._on_preset_file_changed))
+
+        # PresetWriter signals
+        self.writer.saved.connect(self._slot(self._on_preset_written))
+        self.writer.failed.connect(self._slot(self._on_preset_write_failed))
+
+    def _show_job_panes(self):
+        """Show the job list and job editor, building them on first use."""
+        if self.job_list_widget is None:
+            # Imported on first use, like the loaders and advisor below: they
+            # pull in YAML, graph and advice support the empty window never needs
+            from YamlEditor.job_editor_widget import JobEditorWidget
+            from YamlEditor.job_list_widget import JobListWidget
+            if self.matrix_budget is None:
+                from YamlEditor.matrix import DEFAULT_MATRIX_BUDGET
+                self.matrix_budget = DEFAULT_MATRIX_BUDGET
+
+            self.job_list_widget = JobListWidget(matrix_budget=self.matrix_budget)
+            self.job_list_widget.set_search_index(self.search_index)
+            self.right_splitter.addWidget(self.job_list_widget)
+
+            self.job_editor = JobEditorWidget(
+                matrix_budget=self.matrix_budget, validator=self.validator
+            )
+            self.right_splitter.addWidget(self.job_editor)
+            self._connect_job_pane_signals()
+        self.right_splitter.setVisible(True)
+
+    def _connect_job_pane_signals(self):
         # JobListWidget signals
-        self.job_list_widget.addJobRequested.connect(self._on_add_job)
-        self.job_list_widget.removeJobRequested.connect(self._on_remove_job)
-        self.job_list_widget.jobSelected.connect(self._on_job_selected_in_list)
-        self.job_list_widget.savePresetRequested.connect(self._on_save_current_preset)
+        self.job_list_widget.addJobRequested.connect(self._slot(self._on_add_job))
+        self.job_list_widget.removeJobRequested.connect(self._slot(self._on_remove_job))
+        self.job_list_widget.jobSelected.connect(self._slot(self._on_job_selected_in_list))
+        self.job_list_widget.savePresetRequested.connect(self._slot(self._on_save_current_preset))
+        self.job_list_widget.undoRequested.connect(self._slot(self._on_undo))
+        self.job_list_widget.redoRequested.connect(self._slot(self._on_redo))
 
         # JobEditorWidget signals
-        self.job_editor.jobSaved.connect(self._on_job_saved)
+        self.job_editor.jobSaved.connect(self._slot(self._on_job_saved))
+        self.job_editor.fixRequested.connect(self._slot(self._on_fix_requested))
 
     # --------------------------------------------------------------------------
     # Preset Handling
     # --------------------------------------------------------------------------
+    def _open_library(self):
+        import sqlite3
+        from YamlEditor.preset_library import PresetLibrary
+        try:
+            return PresetLibrary()
+        except (OSError, sqlite3.Error):
+            # No writable home directory: keep an index for this session only
+            return PresetLibrary(":memory:")
+
+    def _open_journal(self):
+        from YamlEditor.edit_journal import EditJournal
+        try:
+            return EditJournal()
+        except OSError:
+            # No writable home directory: edits are not journaled
+            return None
+
+    def _populate_library(self):
+        tooltips = {}
+        for entry in self.library.entries():
+            name = self._file_preset_name(entry.name, entry.path)
+            self._set_preset_path(name, entry.path)
+            tooltips[name] = self._library_tooltip(entry)
+        # Presets made before the first event-loop turn stay listed
+        self.preset_manager.refresh_list(self.preset_paths.keys() | self.presets.keys(), tooltips)
+
+    def _file_preset_name(self, preset_name, path):
+        """
+        The list name for a preset read from path. Files share names easily
+        (the default is "UnnamedPreset"), so a taken name gets the file's
+        basename added rather than replacing the other preset.
+        """
+        path = os.path.abspath(path)
+        if self.preset_paths.get(preset_name, path) == path and (
+            preset_name not in self.presets or preset_name in self.preset_paths
+        ):
+            return preset_name
+        return self._get_unique_preset_name(f"{preset_name} ({os.path.basename(path)})")
+
+    def _library_tooltip(self, entry):
+        return f"{entry.path}\n{entry.job_count} job(s)"
+
+    def _set_preset_path(self, preset_name, path):
+        path = os.path.abspath(path)
+        old_path = self.preset_paths.get(preset_name)
+        if old_path is not None:
+            self._path_presets.pop(old_path, None)
+        old_name = self._path_presets.get(path)
+        if old_name is not None and old_name != preset_name:
+            self.preset_paths.pop(old_name, None)
+        self.preset_paths[preset_name] = path
+        self._path_presets[path] = preset_name
+
     def _on_create_preset(self):
         new_name = self._get_unique_preset_name("NewPreset")
         self.presets[new_name] = []
-        self.preset_manager.refresh_list(self.presets.keys())
+        revision = self._mark_dirty(new_name)
+        if self.journal is not None:
+            self.journal.new_preset(new_name, revision)
+        self.preset_manager.add_preset(new_name)
         self.preset_manager.set_current_preset(new_name)
         self.current_preset = new_name
 
         # Show right splitter now that we have a selected preset
-        self.right_splitter.setVisible(True)
+        self._show_job_panes()
         self._populate_jobs()
 
     def _on_load_preset(self):
-        file_name, _ = QFileDialog.getOpenFileName(
-            self, "Open Preset File", "", "YAML Files (*.yaml *.yml)"
+        file_names, _ = QFileDialog.getOpenFileNames(
+            self, "Open Preset Files", "", "YAML Files (*.yaml *.yml)"
+        )
+        self._start_loads([os.path.abspath(f) for f in file_names])
+
+    def _start_loads(self, file_names):
+        file_names = [f for f in file_names if f not in self._load_tasks]
+        if not file_names:
+            return
+
+        from YamlEditor.preset_loader import PresetLoadTask
+
+        # The first file chosen becomes the current preset once it arrives
+        self._select_on_load = file_names[0]
+        pool = QThreadPool.globalInstance()
+        for file_name in file_names:
+            task = PresetLoadTask(file_name)
+            task.signals.progress.connect(self._slot(self._on_load_progress))
+            task.signals.loaded.connect(self._slot(self._on_preset_loaded))
+            task.signals.failed.connect(self._slot(self._on_load_failed))
+            task.signals.cancelled.connect(self._slot(self._on_load_finished))
+            self._load_tasks[file_name] = task
+            self._load_progress[file_name] = 0
+            pool.start(task)
+        self._update_load_dialog()
+
+    def _on_cancel_loads(self):
+        for task in self._load_tasks.values():
+            task.cancel()
+
+    def _on_load_progress(self, file_name, percent):
+        if file_name in self._load_tasks:
+            self._load_progress[file_name] = percent
+            self._update_load_dialog()
+
+    def _on_preset_loaded(self, file_name, preset_name, jobs, info):
+        entry = self.library.record(
+            file_name, preset_name, len(jobs), info["content_hash"], info["mtime"]
+        )
+        # A file already listed keeps its list name
+        listed = self._path_presets.get(file_name)
+        preset_name = listed if listed is not None else self._file_preset_name(
+            preset_name, file_name
         )
-        if file_name:
-            with open(file_name, "r") as file:
-                data = yaml.safe_load(file) or {}
-            preset_name = data.get("name", "UnnamedPreset")
-            raw_jobs = data.get("jobs", [])
-            jobs = []
-            for j in raw_jobs:
-                if isinstance(j, dict):
-                    jobs.append(j)
-                elif isinstance(j, str):
-                    jobs.append({"name": j, "runs-on": ""})
-            self.presets[preset_name] = jobs
-            self.preset_manager.refresh_list(self.presets.keys())
+        search_index = info.get("search_index")
+        if self._apply_recovery(preset_name, file_name, jobs, info["content_hash"]):
+            search_index = None     # built for the jobs as read
+        else:
+            self._mark_clean(preset_name)
+            if self.journal is not None:
+                self.journal.base(
+                    preset_name, self._revisions.get(preset_name, 0),
+                    file_name, info["content_hash"]
+                )
+        self.presets[preset_name] = jobs
+        self._sources[preset_name] = info.get("source")
+        self._histories.pop(preset_name, None)
+        self.search_index.set_preset(preset_name, jobs, search_index)
+        self._set_preset_path(preset_name, file_name)
+        self.watcher.watch(file_name)
+        self.preset_manager.add_preset(preset_name, self._library_tooltip(entry))
+        if file_name == self._select_on_load:
             self.preset_manager.set_current_preset(preset_name)
             self.current_preset = preset_name
 
             # Show the right splitter
-            self.right_splitter.setVisible(True)
+            self._show_job_panes()
             self._populate_jobs()
+        self._schedule_validation(preset_name)
+        self._on_load_finished(file_name)
+
+    def _on_load_failed(self, file_name, message):
+        self._on_load_finished(file_name)
+        if not os.path.exists(file_name):
+            # Stale library entry: the file is gone
+            self.library.remove(file_name)
+            self.watcher.unwatch(file_name)
+            self._recoveries.pop(file_name, None)
+            preset_name = self._path_presets.pop(file_name, None)
+            if preset_name is not None and preset_name not in self.presets:
+                self.preset_paths.pop(preset_name, None)
+                self.preset_manager.remove_preset(preset_name)
+                self._revisions.pop(preset_name, None)
+                self._saved_revisions.pop(preset_name, None)
+                if self.journal is not None:
+                    self.journal.delete_preset(preset_name)
+        QMessageBox.warning(self, "Load Error", f"Could not load {file_name}:\n{message}")
+
+    def _on_load_finished(self, file_name):
+        if self._load_tasks.pop(file_name, None) is not None:
+            self._load_progress[file_name] = 100
+        self._update_load_dialog()
+
+    def _update_load_dialog(self):
+        """Show aggregate progress of pending loads; close when none remain."""
+        if not self._load_tasks:
+            self._load_progress.clear()
+            if self._load_dialog is not None:
+                self._load_dialog.canceled.disconnect(self._on_cancel_loads)
+                self._load_dialog.close()
+                self._load_dialog.deleteLater()
+                self._load_dialog = None
+            return
+
+        if self._load_dialog is None:
+            self._load_dialog = QProgressDialog("Loading presets...", "Cancel", 0, 100, self)
+            self._load_dialog.setWindowTitle("Loading")
+            self._load_dialog.setMinimumDuration(500)
+            self._load_dialog.setAutoClose(False)
+            self._load_dialog.setAutoReset(False)
+            self._load_dialog.canceled.connect(self._on_cancel_loads)
+
+        count = len(self._load_progress)
+        self._load_dialog.setLabelText(f"Loading {count} preset file(s)...")
+        self._load_dialog.setValue(sum(self._load_progress.values()) // count)
+
+    # --------------------------------------------------------------------------
+    # Recovering Unsaved Edits from the Journal
+    # --------------------------------------------------------------------------
+    def _recover_journal(self):
+        """
+        Bring back the unsaved edits of the last session. New presets are
+        rebuilt from the journal right away; edits to preset files are
+        replayed when the file is loaded, so nothing is read here.
+        """
+        if self.journal is None:
+            return
+        count = 0
+        for recovery in self.journal.recovered():
+            name = recovery.name
+            if recovery.path is None:
+                if name in self.presets or name in self.preset_paths:
+                    name = self._get_unique_preset_name(name)
+                try:
+                    jobs = recovery.apply([])
+                except (IndexError, TypeError, ValueError, AttributeError):
+                    continue
+                self.presets[name] = jobs
+                self.search_index.set_preset(name, jobs)
+                self.preset_manager.add_preset(name)
+            else:
+                listed = self._path_presets.get(recovery.path)
+                if listed is not None:
+                    name = listed
+                elif name in self.presets or name in self.preset_paths:
+                    name = self._get_unique_preset_name(name)
+                if listed is None:
+                    self._set_preset_path(name, recovery.path)
+                    self.preset_manager.add_preset(name, recovery.path)
+                self._recoveries[recovery.path] = recovery
+            if name != recovery.name:
+                self.journal.rename_preset(recovery.name, name)
+            # Revisions continue from the journal, so its records stay ordered
+            self._revisions[name] = recovery.revision
+            self._saved_revisions[name] = recovery.saved_revision
+            count += 1
+        if count:
+            self.statusBar().showMessage(f"Recovered unsaved edits to {count} preset(s)", 5000)
+
+    def _apply_recovery(self, preset_name, file_name, jobs, content_hash):
+        """Replay recovered edits onto a preset just read; True if there were any."""
+        recovery = self._recoveries.pop(file_name, None)
+        if recovery is None:
+            return False
+        if recovery.content_hash == content_hash:
+            snapshot = list(jobs)
+            try:
+                recovery.apply(jobs)
+                return True
+            except (IndexError, TypeError, ValueError, AttributeError):
+                jobs[:] = snapshot
+        QMessageBox.warning(
+            self, "Recovery",
+            f"{file_name} changed since {preset_name} was last edited;\n"
+            "the unsaved edits from the previous session could not be applied."
+        )
+        return False
+
+    # --------------------------------------------------------------------------
+    # Reloading Presets Changed on Disk
+    # --------------------------------------------------------------------------
+    def _on_preset_file_changed(self, file_name):
+        preset_name = self._path_presets.get(file_name)
+        if preset_name is None or preset_name not in self.presets:
+            return
+        if file_name in self._load_tasks or self.writer.has_pending(file_name):
+            return
+        if self.is_dirty(preset_name):
+            self.statusBar().showMessage(
+                f"{preset_name} changed on disk; not reloaded because it has unsaved edits"
+            )
+            return
+
+        previous = self._reload_tasks.pop(file_name, None)
+        if previous is not None:
+            previous[0].cancel()
+        # The library knows the content last loaded or saved; a file with the
+        # same hash (e.g. our own save) is not parsed again
+        entry = self.library.get(file_name)
+        from YamlEditor.preset_loader import PresetReloadTask
+        task = PresetReloadTask(
+            file_name, list(self.presets[preset_name]),
+            entry.content_hash if entry is not None else None
+        )
+        task.signals.loaded.connect(self._slot(functools.partial(self._on_preset_reloaded, task)))
+        task.signals.failed.connect(self._slot(functools.partial(self._on_reload_failed, task)))
+        task.signals.unchanged.connect(self._slot(functools.partial(self._on_reload_finished, task)))
+        task.signals.cancelled.connect(self._slot(functools.partial(self._on_reload_finished, task)))
+        self._reload_tasks[file_name] = (task, self._revisions.get(preset_name, 0))
+        QThreadPool.globalInstance().start(task)
+
+    def _on_reload_finished(self, task, file_name):
+        current = self._reload_tasks.get(file_name)
+        if current is not None and current[0] is task:
+            del self._reload_tasks[file_name]
+            return current[1]
+        return None
+
+    def _on_reload_failed(self, task, file_name, message):
+        if self._on_reload_finished(task, file_name) is not None:
+            # Often a half-written file; the next change event retries
+            self.statusBar().showMessage(f"Could not reload {file_name}: {message}", 5000)
+
+    def _on_preset_reloaded(self, task, file_name, file_preset_name, jobs, info):
+        revision = self._on_reload_finished(task, file_name)
+        if revision is None:
+            return
+        preset_name = self._path_presets.get(file_name)
+        if preset_name is None or preset_name not in self.presets:
+            return
+        if self._revisions.get(preset_name, 0) != revision:
+            # Edited while the reload ran: the diff is against an old snapshot
+            self._on_preset_file_changed(file_name)
+            return
+
+        opcodes = info["opcodes"]
+        self._apply_job_diff(preset_name, jobs, opcodes)
+        self._schedule_validation(preset_name)
+        # Undo steps refer to rows of the old list
+        self._histories.pop(preset_name, None)
+        if preset_name == self.current_preset:
+            self._update_undo_buttons()
+        source = info.get("source")
+        if source is not None:
+            # Unchanged jobs kept their objects; the spans are the new file's
+            source = source._replace(jobs=tuple(self.presets[preset_name]))
+        self._sources[preset_name] = source
+        self._mark_clean(preset_name)
+        if self.journal is not None:
+            self.journal.base(
+                preset_name, self._revisions.get(preset_name, 0), file_name, info["content_hash"]
+            )
+        entry = self.library.record(
+            file_name, file_preset_name, len(jobs), info["content_hash"], info["mtime"]
+        )
+        self.preset_manager.add_preset(preset_name, self._library_tooltip(entry))
+        from YamlEditor.preset_diff import changed_count
+        self.statusBar().showMessage(
+            f"Reloaded {preset_name} from disk ({changed_count(opcodes)} job(s) changed)", 3000
+        )
+
+    def _apply_job_diff(self, preset_name, new_jobs, opcodes):
+        """
+        Apply diff_jobs() opcodes to a loaded preset. Unchanged jobs keep
+        their objects (and caches); the edited job keeps its selection.
+        """
+        from YamlEditor.preset_diff import changed_count
+        jobs = self.presets[preset_name]
+        # (Shown only once the job panes exist)
+        is_current = preset_name == self.current_preset and self.job_list_widget is not None
+        self._shared_advice.pop(preset_name, None)
+
+        # Where the job being edited ends up: (new row, replaced?) or None
+        edited = self.job_editor.current_job_index() if is_current else None
+        target = None
+        if edited is not None:
+            for tag, i1, i2, j1, j2 in opcodes:
+                if i1 <= edited < i2:
+                    if tag == "equal":
+                        target = (j1 + edited - i1, False)
+                    elif tag == "replace" and edited - i1 < j2 - j1:
+                        target = (j1 + edited - i1, True)
+                    break
+
+        for tag, i1, i2, j1, j2 in opcodes:
+            if tag != "equal":
+                for job in jobs[i1:i2]:
+                    self.search_index.remove_job(preset_name, job)
+                    if self.job_editor is not None:
+                        self.job_editor.forget_job(job)
+                for job in new_jobs[j1:j2]:
+                    self.search_index.add_job(preset_name, job)
+
+        if not is_current or changed_count(opcodes) > RELOAD_RESET_THRESHOLD:
+            # Rebuild the list in one go
+            merged = []
+            for tag, i1, i2, j1, j2 in opcodes:
+                merged.extend(jobs[i1:i2] if tag == "equal" else new_jobs[j1:j2])
+            jobs[:] = merged
+            if is_current:
+                self.job_list_widget.refresh_jobs(jobs, preset_name)
+        else:
+            # Back to front, so earlier rows keep their positions
+            widget = self.job_list_widget
+            for tag, i1, i2, j1, j2 in reversed(opcodes):
+                if tag == "equal":
+                    continue
+                common = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+                for k in range(common):
+                    widget.replace_job(i1 + k, new_jobs[j1 + k])
+                for row in range(i2 - 1, i1 + common - 1, -1):
+                    widget.remove_job(row)
+                for k in range(common, j2 - j1):
+                    widget.insert_job(i1 + k, new_jobs[j1 + k])
+
+        if not is_current or edited is None:
+            return
+        if target is None:
+            self.job_editor.clear_job()
+            return
+        row, replaced = target
+        if replaced:
+            self._load_job_editor(row)
+        else:
+            self.job_editor.set_job_index(row)
+            self._show_advice(row)
+        self.job_list_widget.set_current_job_index(row)
 
     def _on_delete_preset(self, preset_name):
         if preset_name in self.presets:
-            del self.presets[preset_name]
-        self.preset_manager.refresh_list(self.presets.keys())
+            jobs = self.presets.pop(preset_name)
+            if self.job_editor is not None:
+                for job in jobs:
+                    self.job_editor.forget_job(job)
+        self.search_index.remove_preset(preset_name)
+        self._sources.pop(preset_name, None)
+        self._histories.pop(preset_name, None)
+        self._shared_advice.pop(preset_name, None)
+        self._validate_pending.discard(preset_name)
+        task = self._validate_tasks.pop(preset_name, None)
+        if task is not None:
+            task.cancel()
+        self._revisions.pop(preset_name, None)
+        self._saved_revisions.pop(preset_name, None)
+        if self.journal is not None:
+            self.journal.delete_preset(preset_name)
+        path = self.preset_paths.pop(preset_name, None)
+        if path is not None:
+            self._recoveries.pop(path, None)
+            # Forget the file in the library; the file itself is kept
+            self._path_presets.pop(path, None)
+            self.watcher.unwatch(path)
+            self.library.remove(path)
+        self.preset_manager.remove_preset(preset_name)
 
         # If we deleted the preset that was currently selected, reset
         if self.current_preset == preset_name:
             self.current_preset = None
-            self.job_list_widget.refresh_jobs([])
-            self.job_editor.clear_job()
+            if self.job_list_widget is not None:
+                self.job_list_widget.refresh_jobs([])
+                self.job_editor.clear_job()
+            self._update_undo_buttons()
             # Hide the right splitter since no preset is selected
             self.right_splitter.setVisible(False)
 
@@ -175,8 +724,16 @@ class GitHubActionsEditor(QMainWindow):
             self.right_splitter.setVisible(False)
             return
 
+        # Library presets are read from disk the first time they are selected
+        if preset_name not in self.presets:
+            self.right_splitter.setVisible(False)
+            path = self.preset_paths.get(preset_name)
+            if path is not None:
+                self._start_loads([path])
+            return
+
         # Otherwise, show the right side
-        self.right_splitter.setVisible(True)
+        self._show_job_panes()
         self._populate_jobs()
 
     # --------------------------------------------------------------------------
@@ -184,6 +741,7 @@ class GitHubActionsEditor(QMainWindow):
     # --------------------------------------------------------------------------
     def _populate_jobs(self):
         """Refresh the job list for the currently selected preset."""
+        self._update_undo_buttons()
         if not self.current_preset:
             self.job_list_widget.refresh_jobs([])
             self.job_editor.clear_job()
@@ -191,40 +749,34 @@ class GitHubActionsEditor(QMainWindow):
             return
 
         jobs = self.presets[self.current_preset]
-        self.job_list_widget.refresh_jobs(jobs)
+        self.job_list_widget.refresh_jobs(jobs, self.current_preset)
         self.job_editor.clear_job()
 
     def _on_add_job(self):
         if not self.current_preset:
             return
+        from YamlEditor.undo_history import JobEdit
         jobs = self.presets[self.current_preset]
-        new_job = {
-            "name": "New Job",
-            "runs-on": "",
-            "steps": [],
-            "env": {}
-        }
-        jobs.append(new_job)
-        self._populate_jobs()
+        new_job = Job(name="New Job", runs_on="", steps=[], env={})
+        index = self._edit_jobs("Add Job", [JobEdit("add", len(jobs), None, new_job)])
         # Select the new job
-        index = len(jobs) - 1
         self.job_list_widget.set_current_job_index(index)
 
     def _on_remove_job(self, job_index):
         if not self.current_preset:
             return
+        from YamlEditor.undo_history import JobEdit
         jobs = self.presets[self.current_preset]
         if 0 <= job_index < len(jobs):
-            jobs.pop(job_index)
-        self._populate_jobs()
+            self._edit_jobs("Remove Job", [JobEdit("remove", job_index, jobs[job_index], None)])
+            self.job_editor.clear_job()
 
     def _on_job_selected_in_list(self, job_index):
         if not self.current_preset:
             return
         jobs = self.presets[self.current_preset]
         if 0 <= job_index < len(jobs):
-            job_dict = jobs[job_index]
-            self.job_editor.load_job(job_dict, job_index)
+            self._load_job_editor(job_index)
 
     def _on_save_current_preset(self):
         self._save_current_preset()
@@ -232,16 +784,202 @@ class GitHubActionsEditor(QMainWindow):
     # --------------------------------------------------------------------------
     # Job Editor Handling
     # --------------------------------------------------------------------------
-    def _on_job_saved(self, updated_job):
+    def _on_job_saved(self, idx, updated_job):
         if not self.current_preset:
             return
-        idx = updated_job.pop("__index__", None)
-        if idx is None:
-            return
+        from YamlEditor.undo_history import JobEdit
         jobs = self.presets[self.current_preset]
         if 0 <= idx < len(jobs):
-            jobs[idx].update(updated_job)
-            self._populate_jobs()
+            self._edit_jobs("Edit Job", [JobEdit("replace", idx, jobs[idx], updated_job)])
+            self._show_advice(idx)
+
+    def _load_job_editor(self, index):
+        """Show the current preset's job at index in the job editor."""
+        self.job_editor.load_job(self.presets[self.current_preset][index], index)
+        self._show_advice(index)
+
+    # --------------------------------------------------------------------------
+    # Schema Validation
+    # --------------------------------------------------------------------------
+    def _schedule_validation(self, preset_name):
+        self._validate_pending.add(preset_name)
+        self._validate_timer.start()
+
+    def _start_validations(self):
+        from YamlEditor.preset_validator import PresetValidateTask
+        pool = QThreadPool.globalInstance()
+        pending, self._validate_pending = self._validate_pending, set()
+        for preset_name in pending:
+            if preset_name not in self.presets:
+                continue
+            old = self._validate_tasks.get(preset_name)
+            if old is not None:
+                old.cancel()
+            # Jobs are immutable, so a copy of the list is a stable snapshot
+            task = PresetValidateTask(
+                self.validator, preset_name, self._revisions.get(preset_name, 0),
+                list(self.presets[preset_name])
+            )
+            task.signals.validated.connect(
+                self._slot(functools.partial(self._on_preset_validated, task))
+            )
+            task.signals.failed.connect(
+                self._slot(functools.partial(self._on_validate_failed, task))
+            )
+            self._validate_tasks[preset_name] = task
+            pool.start(task)
+
+    def _on_preset_validated(self, task, preset_name, revision, results):
+        if self._validate_tasks.get(preset_name) is not task:
+            return      # superseded by a later validation
+        del self._validate_tasks[preset_name]
+        if preset_name in self._validate_pending:
+            return      # changed since; the next validation reports instead
+        from YamlEditor.schema_validator import format_problem, summarize
+        problems = [(i, problem) for i, found in enumerate(results) for problem in found]
+        message = f"{preset_name}: {summarize(results)}"
+        if problems:
+            index, problem = problems[0]
+            name = task.jobs[index].name or f"job {index + 1}"
+            message += f" (first: {name}: {format_problem(problem)})"
+        self.statusBar().showMessage(message, 8000 if problems else 3000)
+
+    def _on_validate_failed(self, task, preset_name, message):
+        if self._validate_tasks.get(preset_name) is task:
+            del self._validate_tasks[preset_name]
+        self.statusBar().showMessage(f"Could not validate {preset_name}: {message}", 5000)
+
+    # --------------------------------------------------------------------------
+    # CI Advice
+    # --------------------------------------------------------------------------
+    def _show_advice(self, index):
+        """Give the job editor the ci_advisor findings about the job at index."""
+        from YamlEditor import ci_advisor
+        preset_name = self.current_preset
+        jobs = self.presets[preset_name]
+        # Findings across jobs need the whole preset, so they are kept
+        # until the next edit; the job's own are cheap to find each time
+        key = (self._revisions.get(preset_name, 0), id(jobs))
+        cached = self._shared_advice.get(preset_name)
+        if cached is None or cached[0] != key:
+            cached = (key, ci_advisor.analyze(jobs, ("shared-setup",)))
+            self._shared_advice[preset_name] = cached
+        findings = ci_advisor.analyze(jobs, ci_advisor.JOB_KINDS, indices=[index])
+        findings += [f for f in cached[1]
+                     if index in f.indices and ci_advisor.is_current(jobs, f)]
+        findings.sort(key=lambda f: -f.seconds)
+        self.job_editor.set_findings(findings)
+
+    def _on_fix_requested(self, finding):
+        from YamlEditor import ci_advisor
+        if not self.current_preset:
+            return
+        jobs = self.presets[self.current_preset]
+        index = self.job_editor.current_job_index()
+        try:
+            edits = ci_advisor.rewrite(jobs, finding)
+        except ci_advisor.StaleFinding:
+            self.statusBar().showMessage("The job changed since; advice refreshed", 3000)
+            if index is not None:
+                self._show_advice(index)
+            return
+        edited = jobs[index] if index is not None else None
+        self._edit_jobs(finding.title, edits)
+
+        # Keep editing the same job, wherever the rewrite moved it
+        for kind, row, old, _new in edits:
+            if kind == "replace" and old is edited:
+                self.job_list_widget.set_current_job_index(row)
+                self._load_job_editor(row)
+                break
+
+    # --------------------------------------------------------------------------
+    # Editing Jobs, Undo / Redo
+    # --------------------------------------------------------------------------
+    def _edit_jobs(self, label, edits):
+        """Apply JobEdits to the current preset as one undoable step."""
+        for edit in edits:
+            index = self._apply_job_edit(edit)
+        self._history(self.current_preset).record(label, edits)
+        self._update_undo_buttons()
+        self._schedule_validation(self.current_preset)
+        return index
+
+    def _apply_job_edit(self, edit):
+        """
+        Apply one JobEdit to the current preset (job list, search index,
+        render cache, dirty state, journal) and return the row it touched.
+        """
+        preset_name = self.current_preset
+        kind, index, old, new = edit
+        if kind == "add":
+            self.search_index.add_job(preset_name, new)
+            index = self.job_list_widget.insert_job(index, new)
+        elif kind == "remove":
+            self.search_index.remove_job(preset_name, old)
+            self.job_list_widget.remove_job(index)
+            self.job_editor.forget_job(old)
+        else:
+            self.search_index.replace_job(preset_name, old, new)
+            self.job_list_widget.replace_job(index, new)
+            self.job_editor.forget_job(old)
+
+        revision = self._mark_dirty(preset_name)
+        if self.journal is not None:
+            if kind == "add":
+                self.journal.add_job(preset_name, revision, index, new)
+            elif kind == "remove":
+                self.journal.remove_job(preset_name, revision, index)
+            else:
+                self.journal.set_job(preset_name, revision, index, new)
+        return index
+
+    def _history(self, preset_name):
+        history = self._histories.get(preset_name)
+        if history is None:
+            from YamlEditor.undo_history import UndoHistory
+            if self.undo_max_bytes is None:
+                history = UndoHistory()
+            else:
+                history = UndoHistory(max_bytes=self.undo_max_bytes)
+            self._histories[preset_name] = history
+        return history
+
+    def _on_undo(self):
+        self._step_history(undo=True)
+
+    def _on_redo(self):
+        self._step_history(undo=False)
+
+    def _step_history(self, undo):
+        if not self.current_preset:
+            return
+        history = self._histories.get(self.current_preset)
+        if history is None:
+            return
+        edits = history.undo() if undo else history.redo()
+        if not edits:
+            return
+        for edit in edits:
+            index = self._apply_job_edit(edit)
+        self._schedule_validation(self.current_preset)
+
+        # Show the job the step changed
+        if edits[-1].kind == "remove":
+            self.job_editor.clear_job()
+        else:
+            self.job_list_widget.set_current_job_index(index)
+            self._load_job_editor(index)
+        self._update_undo_buttons()
+
+    def _update_undo_buttons(self):
+        if self.job_list_widget is None:
+            return
+        history = self._histories.get(self.current_preset) if self.current_preset else None
+        if history is None:
+            self.job_list_widget.set_undo_state(None, None)
+        else:
+            self.job_list_widget.set_undo_state(history.undo_label(), history.redo_label())
 
     # --------------------------------------------------------------------------
     # Saving the Current Preset to File
@@ -249,26 +987,77 @@ class GitHubActionsEditor(QMainWindow):
     def _save_current_preset(self):
         if not self.current_preset:
             return
+        preset_name = self.current_preset
+        path = self.preset_paths.get(preset_name)
         file_name, _ = QFileDialog.getSaveFileName(
-            self, "Save Preset As", f"{self.current_preset}.yaml",
+            self, "Save Preset As", path or f"{preset_name}.yaml",
             "YAML Files (*.yaml *.yml)"
         )
-        if file_name:
-            data = {
-                "name": self.current_preset,
-                "jobs": self.presets[self.current_preset]
-            }
-            try:
-                with open(file_name, "w") as f:
-                    yaml.dump(
-                        data, f,
-                        default_flow_style=False,
-                        sort_keys=False,
-                        indent=2,
-                        width=80
-                    )
-            except Exception as e:
-                QMessageBox.warning(self, "Save Error", f"Could not save file:\n{e}")
+        if not file_name:
+            return
+        file_name = os.path.abspath(file_name)
+
+        # Nothing changed since this file was loaded or saved
+        if file_name == path and not self.is_dirty(preset_name):
+            self.statusBar().showMessage(f"{preset_name}: no changes to save", 3000)
+            return
+
+        # Jobs are never modified in place, so a shallow copy of the list is
+        # a stable snapshot; the dump itself runs on the writer thread.
+        # Saving back to the loaded file re-emits only the replaced jobs.
+        jobs = list(self.presets[preset_name])
+        revision = self._revisions.get(preset_name, 0)
+        source = self._sources.get(preset_name) if file_name == path else None
+        share_steps = self.share_steps
+
+        def render():
+            from YamlEditor import preset_io, preset_patch
+            if share_steps:
+                # Anchored files are always written in full
+                return preset_io.dump_preset(preset_name, jobs, share_steps=True), {"source": None}
+            content, written = preset_patch.render_preset(file_name, preset_name, jobs, source)
+            return content, {"source": written}
+
+        self.writer.submit(file_name, render, (preset_name, revision, len(jobs)))
+        self.statusBar().showMessage(f"Saving {preset_name}...")
+
+    def _on_preset_written(self, file_name, tag, info):
+        preset_name, revision, job_count = tag
+        if preset_name not in self.presets:
+            return
+        if revision > self._saved_revisions.get(preset_name, 0):
+            self._saved_revisions[preset_name] = revision
+        self._set_preset_path(preset_name, file_name)
+        self.watcher.watch(file_name)
+        source = info["source"]
+        if source is not None:
+            source = source._replace(size=info["size"], mtime_ns=info["mtime_ns"])
+        self._sources[preset_name] = source
+        if self.journal is not None:
+            # Edits journaled after this revision still apply on top of the file
+            self.journal.base(preset_name, revision, file_name, info["content_hash"])
+        entry = self.library.record(
+            file_name, preset_name, job_count, info["content_hash"], info["mtime"]
+        )
+        self.preset_manager.add_preset(preset_name, self._library_tooltip(entry))
+        self.statusBar().showMessage(f"Saved {preset_name} to {file_name}", 3000)
+
+    def _on_preset_write_failed(self, file_name, tag, message):
+        self.statusBar().clearMessage()
+        QMessageBox.warning(self, "Save Error", f"Could not save file:\n{message}")
+
+    def _mark_dirty(self, preset_name):
+        """Count an edit to the preset and return its new revision."""
+        revision = self._revisions.get(preset_name, 0) + 1
+        self._revisions[preset_name] = revision
+        return revision
+
+    def _mark_clean(self, preset_name):
+        self._saved_revisions[preset_name] = self._revisions.get(preset_name, 0)
+
+    def is_dirty(self, preset_name):
+        """True if the preset has edits that have not been written out."""
+        return self._revisions.get(preset_name, 0) != self._saved_revisions.get(preset_name, 0)
 
     # --------------------------------------------------------------------------
     # Utility
@@ -277,7 +1066,7 @@ class GitHubActionsEditor(QMainWindow):
         """Generate a unique preset name if base already exists."""
         name = base
         i = 1
-        while name in self.presets:
+        while name in self.presets or name in self.preset_paths:
             name = f"{base}_{i}"
             i += 1
         return name
@@ -286,4 +1075,18 @@ class GitHubActionsEditor(QMainWindow):
     # Close
     # --------------------------------------------------------------------------
     def closeEvent(self, event):
+        self._on_cancel_loads()
+        for task, _revision in self._reload_tasks.values():
+            task.cancel()
+        self._validate_timer.stop()
+        for task in self._validate_tasks.values():
+            task.cancel()
+        if self._validator is not None:
+            self._validator.close()
+        # Let queued saves land before the window goes away, and deliver
+        # their saved/failed signals so the journal records them
+        self.writer.wait()
+        QCoreApplication.sendPostedEvents(None, QEvent.MetaCall)
+        if self.journal is not None:
+            self.journal.close()
         super().closeEvent(event)
\ No newline at end of file
@@ -0,0 +1,228 @@
+import sys
+
+# ----------------------------------------------------------------------
+# job_data
+#    - Compact in-memory representation of jobs and steps
+#    - __slots__ objects instead of dicts; the strings that repeat across
+#      thousands of jobs (runner labels, action references, step names,
+#      env/with keys, short values) are interned so they are shared
+#    - Each object keeps the key order it was read with (a shared tuple
+#      per distinct "shape"), so to_dict() round-trips the YAML layout
+#    - Jobs and steps are treated as immutable once built: edits create a
+#      new object with replace(), leaving the old one untouched
+#    - Conversion from/to dicts happens only at the YAML I/O boundary
+# ----------------------------------------------------------------------
+
+# Strings longer than this are usually unique (scripts, long expressions)
+# and are not worth putting in the intern table.
+INTERN_MAX_LENGTH = 120
+
+# One shared tuple per distinct key order
+_shapes = {}
+
+
+def _shape(keys):
+    keys = tuple(_intern(k) for k in keys)
+    return _shapes.setdefault(keys, keys)
+
+
+def _identity(value):
+    return value
+
+
+def _intern(value):
+    if type(value) is str and len(value) <= INTERN_MAX_LENGTH:
+        return sys.intern(value)
+    return value
+
+
+def _intern_value(value):
+    """Intern short strings, recursing into lists and dicts."""
+    if type(value) is str:
+        return _intern(value)
+    if type(value) is list:
+        return [_intern_value(v) for v in value]
+    if type(value) is dict:
+        return {_intern(k): _intern_value(v) for k, v in value.items()}
+    return value
+
+
+def _intern_dict(value):
+    """Intern the keys and short string values of a flat mapping."""
+    if type(value) is not dict:
+        return value
+    return {_intern(k): _intern(v) for k, v in value.items()}
+
+
+class _Record:
+    """Shared helpers for Job and Step; subclasses define FIELDS."""
+    __slots__ = ()
+
+    # YAML key -> slot name, for keys stored in their own slot
+    FIELDS = {}
+
+    # slot name -> function normalizing a value stored in that slot
+    CONVERTERS = {}
+
+    def _get(self, key):
+        slot = self.FIELDS.get(key)
+        if slot is not None:
+            return getattr(self, slot)
+        return self.extra[key]
+
+    def get(self, key, default=None):
+        """Value of a YAML key, or default if the key is absent."""
+        if key not in self.shape:
+            return default
+        return self._get(key)
+
+    def __contains__(self, key):
+        return key in self.shape
+
+    def keys(self):
+        return self.shape
+
+    def replace(self, **changes):
+        """
+        Return a copy with the given slots changed (e.g. runs_on=...).
+        Unchanged values, including extra, are shared with this object.
+        """
+        new = object.__new__(type(self))
+        for slot in self.__slots__:
+            setattr(new, slot, getattr(self, slot))
+        slot_keys = {slot: key for key, slot in self.FIELDS.items()}
+        added = []
+        for slot, value in changes.items():
+            if slot not in slot_keys:
+                raise AttributeError(f"{type(self).__name__} has no field {slot!r}")
+            setattr(new, slot, self.CONVERTERS.get(slot, _identity)(value))
+            if slot_keys[slot] not in self.shape:
+                added.append(slot_keys[slot])
+        if added:
+            new.shape = _shape(self.shape + tuple(added))
+        return new
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+# ----------------------------------------------------------------------
+# Step
+# ----------------------------------------------------------------------
+class Step(_Record):
+    __slots__ = ("shape", "name", "uses", "run", "with_", "env", "extra")
+
+    FIELDS = {"name": "name", "uses": "uses", "run": "run", "with": "with_", "env": "env"}
+    CONVERTERS = {"name": _intern, "uses": _intern, "with_": _intern_dict, "env": _intern_dict}
+
+    @classmethod
+    def from_dict(cls, data):
+        step = object.__new__(cls)
+        step.shape = _shape(data.keys())
+        step.name = _intern(data.get("name"))
+        step.uses = _intern(data.get("uses"))
+        step.run = data.get("run")
+        step.with_ = _intern_dict(data.get("with"))
+        step.env = _intern_dict(data.get("env"))
+        extra = {k: _intern_value(v) for k, v in data.items() if k not in cls.FIELDS}
+        step.extra = extra or None
+        return step
+
+    def to_dict(self):
+        return {key: self._get(key) for key in self.shape}
+
+
+def steps_from_data(data):
+    """
+    Build the steps value of a Job from parsed YAML. A list becomes a tuple
+    of Steps (existing Steps are kept as they are); anything else is kept
+    verbatim so it round-trips.
+    """
+    if type(data) is not list and type(data) is not tuple:
+        return data
+    return tuple(
+        Step.from_dict(s) if type(s) is dict else s
+        for s in data
+    )
+
+
+def steps_to_data(steps):
+    """Inverse of steps_from_data()."""
+    if type(steps) is not tuple:
+        return steps
+    return [s.to_dict() if type(s) is Step else s for s in steps]
+
+
+def _runs_on_from_data(value):
+    if type(value) is list:
+        return tuple(_intern(v) for v in value)
+    return _intern(value)
+
+
+def _runs_on_to_data(value):
+    if type(value) is tuple:
+        return list(value)
+    return value
+
+
+# ----------------------------------------------------------------------
+# Job
+# ----------------------------------------------------------------------
+class Job(_Record):
+    __slots__ = ("shape", "name", "runs_on", "steps", "env", "extra")
+
+    FIELDS = {"name": "name", "runs-on": "runs_on", "steps": "steps", "env": "env"}
+    CONVERTERS = {
+        "name": _intern,
+        "runs_on": _runs_on_from_data,
+        "steps": steps_from_data,
+        "env": _intern_dict,
+    }
+
+    def __init__(self, name=None, runs_on=None, steps=None, env=None):
+        """A new job with only the given fields (None means absent)."""
+        fields = (("name", name), ("runs-on", runs_on), ("steps", steps), ("env", env))
+        self.shape = _shape(k for k, v in fields if v is not None)
+        self.name = _intern(name)
+        self.runs_on = _runs_on_from_data(runs_on)
+        self.steps = steps_from_data(steps)
+        self.env = _intern_dict(env)
+        self.extra = None
+
+    @classmethod
+    def from_dict(cls, data, step_store=None):
+        """
+        Build a Job from parsed YAML. With a step_store (a
+        step_store.StepStore), equal steps lists share one tuple.
+        """
+        job = object.__new__(cls)
+        job.shape = _shape(data.keys())
+        job.name = _intern(data.get("name"))
+        job.runs_on = _runs_on_from_data(data.get("runs-on"))
+        if step_store is None:
+            job.steps = steps_from_data(data.get("steps"))
+        else:
+            job.steps = step_store.steps(data.get("steps"))
+        job.env = _intern_dict(data.get("env"))
+        extra = {k: _intern_value(v) for k, v in data.items() if k not in cls.FIELDS}
+        job.extra = extra or None
+        return job
+
+    def to_dict(self):
+        data = {}
+        for key in self.shape:
+            if key == "steps":
+                data[key] = steps_to_data(self.steps)
+            elif key == "runs-on":
+                data[key] = _runs_on_to_data(self.runs_on)
+            else:
+                data[key] = self._get(key)
+        return data
+
+
+def jobs_from_data(raw_jobs):
+    return [Job.from_dict(j) for j in raw_jobs]
+
+
+def jobs_to_data(jobs):
+    return [job.to_dict() for job in jobs]
@@ -1,19 +1,52 @@
-from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtWidgets import (
-    QPushButton, QLineEdit, QGroupBox, QFormLayout, QComboBox, QPlainTextEdit, QMessageBox
+    QPushButton, QLineEdit, QGroupBox, QFormLayout, QComboBox, QPlainTextEdit, QMessageBox,
+    QLabel, QListWidget, QListWidgetItem
 )
-import yaml
+from YamlEditor.ci_advisor import format_finding
+from YamlEditor.matrix import DEFAULT_MATRIX_BUDGET, effective_job_count, job_matrix
+from YamlEditor.render_cache import RenderCache, DEFAULT_MAX_BYTES
+from YamlEditor.schema_validator import format_problem
+from YamlEditor.yaml_validator import (
+    ParseCache, ParseResult, YamlFieldValidator, text_key
+)
+
+
+def _check_env(data):
+    if data is not None and not isinstance(data, dict):
+        return "Env must be a YAML dictionary."
+    return None
+
+
+# Schema problems listed in the form and the save prompt
+MAX_SHOWN_PROBLEMS = 10
+
+
+def _problems_text(problems):
+    lines = [format_problem(problem) for problem in problems[:MAX_SHOWN_PROBLEMS]]
+    if len(problems) > MAX_SHOWN_PROBLEMS:
+        lines.append(f"... and {len(problems) - MAX_SHOWN_PROBLEMS} more")
+    return "\n".join(lines)
 
 # ----------------------------------------------------------------------
 # JobEditorWidget
 #    - Displays fields for a single job (name, runs-on, steps, env)
+#    - Shows how many runner jobs its strategy.matrix expands to
+#    - Shows the job's workflow schema problems and asks before saving a
+#      job that has some (when given a schema_validator.PresetValidator)
+#    - Lists CI advice about the job (ci_advisor findings); applying one
+#      is left to the owner through fixRequested
 #    - Allows saving changes back to the data model
 # ----------------------------------------------------------------------
 class JobEditorWidget(QGroupBox):
-    jobSaved = pyqtSignal(dict)   # Emitted with the updated job dictionary
+    jobSaved = pyqtSignal(int, object)   # Emitted with (job index, updated Job)
+    fixRequested = pyqtSignal(object)    # Emitted with the ci_advisor.Finding to apply
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, render_cache_bytes=DEFAULT_MAX_BYTES,
+                 matrix_budget=DEFAULT_MATRIX_BUDGET, validator=None):
         super().__init__("Job Editor", parent)
+        self.matrix_budget = matrix_budget
+        self.validator = validator      # schema_validator.PresetValidator, optional
         self.setVisible(False)  # hidden until a job is selected
 
         form_layout = QFormLayout()
@@ -36,53 +69,177 @@ class JobEditorWidget(QGroupBox):
             "env:\n  FOO: bar\n  BAZ: 123"
         )
 
+        # Live validation messages, shown under each YAML field
+        self.job_steps_error = QLabel()
+        self.job_env_error = QLabel()
+        for label in (self.job_steps_error, self.job_env_error):
+            label.setStyleSheet("color: #FF6B6B; font-size: 12px;")
+            label.setWordWrap(True)
+            label.setVisible(False)
+
+        # Runner jobs this job schedules (its matrix size)
+        self.job_matrix_label = QLabel()
+
+        # Schema problems of the job as loaded (fields the form hides too)
+        self.job_schema_error = QLabel()
+        self.job_schema_error.setStyleSheet("color: #FF6B6B; font-size: 12px;")
+        self.job_schema_error.setWordWrap(True)
+        self.job_schema_error.setVisible(False)
+
+        # CI advice about this job, largest saving first
+        self.job_advice_list = QListWidget()
+        self.job_advice_list.setMaximumHeight(110)
+        self.job_advice_list.setWordWrap(True)
+        self.btn_apply_fix = QPushButton("Apply Fix")
+        self.btn_apply_fix.setEnabled(False)
+        self.job_advice_label = QLabel("CI Advice:")
+        for widget in (self.job_advice_label, self.job_advice_list, self.btn_apply_fix):
+            widget.setVisible(False)
+
         self.btn_save_job = QPushButton("Save Changes")
 
         form_layout.addRow("Job Name:", self.job_name_edit)
         form_layout.addRow("Runs On:", self.job_runs_on_combo)
+        form_layout.addRow("Runner Jobs:", self.job_matrix_label)
+        form_layout.addRow("", self.job_schema_error)
         form_layout.addRow("Steps (YAML):", self.job_steps_edit)
+        form_layout.addRow("", self.job_steps_error)
         form_layout.addRow("Environment (YAML):", self.job_env_edit)
+        form_layout.addRow("", self.job_env_error)
+        form_layout.addRow(self.job_advice_label, self.job_advice_list)
+        form_layout.addRow("", self.btn_apply_fix)
         form_layout.addWidget(self.btn_save_job)
 
         # Internal tracking of current job index or data
         self._current_job_index = None
         self._current_job = None
+        self._kept_runs_on = None       # combo text shown for a runs-on the combo cannot show
+
+        # Rendered steps/env text, reused when switching back to a job
+        self._render_cache = RenderCache(render_cache_bytes)
+
+        # Parsed steps/env by text hash: filled while typing, reused on save
+        self._parse_cache = ParseCache()
+        self._steps_validator = YamlFieldValidator(self.job_steps_edit, self._parse_cache)
+        self._env_validator = YamlFieldValidator(
+            self.job_env_edit, self._parse_cache, check=_check_env
+        )
 
         # Connections
         self.btn_save_job.clicked.connect(self._on_save_job)
+        self.btn_apply_fix.clicked.connect(self._on_apply_fix)
+        self.job_advice_list.currentItemChanged.connect(
+            lambda current, _previous: self.btn_apply_fix.setEnabled(current is not None)
+        )
+        self._steps_validator.validated.connect(
+            lambda message: self._show_error(self.job_steps_error, message)
+        )
+        self._env_validator.validated.connect(
+            lambda message: self._show_error(self.job_env_error, message)
+        )
 
-    def load_job(self, job_dict, job_index):
+    def load_job(self, job, job_index):
         """
-        Populate fields from the given job dict.
+        Populate fields from the given Job.
         Store job_index so we can identify which job we are editing.
         """
         self._current_job_index = job_index
-        self._current_job = job_dict
+        self._current_job = job
 
-        self.job_name_edit.setText(job_dict.get("name", ""))
-        runs_on_value = job_dict.get("runs-on", "")
+        self.job_name_edit.setText(job.name or "")
+        # Only a single runner label can be shown in the combo
+        runs_on_value = job.runs_on if isinstance(job.runs_on, str) else ""
         idx = self.job_runs_on_combo.findText(runs_on_value)
         if idx == -1 and runs_on_value:
             self.job_runs_on_combo.addItem(runs_on_value)
             idx = self.job_runs_on_combo.count() - 1
         self.job_runs_on_combo.setCurrentIndex(idx if idx >= 0 else 0)
+        # Label lists, group mappings and a missing runs-on (reusable
+        # workflows) are kept on save unless another runner is picked;
+        # strings (even empty ones) are saved as the combo shows them
+        self._kept_runs_on = (
+            None if isinstance(job.runs_on, str) else self.job_runs_on_combo.currentText()
+        )
+        self.job_runs_on_combo.setToolTip(
+            "" if isinstance(job.runs_on, str) else f"Kept as is: {job.runs_on!r}"
+        )
 
-        # Steps
-        steps_data = job_dict.get("steps", [])
-        steps_yaml = yaml.dump(steps_data, default_flow_style=False, sort_keys=False)
-        self.job_steps_edit.setPlainText(steps_yaml)
+        self._show_job_count(job)
+        self._show_error(self.job_schema_error, _problems_text(self._schema_problems(job)))
 
-        # Env
-        env_data = job_dict.get("env", {})
-        env_yaml = yaml.dump(env_data, default_flow_style=False, sort_keys=False)
+        # Steps / Env
+        steps_yaml, env_yaml = self._render_cache.render(job)
+        self.job_steps_edit.setPlainText(steps_yaml)
         self.job_env_edit.setPlainText(env_yaml)
 
+        # The rendered text is known to be valid and to parse back to the
+        # job's own data, so seed the parse cache instead of validating it.
+        self._parse_cache.put(text_key(steps_yaml), ParseResult(job.get("steps", ())))
+        self._parse_cache.put(text_key(env_yaml), ParseResult(job.get("env", {})))
+        self._steps_validator.reset()
+        self._env_validator.reset()
+
         self.setVisible(True)
 
+    def current_job_index(self):
+        """Index of the job being edited, or None."""
+        return self._current_job_index
+
+    def set_job_index(self, job_index):
+        """The job being edited moved to job_index (the form is kept as is)."""
+        if self._current_job is not None:
+            self._current_job_index = job_index
+
+    def set_findings(self, findings):
+        """Show the ci_advisor findings about the job being edited."""
+        self.job_advice_list.clear()
+        for finding in findings:
+            item = QListWidgetItem(format_finding(finding))
+            item.setData(Qt.UserRole, finding)
+            item.setToolTip(finding.title)
+            self.job_advice_list.addItem(item)
+        for widget in (self.job_advice_label, self.job_advice_list, self.btn_apply_fix):
+            widget.setVisible(bool(findings))
+        self.btn_apply_fix.setEnabled(False)
+
+    def _on_apply_fix(self):
+        item = self.job_advice_list.currentItem()
+        if item is not None:
+            self.fixRequested.emit(item.data(Qt.UserRole))
+
+    def forget_job(self, job):
+        """Drop everything cached for a job that no longer exists."""
+        self._render_cache.discard(job)
+
+    def _show_job_count(self, job):
+        count = effective_job_count(job)
+        over_budget = False
+        if job_matrix(job) is None:
+            text = "1"
+        elif count is None:
+            text = "dynamic matrix (computed at run time)"
+        else:
+            text = f"{count} (matrix)"
+            if self.matrix_budget and count > self.matrix_budget:
+                text += f" — over budget ({self.matrix_budget})"
+                over_budget = True
+        self.job_matrix_label.setText(text)
+        self.job_matrix_label.setStyleSheet("color: #FF6B6B;" if over_budget else "")
+
+    def _schema_problems(self, job):
+        if self.validator is None:
+            return ()
+        return self.validator.validate_job(job)
+
+    def _show_error(self, label, message):
+        label.setText(message)
+        label.setVisible(bool(message))
+
     def clear_job(self):
         """Hide and clear the form."""
         self._current_job_index = None
         self._current_job = None
+        self.set_findings([])
         self.setVisible(False)
 
     def _on_save_job(self):
@@ -91,38 +248,44 @@ class JobEditorWidget(QGroupBox):
             return
 
         job_name = self.job_name_edit.text()
-        runs_on_value = self.job_runs_on_combo.currentText()
-
-        # Steps
-        steps_yaml = self.job_steps_edit.toPlainText().strip()
-        steps_data = []
-        if steps_yaml:
-            try:
-                steps_data = yaml.safe_load(steps_yaml)
-            except yaml.YAMLError as e:
-                QMessageBox.warning(self, "YAML Error", f"Error parsing steps:\n{e}")
-                return
+        runs_on_text = self.job_runs_on_combo.currentText()
 
-        # Env
-        env_yaml = self.job_env_edit.toPlainText().strip()
-        env_data = {}
-        if env_yaml:
-            try:
-                env_data = yaml.safe_load(env_yaml)
-                if not isinstance(env_data, dict):
-                    QMessageBox.warning(self, "YAML Error", "Env must be a YAML dictionary.")
-                    return
-            except yaml.YAMLError as e:
-                QMessageBox.warning(self, "YAML Error", f"Error parsing env:\n{e}")
-                return
+        # Steps (usually already parsed by live validation)
+        result = self._parse_cache.parse(self.job_steps_edit.toPlainText())
+        if not result.ok:
+            QMessageBox.warning(self, "YAML Error", f"Error parsing steps:\n{result.error}")
+            return
+        steps_data = result.data if result.data is not None else []
 
-        updated_job = {
-            "name": job_name,
-            "runs-on": runs_on_value,
-            "steps": steps_data,
-            "env": env_data
-        }
-        # We can store the index if needed, or just send the dict
-        updated_job["__index__"] = self._current_job_index
+        # Env
+        result = self._parse_cache.parse(self.job_env_edit.toPlainText())
+        message = self._env_validator.error_for(result)
+        if message:
+            if result.ok:
+                QMessageBox.warning(self, "YAML Error", message)
+            else:
+                QMessageBox.warning(self, "YAML Error", f"Error parsing env:\n{message}")
+            return
+        env_data = result.data if result.data is not None else {}
 
-        self.jobSaved.emit(updated_job)
+        # Fields the form does not show (needs, strategy, ...) are kept, and
+        # so is a runs-on the combo cannot show unless another runner was
+        # picked
+        fields = {"name": job_name, "steps": steps_data, "env": env_data}
+        if self._kept_runs_on is None or runs_on_text != self._kept_runs_on:
+            fields["runs_on"] = runs_on_text
+        job = self._current_job.replace(**fields)
+        problems = self._schema_problems(job)
+        if problems:
+            answer = QMessageBox.question(
+                self, "Schema Problems",
+                f"The job does not match the workflow schema:\n\n{_problems_text(problems)}"
+                "\n\nSave anyway?"
+            )
+            if answer != QMessageBox.Yes:
+                return
+        self._current_job = job
+        if "runs_on" in fields:
+            self._kept_runs_on = None
+            self.job_runs_on_combo.setToolTip("")
+        self.jobSaved.emit(self._current_job_index, job)
@@ -0,0 +1,308 @@
+import heapq
+from YamlEditor.preset_io import job_ids
+
+# ----------------------------------------------------------------------
+# job_graph
+#    - The `needs:` dependency graph of a preset's jobs
+#    - Cycle detection, critical path, slack, and an estimate of total
+#      pipeline time with a limited number of concurrent runners
+#    - No Qt imports
+# ----------------------------------------------------------------------
+
+# Default duration estimate (seconds) when none is supplied for a job
+JOB_OVERHEAD_SECONDS = 20      # runner pickup + setup
+USES_STEP_SECONDS = 15         # `uses:` steps (checkout, setup-*, cache)
+RUN_STEP_SECONDS = 30          # `run:` steps
+
+
+def estimate_duration(job):
+    """Rough duration of a job in seconds, from its steps."""
+    seconds = JOB_OVERHEAD_SECONDS
+    steps = job.steps if isinstance(job.steps, tuple) else ()
+    for step in steps:
+        if getattr(step, "uses", None):
+            seconds += USES_STEP_SECONDS
+        else:
+            seconds += RUN_STEP_SECONDS
+    return seconds
+
+
+def format_duration(seconds):
+    """12m 30s style duration."""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    if minutes:
+        return f"{minutes}m {secs:02d}s"
+    return f"{secs}s"
+
+
+def _needs_of(job):
+    needs = job.get("needs")
+    if needs is None:
+        return []
+    if isinstance(needs, str):
+        return [needs]
+    if isinstance(needs, list):
+        return [n for n in needs if isinstance(n, str)]
+    return []
+
+
+class JobGraph:
+    """
+    Jobs are nodes (by list index); an edge u -> v means v needs u.
+    A `needs` entry may name a job by its workflow job id or its name.
+    """
+
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.ids = job_ids(jobs)
+        lookup = {}
+        for i, job in enumerate(jobs):
+            if job.name is not None:
+                lookup.setdefault(job.name, i)
+        for i, jid in enumerate(self.ids):
+            lookup[jid] = i
+
+        self.preds = [[] for _ in jobs]
+        self.succs = [[] for _ in jobs]
+        self.missing = []   # (job index, unresolved needs entry)
+        for v, job in enumerate(jobs):
+            for ref in _needs_of(job):
+                u = lookup.get(ref)
+                if u is None:
+                    self.missing.append((v, ref))
+                elif u not in self.preds[v]:
+                    self.preds[v].append(u)
+                    self.succs[u].append(v)
+
+        self.order, self.cycles = self._topological_order()
+
+    def edges(self):
+        return [(u, v) for v, preds in enumerate(self.preds) for u in preds]
+
+    def _topological_order(self):
+        """Kahn's algorithm; jobs left over are on (or behind) a cycle."""
+        indegree = [len(p) for p in self.preds]
+        ready = [i for i, d in enumerate(indegree) if d == 0]
+        order = []
+        while ready:
+            u = ready.pop()
+            order.append(u)
+            for v in self.succs[u]:
+                indegree[v] -= 1
+                if indegree[v] == 0:
+                    ready.append(v)
+        cycles = []
+        if len(order) < len(self.jobs):
+            blocked = set(range(len(self.jobs))) - set(order)
+            cycles = self._strongly_connected(blocked)
+        return order, cycles
+
+    def _strongly_connected(self, nodes):
+        """Tarjan's SCC (iterative) over nodes; returns the cyclic components."""
+        index = {}
+        low = {}
+        on_stack = set()
+        stack = []
+        counter = 0
+        components = []
+        for root in sorted(nodes):
+            if root in index:
+                continue
+            work = [(root, 0)]
+            while work:
+                v, i = work.pop()
+                if i == 0:
+                    index[v] = low[v] = counter
+                    counter += 1
+                    stack.append(v)
+                    on_stack.add(v)
+                succs = [w for w in self.succs[v] if w in nodes]
+                if i < len(succs):
+                    work.append((v, i + 1))
+                    w = succs[i]
+                    if w not in index:
+                        work.append((w, 0))
+                    elif w in on_stack:
+                        low[v] = min(low[v], index[w])
+                    continue
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[v])
+                if low[v] == index[v]:
+                    component = []
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.append(w)
+                        if w == v:
+                            break
+                    if len(component) > 1 or v in self.preds[v]:
+                        components.append(sorted(component))
+        return components
+
+    def analyze(self, durations=None, concurrency=None, estimate=estimate_duration):
+        """
+        durations: { job id -> seconds }, falling back to estimate(job).
+        concurrency: max jobs running at once (None = unlimited).
+        Jobs on or behind a cycle cannot run and are left out.
+        """
+        return GraphAnalysis(self, durations or {}, concurrency, estimate)
+
+
+class GraphAnalysis:
+    def __init__(self, graph, durations, concurrency, estimate):
+        self.graph = graph
+        self.concurrency = concurrency
+        n = len(graph.jobs)
+        self.duration = [
+            durations.get(graph.ids[i], durations.get(graph.jobs[i].name))
+            for i in range(n)
+        ]
+        for i in range(n):
+            if self.duration[i] is None:
+                self.duration[i] = estimate(graph.jobs[i])
+        self.schedulable = set(graph.order)
+
+        order = graph.order
+        # Forward pass: earliest start/finish
+        self.earliest_start = [None] * n
+        self.earliest_finish = [None] * n
+        critical_pred = [None] * n
+        for v in order:
+            start = 0
+            for u in graph.preds[v]:
+                if self.earliest_finish[u] > start:
+                    start = self.earliest_finish[u]
+                    critical_pred[v] = u
+            self.earliest_start[v] = start
+            self.earliest_finish[v] = start + self.duration[v]
+        self.critical_length = max((self.earliest_finish[v] for v in order), default=0)
+
+        # Backward pass: latest finish and slack; also each job's bottom
+        # level (longest path to the end), used as scheduling priority
+        self.slack = [None] * n
+        latest_finish = [None] * n
+        self.bottom_level = [0] * n
+        for u in reversed(order):
+            lf = self.critical_length
+            bottom = 0
+            for v in graph.succs[u]:
+                if latest_finish[v] is None:
+                    continue    # blocked behind a cycle
+                lf = min(lf, latest_finish[v] - self.duration[v])
+                bottom = max(bottom, self.bottom_level[v])
+            latest_finish[u] = lf
+            self.slack[u] = lf - self.earliest_finish[u]
+            self.bottom_level[u] = bottom + self.duration[u]
+
+        # Critical path: walk back from the job that finishes last
+        self.critical_path = []
+        if order:
+            v = max(order, key=lambda j: self.earliest_finish[j])
+            while v is not None:
+                self.critical_path.append(v)
+                v = critical_pred[v]
+            self.critical_path.reverse()
+        self.critical_set = set(self.critical_path)
+
+        self.total_work = sum(self.duration[v] for v in order)
+        self.estimated_total, self.peak_parallelism = self._schedule()
+
+    @property
+    def serializing_edges(self):
+        """Edges along the critical path: each one delays the whole pipeline."""
+        path = self.critical_path
+        return list(zip(path, path[1:]))
+
+    @property
+    def parallelism(self):
+        """Average number of jobs running at once over the estimated total."""
+        if not self.estimated_total:
+            return 0.0
+        return self.total_work / self.estimated_total
+
+    @property
+    def max_parallelism(self):
+        """Parallelism with unlimited runners (total work / critical path)."""
+        if not self.critical_length:
+            return 0.0
+        return self.total_work / self.critical_length
+
+    def _schedule(self):
+        """
+        List-schedule the DAG onto `concurrency` runners, always starting
+        the ready job with the longest remaining path first. Returns
+        (makespan, peak number of jobs running at once).
+        """
+        graph = self.graph
+        if self.concurrency is None or self.concurrency <= 0:
+            peak = self._peak_unlimited()
+            return self.critical_length, peak
+
+        remaining = {v: len(graph.preds[v]) for v in graph.order}
+        ready_time = {v: 0 for v in graph.order}
+        ready = [(-self.bottom_level[v], v) for v in graph.order if remaining[v] == 0]
+        heapq.heapify(ready)
+        running = []    # (finish time, job)
+        now = 0
+        makespan = 0
+        peak = 0
+        while ready or running:
+            while ready and len(running) < self.concurrency:
+                _, v = heapq.heappop(ready)
+                start = max(now, ready_time[v])
+                heapq.heappush(running, (start + self.duration[v], v))
+            peak = max(peak, len(running))
+            finish, u = heapq.heappop(running)
+            now = finish
+            makespan = max(makespan, finish)
+            for v in graph.succs[u]:
+                if v not in remaining:
+                    continue
+                remaining[v] -= 1
+                ready_time[v] = max(ready_time[v], finish)
+                if remaining[v] == 0:
+                    heapq.heappush(ready, (-self.bottom_level[v], v))
+        return makespan, peak
+
+    def _peak_unlimited(self):
+        events = []
+        for v in self.graph.order:
+            events.append((self.earliest_start[v], 1))
+            events.append((self.earliest_finish[v], -1))
+        events.sort()
+        peak = running = 0
+        for _, delta in events:
+            running += delta
+            peak = max(peak, running)
+        return peak
+
+    def summary(self):
+        """One-line human readable summary."""
+        graph = self.graph
+        parts = [f"Critical path {format_duration(self.critical_length)}"]
+        if self.critical_path:
+            names = [graph.ids[v] for v in self.critical_path]
+            if len(names) > 6:
+                names = names[:3] + ["..."] + names[-2:]
+            parts[0] += " (" + " → ".join(names) + ")"
+        if not self.concurrency:
+            runners = "unlimited runners"
+        else:
+            runners = f"{self.concurrency} runner{'s' if self.concurrency != 1 else ''}"
+        parts.append(f"est. total {format_duration(self.estimated_total)} with {runners}")
+        parts.append(f"parallelism {self.parallelism:.1f} (max {self.max_parallelism:.1f})")
+        if graph.cycles:
+            parts.append(f"{len(graph.cycles)} cycle(s)!")
+        if graph.missing:
+            parts.append(f"{len(graph.missing)} unknown needs")
+        return " · ".join(parts)
+
+
+def analyze_jobs(jobs, durations=None, concurrency=None):
+    """Build the needs graph of jobs and analyze it."""
+    return JobGraph(jobs).analyze(durations, concurrency)
@@ -0,0 +1,221 @@
+from bisect import bisect_left
+from PyQt5.QtCore import Qt, QAbstractItemModel, QModelIndex
+from PyQt5.QtGui import QColor, QFont
+from YamlEditor.job_graph import format_duration
+
+COLUMNS = ["Jobs", "Needs", "Start", "Duration", "Slack"]
+CRITICAL_COLOR = QColor("#C62828")
+
+# ----------------------------------------------------------------------
+# JobListModel
+#    - Flat item model over the list of Jobs of the current preset
+#    - Wraps the preset's own list (no copy); mutations go through the
+#      model so views get fine-grained insert/remove/change signals
+#    - Optional dependency-graph columns from a GraphAnalysis; results
+#      are matched to jobs by identity, so they stay attached to the
+#      right rows while the list changes until the next analysis lands
+#    - Optional filter: only the jobs in a set of id(job) are shown, and
+#      view rows map to rows of the job list (source rows)
+# ----------------------------------------------------------------------
+class JobListModel(QAbstractItemModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._jobs = []
+        self._analysis = None
+        self._analysis_rows = {}    # id(job) -> position in the analysis
+        self._rows = None           # shown source rows when filtered, sorted
+        self._row_by_id = None      # id(job) -> source row, built on demand
+
+    # ------------------------------------------------------------------
+    # QAbstractItemModel interface
+    # ------------------------------------------------------------------
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not self.hasIndex(row, column, parent):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        # Flat list: no item has a parent
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self._rows is not None:
+            return len(self._rows)
+        return len(self._jobs)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        job = self._jobs[self.source_row(index.row())]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return job.name if job.name is not None else "Unnamed Job"
+            if column == 1:
+                needs = job.get("needs")
+                if isinstance(needs, list):
+                    return ", ".join(str(n) for n in needs)
+                return needs if isinstance(needs, str) else ""
+            return self._analysis_text(job, column)
+        if role in (Qt.ForegroundRole, Qt.FontRole) and self._is_critical(job):
+            if role == Qt.ForegroundRole:
+                return CRITICAL_COLOR
+            font = QFont()
+            font.setBold(True)
+            return font
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole and 0 <= section < len(COLUMNS):
+            return COLUMNS[section]
+        return None
+
+    def _analysis_position(self, job):
+        pos = self._analysis_rows.get(id(job))
+        if pos is None or self._analysis.graph.jobs[pos] is not job:
+            return None
+        return pos
+
+    def _is_critical(self, job):
+        if self._analysis is None:
+            return False
+        pos = self._analysis_position(job)
+        return pos is not None and pos in self._analysis.critical_set
+
+    def _analysis_text(self, job, column):
+        if self._analysis is None:
+            return ""
+        pos = self._analysis_position(job)
+        if pos is None:
+            return ""
+        analysis = self._analysis
+        if pos not in analysis.schedulable:
+            return "cycle" if column == 4 else ""
+        if column == 2:
+            return format_duration(analysis.earliest_start[pos])
+        if column == 3:
+            return format_duration(analysis.duration[pos])
+        if column == 4:
+            if pos in analysis.critical_set:
+                return "critical"
+            return format_duration(analysis.slack[pos])
+        return ""
+
+    # ------------------------------------------------------------------
+    # Job list API
+    # ------------------------------------------------------------------
+    def set_jobs(self, jobs):
+        """Show the given list of jobs (the list itself is kept, not copied)."""
+        self.beginResetModel()
+        self._jobs = jobs
+        self._analysis = None
+        self._analysis_rows = {}
+        self._rows = None
+        self._row_by_id = None
+        self.endResetModel()
+
+    def jobs(self):
+        return self._jobs
+
+    def set_analysis(self, analysis):
+        """Show the results of a GraphAnalysis in the graph columns."""
+        self._analysis = analysis
+        if analysis is None:
+            self._analysis_rows = {}
+        else:
+            self._analysis_rows = {id(job): i for i, job in enumerate(analysis.graph.jobs)}
+        rows = self.rowCount()
+        if rows:
+            # One signal for the whole block; the view repaints visible rows only
+            self.dataChanged.emit(self.index(0, 0), self.index(rows - 1, len(COLUMNS) - 1))
+
+    def analysis(self):
+        return self._analysis
+
+    def insert_job(self, row, job):
+        """Insert a job at row, emitting rowsInserted for that row only."""
+        row = max(0, min(row, len(self._jobs)))
+        self._row_by_id = None
+        if self._rows is not None:
+            # Filtered: the caller re-applies the filter afterwards
+            self.beginResetModel()
+            self._jobs.insert(row, job)
+            self._rows = []
+            self.endResetModel()
+            return row
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._jobs.insert(row, job)
+        self.endInsertRows()
+        return row
+
+    def remove_job(self, row):
+        """Remove the job at row, emitting rowsRemoved for that row only."""
+        if not 0 <= row < len(self._jobs):
+            return None
+        self._row_by_id = None
+        if self._rows is not None:
+            self.beginResetModel()
+            job = self._jobs.pop(row)
+            self._rows = []
+            self.endResetModel()
+            return job
+        self.beginRemoveRows(QModelIndex(), row, row)
+        job = self._jobs.pop(row)
+        self.endRemoveRows()
+        return job
+
+    def replace_job(self, row, job):
+        """Put job at row in place of the old one (returned), emitting dataChanged."""
+        if not 0 <= row < len(self._jobs):
+            return None
+        old_job = self._jobs[row]
+        self._jobs[row] = job
+        if self._row_by_id is not None:
+            self._row_by_id.pop(id(old_job), None)
+            self._row_by_id[id(job)] = row
+        view_row = self.view_row(row)
+        if view_row is not None:
+            self.dataChanged.emit(
+                self.index(view_row, 0), self.index(view_row, len(COLUMNS) - 1)
+            )
+        return old_job
+
+    # ------------------------------------------------------------------
+    # Filtering
+    # ------------------------------------------------------------------
+    def set_filter(self, job_ids):
+        """Show only the jobs whose id() is in job_ids; None shows all."""
+        rows = None
+        if job_ids is not None and len(job_ids) < len(self._jobs):
+            if self._row_by_id is None:
+                self._row_by_id = {id(job): i for i, job in enumerate(self._jobs)}
+            row_by_id = self._row_by_id
+            rows = sorted(row_by_id[i] for i in job_ids if i in row_by_id)
+        if rows is None and self._rows is None:
+            return
+        self.beginResetModel()
+        self._rows = rows
+        self.endResetModel()
+
+    def is_filtered(self):
+        return self._rows is not None
+
+    def source_row(self, view_row):
+        """Row in the job list of a row shown in the view."""
+        if self._rows is None:
+            return view_row
+        return self._rows[view_row]
+
+    def view_row(self, source_row):
+        """Row shown in the view for a job list row, None if filtered out."""
+        if self._rows is None:
+            return source_row if 0 <= source_row < len(self._jobs) else None
+        i = bisect_left(self._rows, source_row)
+        if i < len(self._rows) and self._rows[i] == source_row:
+            return i
+        return None
@@ -1,23 +1,69 @@
-from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt5.QtGui import QKeySequence
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QTreeWidget, QTreeWidgetItem
+    QPushButton, QTreeView, QHeaderView, QLabel, QSpinBox, QLineEdit
 )
+from YamlEditor.job_graph import JobGraph
+from YamlEditor.job_list_model import JobListModel
+from YamlEditor.matrix import DEFAULT_MATRIX_BUDGET, PresetJobCount
+
+# Wait for edits to settle before re-analyzing the dependency graph
+ANALYSIS_DELAY_MS = 200
+
+# Wait for typing to pause before counting matches in the other presets
+OTHER_PRESETS_COUNT_DELAY_MS = 250
+
+
+# ----------------------------------------------------------------------
+# GraphAnalysisTask
+#    - Analyzes a snapshot of the job list on a QThreadPool worker
+#    - Also counts the runner jobs the preset's matrices expand to
+#    - Jobs are immutable, so a copy of the list is a stable snapshot
+# ----------------------------------------------------------------------
+class GraphAnalysisSignals(QObject):
+    finished = pyqtSignal(int, object, object)   # (generation, GraphAnalysis, PresetJobCount)
+
+
+class GraphAnalysisTask(QRunnable):
+    def __init__(self, generation, jobs, concurrency, matrix_budget):
+        super().__init__()
+        self.generation = generation
+        self.jobs = jobs
+        self.concurrency = concurrency
+        self.matrix_budget = matrix_budget
+        self.signals = GraphAnalysisSignals()
+
+    def run(self):
+        analysis = JobGraph(self.jobs).analyze(concurrency=self.concurrency)
+        job_count = PresetJobCount(self.jobs, self.matrix_budget)
+        self.signals.finished.emit(self.generation, analysis, job_count)
+
 
 # ----------------------------------------------------------------------
 # JobListWidget
-#    - Displays the jobs (tree) for the current preset
-#    - Add/Remove jobs
+#    - Displays the jobs (tree view over a JobListModel) for the current preset
+#    - Add/Remove jobs, Undo/Redo (Ctrl+Z / Ctrl+Shift+Z outside text fields)
 #    - Signal when a job is selected
+#    - Shows the needs-graph analysis (critical path, total time) and the
+#      runner jobs the matrices expand to, flagged when over matrix_budget
+#    - Filter box: narrows the list through a SearchIndex; signals and
+#      set_current_job_index always use rows of the preset's job list
 # ----------------------------------------------------------------------
 class JobListWidget(QWidget):
     jobSelected = pyqtSignal(int)          # Emitted with the job index
     addJobRequested = pyqtSignal()         # Emitted when user clicks Add Job
     removeJobRequested = pyqtSignal(int)   # Emitted when user clicks Remove Job on current job
     savePresetRequested = pyqtSignal()     # Emitted when user wants to save the preset
+    undoRequested = pyqtSignal()
+    redoRequested = pyqtSignal()
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, matrix_budget=DEFAULT_MATRIX_BUDGET):
         super().__init__(parent)
+        self.matrix_budget = matrix_budget
+        self._job_count = None
+        self.search_index = None
+        self.preset_name = None
 
         self.setLayout(QVBoxLayout())
         self.layout().setContentsMargins(8, 8, 8, 8)
@@ -28,43 +74,218 @@ class JobListWidget(QWidget):
         self.btn_add = QPushButton("Add Job")
         self.btn_remove = QPushButton("Remove Job")
         self.btn_save_preset = QPushButton("Save Preset")
+        self.btn_undo = QPushButton("Undo")
+        self.btn_undo.setShortcut(QKeySequence.Undo)
+        self.btn_redo = QPushButton("Redo")
+        self.btn_redo.setShortcut(QKeySequence.Redo)
         btn_layout.addWidget(self.btn_add)
         btn_layout.addWidget(self.btn_remove)
+        btn_layout.addWidget(self.btn_undo)
+        btn_layout.addWidget(self.btn_redo)
         btn_layout.addWidget(self.btn_save_preset)
+        self.set_undo_state(None, None)
         self.layout().addLayout(btn_layout)
 
-        # Jobs tree
-        self.jobs_tree = QTreeWidget()
-        self.jobs_tree.setHeaderLabels(["Jobs"])
+        # Filter box
+        filter_layout = QHBoxLayout()
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText(
+            "Filter jobs (name, step, uses:, run:, env: ...)"
+        )
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_status = QLabel()
+        filter_layout.addWidget(self.filter_edit, 1)
+        filter_layout.addWidget(self.filter_status)
+        self.layout().addLayout(filter_layout)
+
+        # Jobs tree: the view only creates/paints the rows that are visible.
+        # Uniform row heights let it skip measuring every row.
+        self.jobs_model = JobListModel(self)
+        self.jobs_tree = QTreeView()
+        self.jobs_tree.setModel(self.jobs_model)
+        self.jobs_tree.setRootIsDecorated(False)
+        self.jobs_tree.setUniformRowHeights(True)
+        self.jobs_tree.header().setStretchLastSection(False)
+        self.jobs_tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
         self.layout().addWidget(self.jobs_tree)
 
+        # Dependency graph summary and runner limit
+        graph_layout = QHBoxLayout()
+        self.graph_summary = QLabel()
+        self.graph_summary.setWordWrap(True)
+        self.runners_spin = QSpinBox()
+        self.runners_spin.setRange(0, 10000)
+        self.runners_spin.setSpecialValueText("unlimited")
+        self.runners_spin.setPrefix("Runners: ")
+        graph_layout.addWidget(self.graph_summary, 1)
+        graph_layout.addWidget(self.runners_spin)
+        self.layout().addLayout(graph_layout)
+
+        self._analysis_generation = 0
+        self._analysis_tasks = {}
+        self._analysis_timer = QTimer(self)
+        self._analysis_timer.setSingleShot(True)
+        self._analysis_timer.setInterval(ANALYSIS_DELAY_MS)
+        self._analysis_timer.timeout.connect(self._start_analysis)
+
+        self._filter_status = ""
+        self._count_timer = QTimer(self)
+        self._count_timer.setSingleShot(True)
+        self._count_timer.setInterval(OTHER_PRESETS_COUNT_DELAY_MS)
+        self._count_timer.timeout.connect(self._count_other_presets)
+
         # Connections
         self.btn_add.clicked.connect(lambda: self.addJobRequested.emit())
         self.btn_remove.clicked.connect(self._on_remove_clicked)
         self.btn_save_preset.clicked.connect(lambda: self.savePresetRequested.emit())
-        self.jobs_tree.itemClicked.connect(self._on_tree_item_clicked)
+        self.btn_undo.clicked.connect(lambda: self.undoRequested.emit())
+        self.btn_redo.clicked.connect(lambda: self.redoRequested.emit())
+        self.jobs_tree.clicked.connect(self._on_tree_index_clicked)
+        self.runners_spin.valueChanged.connect(lambda _value: self.schedule_analysis())
+        self.filter_edit.textChanged.connect(lambda _text: self._apply_filter())
+
+    def set_search_index(self, search_index):
+        """Use search_index (a SearchIndex over all presets) for the filter box."""
+        self.search_index = search_index
+        self._apply_filter()
 
-    def refresh_jobs(self, jobs):
-        """Clear and rebuild the job tree from the given list of jobs (dicts)."""
-        self.jobs_tree.clear()
-        for job in jobs:
-            name = job.get("name", "Unnamed Job")
-            item = QTreeWidgetItem([name])
-            self.jobs_tree.addTopLevelItem(item)
+    def refresh_jobs(self, jobs, preset_name=None):
+        """Show the given list of Jobs; used when switching presets."""
+        self.preset_name = preset_name
+        self.jobs_model.set_jobs(jobs)
+        self._job_count = None
+        self._show_summary("")
+        self._apply_filter()
+        self.schedule_analysis()
+
+    # The search index must already reflect a change when these are called
+    def insert_job(self, index, job):
+        """Insert a single job into the list and return its row."""
+        row = self.jobs_model.insert_job(index, job)
+        self._refilter()
+        self.schedule_analysis()
+        return row
+
+    def remove_job(self, index):
+        """Remove a single job from the list and return it."""
+        job = self.jobs_model.remove_job(index)
+        self._refilter()
+        self.schedule_analysis()
+        return job
+
+    def replace_job(self, index, job):
+        """Replace a single job in the list and return the old one."""
+        old_job = self.jobs_model.replace_job(index, job)
+        self._refilter()
+        self.schedule_analysis()
+        return old_job
+
+    def _refilter(self):
+        """Re-run the filter after an edit, keeping the current job selected."""
+        if not self.filter_edit.text().strip():
+            return
+        current = self._current_source_row()
+        self._apply_filter()
+        if current is not None:
+            self.set_current_job_index(current)
+
+    def _apply_filter(self):
+        text = self.filter_edit.text()
+        ids = None
+        if self.search_index is not None and self.preset_name is not None:
+            ids = self.search_index.match_ids(text, self.preset_name)
+        self.jobs_model.set_filter(ids)
+        if ids is None:
+            self._count_timer.stop()
+            self.filter_status.clear()
+            return
+        self._filter_status = f"{self.jobs_model.rowCount()} of {len(self.jobs_model.jobs())}"
+        self.filter_status.setText(self._filter_status)
+        # The other presets are only counted once typing pauses
+        self._count_timer.start()
+
+    def _count_other_presets(self):
+        text = self.filter_edit.text()
+        if self.search_index is None or self.preset_name is None:
+            return
+        elsewhere = sum(self.search_index.count(text, skip=self.preset_name).values())
+        if elsewhere:
+            self.filter_status.setText(f"{self._filter_status} · {elsewhere} in other presets")
+
+    def analysis(self):
+        """The latest GraphAnalysis of the shown jobs (None until ready)."""
+        return self.jobs_model.analysis()
+
+    def job_count(self):
+        """The latest PresetJobCount of the shown jobs (None until ready)."""
+        return self._job_count
+
+    def set_matrix_budget(self, budget):
+        """Runner jobs allowed per preset / matrix before it is flagged (0 = no limit)."""
+        self.matrix_budget = budget
+        self.schedule_analysis()
+
+    def schedule_analysis(self):
+        """Re-analyze the dependency graph once edits settle."""
+        # Results still in flight are for an older job list now
+        self._analysis_generation += 1
+        self._analysis_timer.start()
+
+    def _start_analysis(self):
+        jobs = list(self.jobs_model.jobs())
+        if not jobs:
+            self._job_count = None
+            self._show_summary("")
+            return
+        concurrency = self.runners_spin.value() or None
+        task = GraphAnalysisTask(
+            self._analysis_generation, jobs, concurrency, self.matrix_budget
+        )
+        task.signals.finished.connect(self._on_analysis_finished)
+        self._analysis_tasks[task.generation] = task
+        QThreadPool.globalInstance().start(task)
+
+    def _on_analysis_finished(self, generation, analysis, job_count):
+        self._analysis_tasks.pop(generation, None)
+        if generation != self._analysis_generation:
+            return
+        self.jobs_model.set_analysis(analysis)
+        self._job_count = job_count
+        self._show_summary(
+            analysis.summary() + " · " + job_count.summary(),
+            over_budget=job_count.exceeds_budget
+        )
+
+    def _show_summary(self, text, over_budget=False):
+        self.graph_summary.setText(text)
+        self.graph_summary.setStyleSheet("color: #FF6B6B;" if over_budget else "")
 
     def set_current_job_index(self, index):
-        """Select a job by index in the tree if valid."""
-        if 0 <= index < self.jobs_tree.topLevelItemCount():
-            self.jobs_tree.setCurrentItem(self.jobs_tree.topLevelItem(index))
+        """Select a job by index in the tree if valid (and not filtered out)."""
+        row = self.jobs_model.view_row(index)
+        if row is not None:
+            model_index = self.jobs_model.index(row, 0)
+            self.jobs_tree.setCurrentIndex(model_index)
+            self.jobs_tree.scrollTo(model_index)
+
+    def _current_source_row(self):
+        model_index = self.jobs_tree.currentIndex()
+        if not model_index.isValid():
+            return None
+        return self.jobs_model.source_row(model_index.row())
+
+    def set_undo_state(self, undo_label, redo_label):
+        """Enable Undo/Redo for the named steps (None: nothing to undo/redo)."""
+        self.btn_undo.setEnabled(undo_label is not None)
+        self.btn_undo.setToolTip(f"Undo {undo_label}" if undo_label else "")
+        self.btn_redo.setEnabled(redo_label is not None)
+        self.btn_redo.setToolTip(f"Redo {redo_label}" if redo_label else "")
 
-    def _on_tree_item_clicked(self, item, column):
-        idx = self.jobs_tree.indexOfTopLevelItem(item)
-        if idx >= 0:
-            self.jobSelected.emit(idx)
+    def _on_tree_index_clicked(self, model_index):
+        if model_index.isValid():
+            self.jobSelected.emit(self.jobs_model.source_row(model_index.row()))
 
     def _on_remove_clicked(self):
-        item = self.jobs_tree.currentItem()
-        if item:
-            idx = self.jobs_tree.indexOfTopLevelItem(item)
-            if idx >= 0:
-                self.removeJobRequested.emit(idx)
+        row = self._current_source_row()
+        if row is not None:
+            self.removeJobRequested.emit(row)
@@ -0,0 +1,220 @@
+import itertools
+
+# ----------------------------------------------------------------------
+# matrix
+#    - strategy.matrix expansion with GitHub's include/exclude rules
+#    - count_combinations() works from axis sizes and never builds the
+#      cartesian product; iter_combinations() yields combinations lazily
+#    - No Qt imports
+#
+# GitHub semantics:
+#    - the axes (every key but include/exclude) form a cartesian product
+#    - an exclude entry removes every combination matching all its pairs
+#    - an include entry is merged into every remaining combination whose
+#      original axis values it does not overwrite; if it fits none, it
+#      becomes a combination of its own
+#    - a matrix with no axes runs one job per include entry
+# ----------------------------------------------------------------------
+
+# GitHub allows at most 256 jobs per matrix
+DEFAULT_MATRIX_BUDGET = 256
+
+# Above this many inclusion-exclusion terms, enumerate the excluded axes instead
+_MAX_EXCLUSION_TERMS = 1 << 12
+
+
+class DynamicMatrix(Exception):
+    """The matrix is (partly) computed at run time, e.g. ${{ fromJSON(...) }}."""
+
+
+def _split(matrix):
+    """Return (axes, include, exclude); raise DynamicMatrix if not static."""
+    if not isinstance(matrix, dict):
+        raise DynamicMatrix()
+    axes = {}
+    for key, values in matrix.items():
+        if key in ("include", "exclude"):
+            continue
+        if not isinstance(values, list):
+            raise DynamicMatrix()
+        axes[key] = values
+    include = matrix.get("include", [])
+    exclude = matrix.get("exclude", [])
+    if not isinstance(include, list) or not isinstance(exclude, list):
+        raise DynamicMatrix()
+    include = [i for i in include if isinstance(i, dict)]
+    exclude = [e for e in exclude if isinstance(e, dict)]
+    return axes, include, exclude
+
+
+def _occurrences(values, value):
+    return sum(1 for v in values if v == value)
+
+
+def _count_product(axes, constraints):
+    """Combinations of axes agreeing with constraints { axis -> value }."""
+    total = 1
+    for key, values in axes.items():
+        if key in constraints:
+            total *= _occurrences(values, constraints[key])
+        else:
+            total *= len(values)
+        if total == 0:
+            return 0
+    return total
+
+
+def _merge(a, b):
+    """Union of two constraint sets, or None if they disagree."""
+    merged = dict(a)
+    for key, value in b.items():
+        if key in merged and merged[key] != value:
+            return None
+        merged[key] = value
+    return merged
+
+
+def _count_surviving(axes, exclude, constraints):
+    """Combinations agreeing with constraints that no exclude entry removes."""
+    # An exclude naming a key that is not an axis can never match
+    exclude = [e for e in exclude if all(k in axes for k in e)]
+    # ...nor one that contradicts the constraints
+    exclude = [e for e in exclude if _merge(constraints, e) is not None]
+    if not exclude:
+        return _count_product(axes, constraints)
+
+    excluded_axes = sorted({k for e in exclude for k in e} - set(constraints))
+    enumeration_cost = 1
+    for key in excluded_axes:
+        enumeration_cost *= len(axes[key])
+
+    if len(exclude) <= 12 and (1 << len(exclude)) <= min(enumeration_cost, _MAX_EXCLUSION_TERMS):
+        return _count_by_inclusion_exclusion(axes, exclude, constraints)
+    return _count_by_enumeration(axes, exclude, constraints, excluded_axes)
+
+
+def _count_by_inclusion_exclusion(axes, exclude, constraints):
+    """|all| - |union of excluded sets|, pruning contradictory intersections."""
+    excluded = 0
+
+    def visit(start, merged, depth):
+        nonlocal excluded
+        for i in range(start, len(exclude)):
+            combined = _merge(merged, exclude[i])
+            if combined is None:
+                continue    # empty intersection, and so are all supersets
+            sign = 1 if depth % 2 == 0 else -1
+            excluded += sign * _count_product(axes, combined)
+            visit(i + 1, combined, depth + 1)
+
+    visit(0, constraints, 0)
+    return _count_product(axes, constraints) - excluded
+
+
+def _count_by_enumeration(axes, exclude, constraints, excluded_axes):
+    """Enumerate only the axes exclude entries mention; multiply the rest."""
+    free = {k: v for k, v in axes.items() if k not in excluded_axes}
+    free_count = _count_product(free, constraints)
+    if free_count == 0:
+        return 0
+    surviving = 0
+    for values in itertools.product(*(axes[k] for k in excluded_axes)):
+        combo = dict(constraints)
+        combo.update(zip(excluded_axes, values))
+        if not any(all(combo.get(k) == v for k, v in e.items()) for e in exclude):
+            surviving += 1
+    return surviving * free_count
+
+
+def _include_fits_some(axes, exclude, entry):
+    """Does the include entry extend at least one surviving combination?"""
+    constraints = {k: v for k, v in entry.items() if k in axes}
+    return _count_surviving(axes, exclude, constraints) > 0
+
+
+def count_combinations(matrix):
+    """
+    Number of jobs a strategy.matrix expands to, computed without building
+    the combinations. Raises DynamicMatrix if it cannot be known statically.
+    """
+    axes, include, exclude = _split(matrix)
+    if not axes:
+        return len(include)
+    surviving = _count_surviving(axes, exclude, {})
+    extra = sum(1 for entry in include if not _include_fits_some(axes, exclude, entry))
+    return surviving + extra
+
+
+def iter_combinations(matrix):
+    """Yield the matrix combinations (dicts) one at a time, in GitHub's order."""
+    axes, include, exclude = _split(matrix)
+    if not axes:
+        for entry in include:
+            yield dict(entry)
+        return
+
+    keys = list(axes)
+    standalone = [entry for entry in include if not _include_fits_some(axes, exclude, entry)]
+    merging = [entry for entry in include if not any(entry is s for s in standalone)]
+    for values in itertools.product(*(axes[k] for k in keys)):
+        original = dict(zip(keys, values))
+        if any(all(k in original and original[k] == v for k, v in e.items()) for e in exclude):
+            continue
+        combo = dict(original)
+        for entry in merging:
+            if all(original[k] == v for k, v in entry.items() if k in original):
+                combo.update(entry)
+        yield combo
+    for entry in standalone:
+        yield dict(entry)
+
+
+# ----------------------------------------------------------------------
+# Jobs and presets
+# ----------------------------------------------------------------------
+def job_matrix(job):
+    strategy = job.get("strategy")
+    if isinstance(strategy, dict) and "matrix" in strategy:
+        return strategy["matrix"]
+    return None
+
+
+def effective_job_count(job):
+    """Runner jobs a job schedules: 1, its matrix size, or None if dynamic."""
+    matrix = job_matrix(job)
+    if matrix is None:
+        return 1
+    try:
+        return count_combinations(matrix)
+    except DynamicMatrix:
+        return None
+
+
+class PresetJobCount:
+    """Runner-job accounting for a whole preset."""
+
+    def __init__(self, jobs, budget=DEFAULT_MATRIX_BUDGET):
+        self.budget = budget
+        self.total = 0
+        self.dynamic = []        # indexes of jobs whose matrix is not static
+        self.over_budget = []    # (index, count) of jobs above the budget
+        for i, job in enumerate(jobs):
+            count = effective_job_count(job)
+            if count is None:
+                self.dynamic.append(i)
+                continue
+            self.total += count
+            if budget and count > budget:
+                self.over_budget.append((i, count))
+
+    @property
+    def exceeds_budget(self):
+        return bool(self.over_budget) or bool(self.budget and self.total > self.budget)
+
+    def summary(self):
+        text = f"{self.total} runner job(s)"
+        if self.dynamic:
+            text += f" + {len(self.dynamic)} dynamic matri{'x' if len(self.dynamic) == 1 else 'ces'}"
+        if self.exceeds_budget:
+            text += f" — over budget ({self.budget})"
+        return text
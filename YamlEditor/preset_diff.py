@@ -0,0 +1,32 @@
+import difflib
+import hashlib
+import json
+
+# ----------------------------------------------------------------------
+# preset_diff
+#    - Content hashes of jobs and the edit script between two job lists
+#    - Used to apply an on-disk change to a loaded preset job by job
+#    - No Qt imports
+# ----------------------------------------------------------------------
+
+
+def job_digest(job):
+    """Hash of a job's content (independent of object identity)."""
+    text = json.dumps(job.to_dict(), sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def diff_jobs(old_jobs, new_jobs):
+    """
+    difflib opcodes turning old_jobs into new_jobs, comparing jobs by
+    content: [(tag, i1, i2, j1, j2)] with tag in equal/replace/delete/insert.
+    """
+    old_keys = [job_digest(job) for job in old_jobs]
+    new_keys = [job_digest(job) for job in new_jobs]
+    matcher = difflib.SequenceMatcher(None, old_keys, new_keys, autojunk=False)
+    return matcher.get_opcodes()
+
+
+def changed_count(opcodes):
+    """Number of jobs inserted, removed or replaced by opcodes."""
+    return sum(max(i2 - i1, j2 - j1) for tag, i1, i2, j1, j2 in opcodes if tag != "equal")
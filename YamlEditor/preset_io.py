@@ -0,0 +1,282 @@
+import hashlib
+import os
+import re
+import tempfile
+from YamlEditor import preset_patch, yaml_io
+from YamlEditor.job_data import Job, jobs_to_data
+from YamlEditor.step_store import (
+    DEFAULT_ACTIONS_DIR, StepStore, extract_composite_actions, shared_steps_data
+)
+
+# ----------------------------------------------------------------------
+# preset_io
+#    - Loading, normalizing and saving presets, plus turning a preset into
+#      a GitHub workflow document
+#    - No Qt imports: shared by the editor and the command-line compiler
+# ----------------------------------------------------------------------
+
+# Read files in chunks so we can report progress and stop early on cancel
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class LoadCancelled(Exception):
+    """Raised inside a load when the task has been cancelled."""
+
+
+def normalize_jobs(raw_jobs, check_cancelled=None, report=None):
+    """
+    Turn the raw 'jobs' entry of a preset into a list of Jobs.
+    Plain strings become Job(name=..., runs_on=""); anything else is dropped.
+    Jobs with equal steps share one tuple of Steps.
+    """
+    jobs = []
+    store = StepStore()
+    total = len(raw_jobs) or 1
+    for i, j in enumerate(raw_jobs):
+        if isinstance(j, dict):
+            jobs.append(Job.from_dict(j, store))
+        elif isinstance(j, str):
+            jobs.append(Job(name=j, runs_on=""))
+        if i % 1000 == 0:
+            if check_cancelled:
+                check_cancelled()
+            if report:
+                report(i / total)
+    return jobs
+
+
+def parse_preset(data, check_cancelled=None, report=None):
+    """Return (preset_name, jobs) from an already parsed preset document."""
+    data = data or {}
+    preset_name = data.get("name", "UnnamedPreset")
+    raw_jobs = data.get("jobs", [])
+    return preset_name, normalize_jobs(raw_jobs, check_cancelled, report)
+
+
+def _load(file_name, check_cancelled, report, keep_source, info=None, known_hash=None):
+    check = check_cancelled or (lambda: None)
+    progress = report or (lambda fraction: None)
+
+    # Read (0% - 40%)
+    stat = os.stat(file_name)
+    chunks = []
+    digest = hashlib.sha256()
+    with open(file_name, "rb") as file:
+        size = stat.st_size or 1
+        read = 0
+        while True:
+            check()
+            chunk = file.read(READ_CHUNK_SIZE)
+            if not chunk:
+                break
+            chunks.append(chunk)
+            digest.update(chunk)
+            read += len(chunk)
+            progress(0.4 * min(read / size, 1.0))
+
+    # The hash and mtime describe exactly the bytes parsed below
+    content_hash = digest.hexdigest()
+    if info is not None:
+        info["content_hash"] = content_hash
+        info["mtime"] = stat.st_mtime
+    if known_hash is not None and content_hash == known_hash:
+        return None
+
+    # Parse (40% - 90%)
+    check()
+    raw = b"".join(chunks)
+    text = raw.decode("utf-8-sig")
+    if keep_source:
+        root, data = yaml_io.load_with_node(text)
+    else:
+        data = yaml_io.load(text)
+    progress(0.9)
+
+    # Normalize (90% - 100%)
+    check()
+    preset_name, jobs = parse_preset(
+        data, check, lambda fraction: progress(0.9 + 0.1 * fraction)
+    )
+    source = None
+    if keep_source:
+        check()
+        source = preset_patch.scan_source(raw, text, root, preset_name, jobs, stat)
+    progress(1.0)
+    return preset_name, jobs, source
+
+
+def load_preset_file(file_name, check_cancelled=None, report=None, info=None):
+    """
+    Read and parse a preset file, returning (preset_name, jobs).
+    report(fraction) is called with 0.0 - 1.0 as the load progresses and
+    check_cancelled() is called between steps (it raises to abort).
+    info is filled as by load_preset_source().
+    """
+    preset_name, jobs, _source = _load(file_name, check_cancelled, report, False, info)
+    return preset_name, jobs
+
+
+def load_preset_source(file_name, check_cancelled=None, report=None, info=None,
+                       known_hash=None):
+    """
+    Like load_preset_file(), also recording where each job is in the file:
+    returns (preset_name, jobs, source) with source a PresetSource (None if
+    the file's jobs cannot be patched in place on save).
+    info, if given, is filled with the "content_hash" (sha256) and "mtime"
+    of the bytes read. If they hash to known_hash, nothing is parsed and
+    None is returned.
+    """
+    return _load(file_name, check_cancelled, report, True, info, known_hash)
+
+
+def preset_to_data(preset_name, jobs, share_steps=False):
+    """
+    Build the document written to a preset file. With share_steps, equal
+    steps lists are one shared list (see step_store.shared_steps_data).
+    """
+    return {
+        "name": preset_name,
+        "jobs": shared_steps_data(jobs) if share_steps else jobs_to_data(jobs)
+    }
+
+
+def dump_preset(preset_name, jobs, share_steps=False):
+    """
+    Return the text of a preset file. With share_steps, repeated steps
+    lists are written once, as a YAML anchor, and then as aliases.
+    """
+    return yaml_io.dump(preset_to_data(preset_name, jobs, share_steps), aliases=share_steps)
+
+
+def write_atomic(file_name, content):
+    """
+    Replace file_name with content (str, bytes or an iterable of byte
+    chunks) atomically: write a temp
+    file next to it, fsync it, then rename it over the target. Readers see
+    either the old file or the new one, never a partial write.
+    """
+    directory = os.path.dirname(os.path.abspath(file_name))
+    fd, tmp_name = tempfile.mkstemp(
+        prefix="." + os.path.basename(file_name) + ".", suffix=".tmp", dir=directory
+    )
+    try:
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        with os.fdopen(fd, "wb") as f:
+            if isinstance(content, (bytes, bytearray)):
+                f.write(content)
+            else:
+                for chunk in content:
+                    f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+        # Keep the permissions of the file being replaced
+        try:
+            os.chmod(tmp_name, os.stat(file_name).st_mode & 0o7777)
+        except OSError:
+            os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, file_name)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def save_preset_file(file_name, preset_name, jobs):
+    """Write a preset to file_name."""
+    write_atomic(file_name, dump_preset(preset_name, jobs))
+
+
+# ----------------------------------------------------------------------
+# Workflow output
+# ----------------------------------------------------------------------
+DEFAULT_TRIGGERS = ["push"]
+
+
+def job_id(name):
+    """
+    Turn a job name into a workflow job id: lowercase letters, digits,
+    '-' and '_', starting with a letter or '_'.
+    """
+    slug = re.sub(r"[^a-z0-9_-]+", "-", str(name).lower()).strip("-")
+    if not slug:
+        slug = "job"
+    if not (slug[0].isalpha() or slug[0] == "_"):
+        slug = "_" + slug
+    return slug
+
+
+def job_ids(jobs):
+    """Return a unique job id for each job, in order."""
+    ids = []
+    seen = set()
+    for job in jobs:
+        base = job_id(job.name if job.name is not None else "job")
+        candidate = base
+        n = 2
+        while candidate in seen:
+            candidate = f"{base}-{n}"
+            n += 1
+        seen.add(candidate)
+        ids.append(candidate)
+    return ids
+
+
+def _needs_ids(needs, lookup):
+    if isinstance(needs, str):
+        return lookup.get(needs, needs)
+    if isinstance(needs, list):
+        return [lookup.get(n, n) if isinstance(n, str) else n for n in needs]
+    return needs
+
+
+def preset_to_workflow(preset_name, jobs, triggers=None, share_steps=False):
+    """
+    Build a GitHub workflow document from a preset: the preset's jobs list
+    becomes the workflow's 'jobs' mapping, keyed by job_ids(). `needs`
+    entries naming a job (by name or id, as in job_graph) become its id.
+    """
+    data = shared_steps_data(jobs) if share_steps else [job.to_dict() for job in jobs]
+    ids = job_ids(jobs)
+    lookup = {}
+    for job, jid in zip(jobs, ids):
+        if isinstance(job.name, str):
+            lookup.setdefault(job.name, jid)
+    lookup.update((jid, jid) for jid in ids)
+    for job_data in data:
+        if "needs" in job_data:
+            job_data["needs"] = _needs_ids(job_data["needs"], lookup)
+    return {
+        "name": preset_name,
+        "on": list(triggers or DEFAULT_TRIGGERS),
+        "jobs": dict(zip(ids, data)),
+    }
+
+
+# How compile_preset_file writes step sequences repeated across jobs
+DEDUP_MODES = ("anchors", "composite")
+
+
+def compile_preset_file(file_name, output_name, triggers=None, dedup=None,
+                        actions_dir=DEFAULT_ACTIONS_DIR, info=None):
+    """
+    Load a preset file and write it out as a workflow file.
+    dedup: None writes every job's steps in full; "anchors" writes repeated
+    steps lists once as YAML anchors; "composite" moves them into composite
+    actions written under actions_dir (relative to the current directory,
+    which should be the repository root).
+    info is filled with the "content_hash" of the preset as it was read.
+    """
+    preset_name, jobs = load_preset_file(file_name, info=info)
+    if dedup == "composite":
+        jobs, actions = extract_composite_actions(jobs, actions_dir)
+        for name, action in actions.items():
+            action_file = os.path.join(actions_dir, name, "action.yml")
+            os.makedirs(os.path.dirname(action_file), exist_ok=True)
+            write_atomic(action_file, yaml_io.dump(action))
+    share_steps = dedup == "anchors"
+    workflow = preset_to_workflow(preset_name, jobs, triggers, share_steps)
+    write_atomic(output_name, yaml_io.dump(workflow, aliases=share_steps))
+    return preset_name, len(jobs)
@@ -0,0 +1,83 @@
+import hashlib
+import os
+import sqlite3
+from collections import namedtuple
+
+# ----------------------------------------------------------------------
+# preset_library
+#    - Persistent index of known preset files in a local SQLite database
+#    - Stores only metadata (name, path, mtime, job count, content hash);
+#      preset bodies stay in their files and are loaded on demand
+#    - No Qt imports
+# ----------------------------------------------------------------------
+DEFAULT_LIBRARY_PATH = os.path.join(
+    os.path.expanduser("~"), ".github_actions_editor", "library.sqlite3"
+)
+
+PresetEntry = namedtuple("PresetEntry", ["name", "path", "mtime", "job_count", "content_hash"])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS presets (
+    path TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    job_count INTEGER NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS presets_name ON presets (name);
+"""
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """sha256 of a file's bytes."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class PresetLibrary:
+    def __init__(self, db_path=DEFAULT_LIBRARY_PATH):
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.db_path = db_path
+        self._conn = sqlite3.connect(db_path)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def entries(self):
+        """All indexed presets, ordered by name (reads only the index)."""
+        rows = self._conn.execute(
+            "SELECT name, path, mtime, job_count, content_hash FROM presets ORDER BY name, path"
+        )
+        return [PresetEntry(*row) for row in rows]
+
+    def get(self, path):
+        row = self._conn.execute(
+            "SELECT name, path, mtime, job_count, content_hash FROM presets WHERE path = ?",
+            (os.path.abspath(path),)
+        ).fetchone()
+        return PresetEntry(*row) if row else None
+
+    def record(self, path, name, job_count, content_hash=None, mtime=None):
+        """Add or update the entry for path and return it."""
+        path = os.path.abspath(path)
+        if mtime is None:
+            mtime = os.stat(path).st_mtime
+        if content_hash is None:
+            content_hash = file_digest(path)
+        entry = PresetEntry(name, path, mtime, job_count, content_hash)
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO presets (name, path, mtime, job_count, content_hash) "
+                "VALUES (?, ?, ?, ?, ?)",
+                entry
+            )
+        return entry
+
+    def remove(self, path):
+        with self._conn:
+            self._conn.execute("DELETE FROM presets WHERE path = ?", (os.path.abspath(path),))
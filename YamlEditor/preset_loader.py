@@ -0,0 +1,105 @@
+import threading
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+from YamlEditor.preset_io import LoadCancelled, load_preset_source
+from YamlEditor.preset_diff import diff_jobs
+from YamlEditor.search_index import build_preset_index
+
+
+# ----------------------------------------------------------------------
+# PresetLoadSignals
+#    - QRunnable is not a QObject, so its signals live here.
+#    - Created on the GUI thread; emitting from the worker thread queues
+#      delivery back onto the GUI thread.
+# ----------------------------------------------------------------------
+class PresetLoadSignals(QObject):
+    progress = pyqtSignal(str, int)          # (file name, percent)
+    loaded = pyqtSignal(str, str, list, dict)  # (file name, preset name, jobs, file info)
+    failed = pyqtSignal(str, str)            # (file name, error message)
+    cancelled = pyqtSignal(str)              # (file name)
+    unchanged = pyqtSignal(str)              # (file name) reload found the known content
+
+
+# ----------------------------------------------------------------------
+# PresetLoadTask
+#    - Loads and normalizes one preset file on a QThreadPool worker, and
+#      builds its search postings there too
+#    - Can be cancelled from the GUI thread at any time
+# ----------------------------------------------------------------------
+class PresetLoadTask(QRunnable):
+    def __init__(self, file_name):
+        super().__init__()
+        self.file_name = file_name
+        self.signals = PresetLoadSignals()
+        self._cancel_event = threading.Event()
+        self._last_percent = -1
+
+    def cancel(self):
+        """Request cancellation; the worker stops at its next checkpoint."""
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def _check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise LoadCancelled()
+
+    def _report(self, fraction):
+        percent = int(fraction * 100)
+        if percent != self._last_percent:
+            self._last_percent = percent
+            self.signals.progress.emit(self.file_name, percent)
+
+    def _load(self):
+        """Return (preset name, jobs, file info), or None if there is nothing new."""
+        # File metadata for the preset library index (of the bytes parsed),
+        # and the job spans used to patch the file on save
+        info = {}
+        preset_name, jobs, info["source"] = load_preset_source(
+            self.file_name, self._check_cancelled, self._report, info
+        )
+        self._check_cancelled()
+        info["search_index"] = build_preset_index(jobs)
+        return preset_name, jobs, info
+
+    def run(self):
+        try:
+            result = self._load()
+        except LoadCancelled:
+            self.signals.cancelled.emit(self.file_name)
+        except Exception as e:
+            self.signals.failed.emit(self.file_name, str(e))
+        else:
+            if self.is_cancelled():
+                self.signals.cancelled.emit(self.file_name)
+            elif result is None:
+                self.signals.unchanged.emit(self.file_name)
+            else:
+                self.signals.loaded.emit(self.file_name, *result)
+
+
+# ----------------------------------------------------------------------
+# PresetReloadTask
+#    - Re-reads a loaded preset whose file changed on disk
+#    - Skips parsing when the file still has the known content (e.g. our
+#      own save); otherwise diffs the new jobs against a snapshot of the
+#      loaded ones, so only the changes need applying on the GUI thread
+#    - info["opcodes"]: diff_jobs(old_jobs, jobs)
+# ----------------------------------------------------------------------
+class PresetReloadTask(PresetLoadTask):
+    def __init__(self, file_name, old_jobs, known_hash=None):
+        super().__init__(file_name)
+        self.old_jobs = old_jobs
+        self.known_hash = known_hash
+
+    def _load(self):
+        info = {}
+        loaded = load_preset_source(
+            self.file_name, self._check_cancelled, self._report, info, self.known_hash
+        )
+        if loaded is None:
+            return None
+        preset_name, jobs, info["source"] = loaded
+        self._check_cancelled()
+        info["opcodes"] = diff_jobs(self.old_jobs, jobs)
+        return preset_name, jobs, info
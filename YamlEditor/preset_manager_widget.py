@@ -1,6 +1,7 @@
+import bisect
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout,
-     QLabel, QListWidget, QPushButton
+     QLabel, QListWidget, QListWidgetItem, QPushButton
 )
 from PyQt5.QtCore import Qt, pyqtSignal
 
@@ -9,6 +10,7 @@ from PyQt5.QtCore import Qt, pyqtSignal
 #    - Handles the list of presets on the left
 #    - Create/Load/Delete
 #    - Emits signals when something changes
+#    - Keeps the list sorted and updates it one row at a time
 # ----------------------------------------------------------------------
 class PresetManagerWidget(QWidget):
     presetSelected = pyqtSignal(str)    # Emitted when user selects a preset
@@ -29,9 +31,11 @@ class PresetManagerWidget(QWidget):
 
         self.layout().addWidget(presets_label)
 
-        # List of presets
+        # List of presets; self._names mirrors its rows, in sorted order
         self.presets_list = QListWidget()
+        self.presets_list.setUniformItemSizes(True)
         self.layout().addWidget(self.presets_list)
+        self._names = []
 
         # Buttons
         button_layout = QHBoxLayout()
@@ -50,17 +54,52 @@ class PresetManagerWidget(QWidget):
         self.btn_load.clicked.connect(lambda: self.loadRequested.emit())
         self.btn_delete.clicked.connect(self._on_delete_clicked)
 
-    def refresh_list(self, preset_names):
+    def refresh_list(self, preset_names, tooltips=None):
         """Rebuild the list of presets from the given iterable of names."""
         self.presets_list.clear()
-        for name in sorted(preset_names):
-            self.presets_list.addItem(name)
+        self._names = sorted(preset_names)
+        self.presets_list.addItems(self._names)
+        if tooltips:
+            for row, name in enumerate(self._names):
+                if name in tooltips:
+                    self.presets_list.item(row).setToolTip(tooltips[name])
+
+    def add_preset(self, preset_name, tooltip=None):
+        """Insert a preset at its sorted position (no-op if already listed)."""
+        row = bisect.bisect_left(self._names, preset_name)
+        if row < len(self._names) and self._names[row] == preset_name:
+            item = self.presets_list.item(row)
+        else:
+            self._names.insert(row, preset_name)
+            item = QListWidgetItem(preset_name)
+            self.presets_list.insertItem(row, item)
+        if tooltip is not None:
+            item.setToolTip(tooltip)
+
+    def remove_preset(self, preset_name):
+        """Remove a single preset from the list."""
+        row = self._row_of(preset_name)
+        if row >= 0:
+            # Don't let the selection jump to a neighbouring preset
+            was_current = row == self.presets_list.currentRow()
+            self.presets_list.blockSignals(True)
+            del self._names[row]
+            self.presets_list.takeItem(row)
+            if was_current:
+                self.presets_list.setCurrentRow(-1)
+            self.presets_list.blockSignals(False)
 
     def set_current_preset(self, preset_name):
         """Select a preset in the list if it exists."""
-        matches = self.presets_list.findItems(preset_name, Qt.MatchExactly)
-        if matches:
-            self.presets_list.setCurrentItem(matches[0])
+        row = self._row_of(preset_name)
+        if row >= 0:
+            self.presets_list.setCurrentRow(row)
+
+    def _row_of(self, preset_name):
+        row = bisect.bisect_left(self._names, preset_name)
+        if row < len(self._names) and self._names[row] == preset_name:
+            return row
+        return -1
 
     def _on_current_item_changed(self, current, previous):
         if current:
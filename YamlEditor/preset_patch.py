@@ -0,0 +1,227 @@
+import mmap
+import os
+from collections import namedtuple
+from yaml.nodes import MappingNode, ScalarNode, SequenceNode
+from YamlEditor import yaml_io
+from YamlEditor.job_data import jobs_to_data
+
+# ----------------------------------------------------------------------
+# preset_patch
+#    - Byte spans of the jobs in a preset file, recorded at load time
+#    - Saving a preset whose file is unchanged on disk re-emits only the
+#      jobs that were replaced since and splices them into the original
+#      bytes (read through mmap); comments and formatting elsewhere in
+#      the file are kept
+#    - Anything else (new file, added/removed jobs, renamed preset, file
+#      changed on disk, anchors/aliases in the file) is a full dump
+#    - No Qt imports
+# ----------------------------------------------------------------------
+
+# Unchanged bytes are copied from the old file in pieces of this size
+COPY_CHUNK_SIZE = 1024 * 1024
+
+_BOM = b"\xef\xbb\xbf"
+
+# What a preset file looked like when it was loaded or saved:
+#   jobs      tuple of the Job objects read from / written to the file
+#   spans     (start, end) byte offsets of each job's YAML; end is just
+#             past the newline of the job's last line
+#   columns   column the first line of each job starts at
+#   newline   the file's line break ("\n" or "\r\n")
+#   size, mtime_ns   os.stat() of the file, to detect outside changes
+PresetSource = namedtuple(
+    "PresetSource", ["preset_name", "jobs", "spans", "columns", "newline", "size", "mtime_ns"]
+)
+
+
+# ----------------------------------------------------------------------
+# Load side
+# ----------------------------------------------------------------------
+def _has_aliases(root):
+    """True if any node is reached twice (an alias of an anchored node)."""
+    seen = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if id(node) in seen:
+            return True
+        seen.add(id(node))
+        if isinstance(node, MappingNode):
+            for key, value in node.value:
+                stack.append(key)
+                stack.append(value)
+        elif isinstance(node, SequenceNode):
+            stack.extend(node.value)
+    return False
+
+
+def _content_end(text, node):
+    """Character offset just past the line that ends node's content."""
+    # Block collections end where the next token starts (past trailing
+    # comments and blank lines), so follow their last value instead
+    while isinstance(node, (MappingNode, SequenceNode)) and not node.flow_style and node.value:
+        node = node.value[-1][1] if isinstance(node, MappingNode) else node.value[-1]
+    end = node.end_mark.index
+    if end > 0 and text[end - 1] == "\n":
+        return end      # block scalars end after their line breaks
+    newline = text.find("\n", end)
+    return len(text) if newline == -1 else newline + 1
+
+
+def _byte_offsets(text, offsets, base):
+    """Turn sorted character offsets into byte offsets of the UTF-8 text."""
+    result = []
+    pos = 0
+    byte_pos = base
+    for offset in offsets:
+        byte_pos += len(text[pos:offset].encode("utf-8"))
+        pos = offset
+        result.append(byte_pos)
+    return result
+
+
+def scan_source(raw, text, root, preset_name, jobs, stat):
+    """
+    Record where each job of a loaded preset lives in the file.
+    raw is the file's bytes, text its decoded content and root the composed
+    YAML node of text. Returns a PresetSource, or None if the file's jobs
+    cannot be patched in place.
+    """
+    if root is None or not isinstance(root, MappingNode) or _has_aliases(root):
+        return None
+    seq = None
+    for key, value in root.value:
+        if isinstance(key, ScalarNode) and key.value == "jobs":
+            seq = value
+    if not isinstance(seq, SequenceNode) or seq.flow_style:
+        return None
+
+    # The same items parse_preset keeps: mappings and plain strings
+    items = [
+        node for node in seq.value
+        if isinstance(node, MappingNode)
+        or (isinstance(node, ScalarNode) and node.tag == "tag:yaml.org,2002:str")
+    ]
+    if len(items) != len(jobs):
+        return None
+
+    bounds = []
+    for node in items:
+        bounds.append(node.start_mark.index)
+        bounds.append(_content_end(text, node))
+    if any(b < a for a, b in zip(bounds, bounds[1:])):
+        return None
+    if len(raw) == len(text):
+        offsets = bounds      # ASCII: characters are bytes
+    else:
+        offsets = _byte_offsets(text, bounds, len(_BOM) if raw.startswith(_BOM) else 0)
+
+    return PresetSource(
+        preset_name,
+        tuple(jobs),
+        tuple(zip(offsets[0::2], offsets[1::2])),
+        tuple(node.start_mark.column for node in items),
+        "\r\n" if b"\r\n" in raw[:raw.find(b"\n") + 1] else "\n",
+        stat.st_size,
+        stat.st_mtime_ns,
+    )
+
+
+# ----------------------------------------------------------------------
+# Save side
+# ----------------------------------------------------------------------
+def dump_job_item(job, column, newline="\n"):
+    """YAML for one job placed at column of a jobs list item (after '- ')."""
+    lines = yaml_io.dump(job.to_dict()).splitlines()
+    indent = " " * column
+    text = newline.join([lines[0]] + [indent + line if line else line for line in lines[1:]])
+    return (text + newline).encode("utf-8")
+
+
+def dump_preset_source(preset_name, jobs):
+    """
+    Return (content, source) for a full dump of a preset. The text is what
+    preset_io.dump_preset() writes; its job spans are found from the dump's
+    layout (each job starts a '- ' line at column 0) rather than parsed.
+    """
+    head = yaml_io.dump({"name": preset_name}).encode("utf-8")
+    body = yaml_io.dump({"jobs": jobs_to_data(jobs)}).encode("utf-8")
+    starts = []
+    pos = body.find(b"\n- ")
+    while pos != -1:
+        starts.append(len(head) + pos + 3)
+        pos = body.find(b"\n- ", pos + 1)
+    ends = [start - 2 for start in starts[1:]] + [len(head) + len(body)]
+    source = PresetSource(
+        preset_name, tuple(jobs), tuple(zip(starts, ends)),
+        (2,) * len(jobs), "\n", None, None
+    )
+    return head + body, source
+
+
+def plan_patch(source, preset_name, jobs):
+    """
+    Return [(index, job)] of the jobs that replaced the ones in source, or
+    None if the preset can only be saved by a full dump.
+    """
+    if source is None or source.size is None:
+        return None
+    if preset_name != source.preset_name or len(jobs) != len(source.jobs):
+        return None
+    return [(i, job) for i, (old, job) in enumerate(zip(source.jobs, jobs)) if old is not job]
+
+
+def _copy(view, start, end):
+    for pos in range(start, end, COPY_CHUNK_SIZE):
+        yield view[pos:min(pos + COPY_CHUNK_SIZE, end)]
+
+
+def _patched_chunks(file_name, spans, edits):
+    with open(file_name, "rb") as f:
+        if not spans:
+            yield from iter(lambda: f.read(COPY_CHUNK_SIZE), b"")
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            pos = 0
+            for (start, end), data in edits:
+                yield from _copy(view, pos, start)
+                yield data
+                pos = end
+            yield from _copy(view, pos, len(view))
+
+
+def render_preset(file_name, preset_name, jobs, source=None):
+    """
+    Return (content, source) to write a preset to file_name: content is the
+    file's bytes or an iterable of byte chunks and source the PresetSource
+    of the written file (its size/mtime are filled in by the caller).
+    Only jobs replaced since source are re-emitted when file_name still
+    holds source's content; otherwise the whole preset is dumped.
+    """
+    changed = plan_patch(source, preset_name, jobs)
+    if changed is not None:
+        try:
+            st = os.stat(file_name)
+        except OSError:
+            st = None
+        if st is None or (st.st_size, st.st_mtime_ns) != (source.size, source.mtime_ns):
+            changed = None
+    if changed is None:
+        return dump_preset_source(preset_name, jobs)
+
+    edits = []
+    spans = list(source.spans)
+    shift = 0
+    # Spans of later jobs move by the size difference of earlier edits
+    changed_at = {i: job for i, job in changed}
+    for i, (start, end) in enumerate(source.spans):
+        if i in changed_at:
+            data = dump_job_item(changed_at[i], source.columns[i], source.newline)
+            edits.append(((start, end), data))
+            spans[i] = (start + shift, start + shift + len(data))
+            shift += len(data) - (end - start)
+        elif shift:
+            spans[i] = (start + shift, end + shift)
+    content = _patched_chunks(file_name, source.spans, edits)
+    return content, source._replace(jobs=tuple(jobs), spans=tuple(spans))
+
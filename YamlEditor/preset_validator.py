@@ -0,0 +1,53 @@
+import threading
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+from YamlEditor.preset_io import LoadCancelled
+
+
+# ----------------------------------------------------------------------
+# PresetValidateSignals
+# ----------------------------------------------------------------------
+class PresetValidateSignals(QObject):
+    validated = pyqtSignal(str, int, list)   # (preset name, revision, problems per job)
+    failed = pyqtSignal(str, str)            # (preset name, error message)
+
+
+# ----------------------------------------------------------------------
+# PresetValidateTask
+#    - Validates a snapshot of a preset's jobs against the workflow schema
+#      on a QThreadPool worker, through a shared
+#      schema_validator.PresetValidator (which may shard the jobs across
+#      its process pool)
+#    - Jobs validated before (same object or same content) come from the
+#      validator's cache, so after a one-job edit only that job is checked
+#    - Can be cancelled from the GUI thread; the result is then dropped
+# ----------------------------------------------------------------------
+class PresetValidateTask(QRunnable):
+    def __init__(self, validator, preset_name, revision, jobs):
+        super().__init__()
+        self.validator = validator
+        self.preset_name = preset_name
+        self.revision = revision
+        self.jobs = jobs
+        self.signals = PresetValidateSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def _check_cancelled(self):
+        if self._cancel_event.is_set():
+            raise LoadCancelled()
+
+    def run(self):
+        try:
+            results = self.validator.validate(self.jobs, self._check_cancelled)
+        except LoadCancelled:
+            return
+        except Exception as e:
+            self.signals.failed.emit(self.preset_name, str(e))
+        else:
+            if not self.is_cancelled():
+                self.signals.validated.emit(self.preset_name, self.revision, results)
@@ -0,0 +1,57 @@
+import os
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+# Wait for a burst of change events (git checkout, editor save) to settle
+RELOAD_DELAY_MS = 300
+
+
+# ----------------------------------------------------------------------
+# PresetWatcher
+#    - Watches loaded preset files with a QFileSystemWatcher
+#    - Bursts of change events are collapsed: `changed` is emitted once
+#      per file after RELOAD_DELAY_MS without further events
+#    - Files replaced by rename (atomic saves, git) drop out of the
+#      watcher, so they are added back when the change is reported
+# ----------------------------------------------------------------------
+class PresetWatcher(QObject):
+    changed = pyqtSignal(str)   # Emitted with the path of a changed file
+
+    def __init__(self, parent=None, delay_ms=RELOAD_DELAY_MS):
+        super().__init__(parent)
+        self._paths = set()
+        self._pending = set()
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay_ms)
+        self._timer.timeout.connect(self._flush)
+
+    def watch(self, path):
+        self._paths.add(path)
+        if path not in self._watcher.files() and os.path.exists(path):
+            self._watcher.addPath(path)
+
+    def unwatch(self, path):
+        self._paths.discard(path)
+        self._pending.discard(path)
+        if path in self._watcher.files():
+            self._watcher.removePath(path)
+
+    def paths(self):
+        return set(self._paths)
+
+    def _on_file_changed(self, path):
+        if path in self._paths:
+            self._pending.add(path)
+            self._timer.start()
+
+    def _flush(self):
+        pending, self._pending = self._pending, set()
+        for path in sorted(pending):
+            if path not in self._paths:
+                continue
+            if not os.path.exists(path):
+                continue    # deleted (or mid-rename); keep the preset as it is
+            self.watch(path)
+            self.changed.emit(path)
@@ -0,0 +1,110 @@
+import hashlib
+import os
+import threading
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+# ----------------------------------------------------------------------
+# PresetWriter
+#    - Serializes and writes presets on a single background thread
+#    - Each save is a render() callable returning the file content, so the
+#      (expensive) dump happens off the GUI thread. The content may be
+#      str, bytes or an iterable of byte chunks; render() may also return
+#      (content, extra), extra being added to the saved info
+#    - Saves to the same path that have not started yet are coalesced:
+#      only the most recent one is written
+#    - Files are replaced atomically (temp file + rename)
+# ----------------------------------------------------------------------
+class PresetWriter(QObject):
+    saved = pyqtSignal(str, object, dict)   # (path, tag, {"mtime", "mtime_ns", "size", "content_hash"})
+    failed = pyqtSignal(str, object, str)   # (path, tag, error message)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._lock = threading.Lock()
+        self._pending = {}      # path -> (render, tag), in submission order
+        self._draining = False
+
+    def submit(self, path, render, tag=None):
+        """
+        Queue render() to be written to path. tag is handed back in the
+        saved/failed signal (e.g. the preset name and revision).
+        """
+        with self._lock:
+            # Replacing a pending entry drops the older, unwritten save
+            self._pending.pop(path, None)
+            self._pending[path] = (render, tag)
+            if self._draining:
+                return
+            self._draining = True
+        self._pool.start(_DrainTask(self))
+
+    def has_pending(self, path=None):
+        with self._lock:
+            if path is None:
+                return bool(self._pending) or self._draining
+            return path in self._pending
+
+    def wait(self, msecs=-1):
+        """Block until every queued save has been written."""
+        return self._pool.waitForDone(msecs)
+
+    def _next(self):
+        with self._lock:
+            if not self._pending:
+                self._draining = False
+                return None
+            path = next(iter(self._pending))
+            render, tag = self._pending.pop(path)
+            return path, render, tag
+
+    def _write(self, path, render, tag):
+        # Imported on first save (it pulls in YAML support), not at startup
+        from YamlEditor.preset_io import write_atomic
+        try:
+            content = render()
+            extra = None
+            if isinstance(content, tuple):
+                content, extra = content
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            digest = hashlib.sha256()
+            if isinstance(content, bytes):
+                digest.update(content)
+            else:
+                content = _hashed(content, digest)
+            write_atomic(path, content)
+            st = os.stat(path)
+            info = {
+                "mtime": st.st_mtime,
+                "mtime_ns": st.st_mtime_ns,
+                "size": st.st_size,
+                "content_hash": digest.hexdigest(),
+            }
+            if extra:
+                info.update(extra)
+        except Exception as e:
+            self.failed.emit(path, tag, str(e))
+        else:
+            self.saved.emit(path, tag, info)
+
+
+def _hashed(chunks, digest):
+    for chunk in chunks:
+        digest.update(chunk)
+        yield chunk
+
+
+class _DrainTask(QRunnable):
+    def __init__(self, writer):
+        super().__init__()
+        self.writer = writer
+
+    def run(self):
+        while True:
+            item = self.writer._next()
+            if item is None:
+                return
+            self.writer._write(*item)
@@ -0,0 +1,129 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from PyQt5.QtCore import QObject, QTimer
+
+logger = logging.getLogger(__name__)
+
+# Handlers (and event-loop stalls) longer than this are logged
+DEFAULT_THRESHOLD_MS = 50
+
+# How often the heartbeat timer expects to run
+DEFAULT_HEARTBEAT_MS = 10
+
+# Trace events kept in memory (oldest are dropped first)
+MAX_EVENTS = 200000
+
+
+def slot_name(slot):
+    """
+    Stable event name for a slot: functools.partial objects are named after
+    the function they wrap (their repr changes with the bound arguments).
+    """
+    while isinstance(slot, functools.partial):
+        slot = slot.func
+    return getattr(slot, "__name__", None) or repr(slot)
+
+
+# ----------------------------------------------------------------------
+# SlotProfiler
+#    - Opt-in: wraps slots to record their wall time
+#    - A heartbeat timer measures how late the event loop gets to run it,
+#      which is how long the UI was blocked
+#    - Slow handlers and stalls are logged; everything can be exported as
+#      a Chrome trace-event JSON file (chrome://tracing, Perfetto)
+# ----------------------------------------------------------------------
+class SlotProfiler(QObject):
+    def __init__(self, threshold_ms=DEFAULT_THRESHOLD_MS,
+                 heartbeat_ms=DEFAULT_HEARTBEAT_MS, parent=None):
+        super().__init__(parent)
+        self.threshold_ms = threshold_ms
+        self.heartbeat_ms = heartbeat_ms
+        self.events = deque(maxlen=MAX_EVENTS)
+        self._origin = time.perf_counter()
+        self._pid = os.getpid()
+        self._depth = 0
+        self._slots_since_heartbeat = []
+
+        self._heartbeat = QTimer(self)
+        self._heartbeat.setInterval(heartbeat_ms)
+        self._heartbeat.timeout.connect(self._on_heartbeat)
+        self._last_beat = None
+
+    def start(self):
+        self._last_beat = time.perf_counter()
+        self._heartbeat.start()
+
+    def stop(self):
+        self._heartbeat.stop()
+
+    def _us(self, t):
+        """perf_counter time -> trace timestamp (microseconds since start)."""
+        return (t - self._origin) * 1e6
+
+    def _add_event(self, name, category, start, end, args=None):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": self._us(start),
+            "dur": (end - start) * 1e6,
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    # ------------------------------------------------------------------
+    # Slots
+    # ------------------------------------------------------------------
+    def wrap(self, slot, name=None):
+        """Return slot wrapped so every call is timed and recorded."""
+        name = name or slot_name(slot)
+
+        @functools.wraps(slot)
+        def timed(*args):
+            self._depth += 1
+            start = time.perf_counter()
+            try:
+                return slot(*args)
+            finally:
+                end = time.perf_counter()
+                self._depth -= 1
+                self._add_event(name, "slot", start, end, {"depth": self._depth})
+                self._slots_since_heartbeat.append(name)
+                elapsed_ms = (end - start) * 1000
+                if elapsed_ms > self.threshold_ms:
+                    logger.warning("slow handler %s: %.1f ms", name, elapsed_ms)
+        return timed
+
+    # ------------------------------------------------------------------
+    # Event-loop stalls
+    # ------------------------------------------------------------------
+    def _on_heartbeat(self):
+        now = time.perf_counter()
+        expected = self._last_beat + self.heartbeat_ms / 1000
+        stall_ms = (now - expected) * 1000
+        if stall_ms > self.threshold_ms:
+            # Which handlers ran while the loop was blocked
+            handlers = sorted(set(self._slots_since_heartbeat))
+            self._add_event("event-loop stall", "stall", expected, now, {"handlers": handlers})
+            logger.warning(
+                "event loop stalled %.1f ms (handlers: %s)",
+                stall_ms, ", ".join(handlers) or "none recorded"
+            )
+        self._slots_since_heartbeat = []
+        self._last_beat = now
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+    def export_chrome_trace(self, path):
+        """Write the recorded events in Chrome trace-event format."""
+        with open(path, "w") as f:
+            json.dump({"traceEvents": list(self.events), "displayTimeUnit": "ms"}, f)
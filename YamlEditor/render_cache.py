@@ -0,0 +1,70 @@
+from collections import OrderedDict
+from YamlEditor import yaml_io
+from YamlEditor.job_data import steps_to_data
+
+# Default memory bound for rendered text (approximate, in bytes)
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+# Rough per-entry overhead on top of the text itself
+ENTRY_OVERHEAD = 256
+
+
+# ----------------------------------------------------------------------
+# RenderCache
+#    - Memoizes the steps/env YAML text shown by the job editor
+#    - Keyed by job identity: jobs are immutable, so an edit makes a new
+#      job (and a new entry) and never changes a cached one
+#    - LRU eviction once the rendered text exceeds max_bytes
+# ----------------------------------------------------------------------
+class RenderCache:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # id(job) -> (job, steps, env, size)
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self):
+        """Approximate number of bytes currently held."""
+        return self._size
+
+    def render(self, job):
+        """Return (steps_yaml, env_yaml) for job, rendering it on a miss."""
+        key = id(job)
+        entry = self._entries.get(key)
+        # The entry holds a reference to its job, so while it exists no
+        # other object can reuse that id; the identity check is a safeguard.
+        if entry is not None and entry[0] is job:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1], entry[2]
+
+        self.misses += 1
+        steps_yaml = yaml_io.dump(steps_to_data(job.get("steps", [])))
+        env_yaml = yaml_io.dump(job.get("env", {}))
+        size = len(steps_yaml) + len(env_yaml) + ENTRY_OVERHEAD
+        if size <= self.max_bytes:
+            self._entries[key] = (job, steps_yaml, env_yaml, size)
+            self._size += size
+            self._evict()
+        return steps_yaml, env_yaml
+
+    def discard(self, job):
+        """Drop the rendering of job (e.g. when the job is replaced or removed)."""
+        entry = self._entries.get(id(job))
+        if entry is not None and entry[0] is job:
+            del self._entries[id(job)]
+            self._size -= entry[3]
+
+    def clear(self):
+        self._entries.clear()
+        self._size = 0
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._entries:
+            _key, entry = self._entries.popitem(last=False)
+            self._size -= entry[3]
@@ -0,0 +1,588 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict, namedtuple
+
+# ----------------------------------------------------------------------
+# schema_validator
+#    - Checks jobs against the bundled workflow job schema
+#      (schemas/workflow-job.json, a JSON Schema subset) and checks the
+#      syntax of ${{ }} expressions; no network or extra packages needed
+#    - The schema is compiled once per process into nested check
+#      functions (job_validator), reused by every validation after
+#    - Results are cached per job (by identity, then by content hash), so
+#      re-validating a preset after a one-job edit checks only that job
+#    - Large presets are split into shards validated in a process pool
+#    - No Qt imports
+# ----------------------------------------------------------------------
+DEFAULT_SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "schemas", "workflow-job.json")
+
+# Jobs per shard sent to a worker process; presets with fewer jobs to
+# check than two shards are validated in-process
+SHARD_SIZE = 2000
+
+# Validation results kept by ValidationCache
+DEFAULT_MAX_ENTRIES = 200000
+
+# A problem found in a job: path is a tuple of keys/indexes inside the
+# job (e.g. ("steps", 2, "uses")), message says what is wrong there
+Problem = namedtuple("Problem", ["path", "message"])
+
+
+def format_path(path):
+    """('steps', 2, 'uses') -> 'steps[2].uses'"""
+    text = ""
+    for part in path:
+        if isinstance(part, int):
+            text += f"[{part}]"
+        else:
+            text += f".{part}" if text else str(part)
+    return text or "job"
+
+
+def format_problem(problem):
+    return f"{format_path(problem.path)}: {problem.message}"
+
+
+# ----------------------------------------------------------------------
+# Schema compilation
+#    - Each schema node becomes a pair of functions:
+#        valid(value)                    fast yes/no, no allocations
+#        check(value, path, problems)    appends a Problem per violation
+#      check() runs valid() first, so the detailed walk is only done for
+#      the (rare) invalid parts of a job
+#    - Keywords: type, enum, const, pattern, minLength, minItems,
+#      minProperties, required, properties, additionalProperties, items,
+#      anyOf, not, $ref (#/definitions/...), and "message", which
+#      replaces the default text of the node's own violations
+# ----------------------------------------------------------------------
+_TYPES = {
+    "string": (str,),
+    "number": (int, float),
+    "integer": (int,),
+    "boolean": (bool,),
+    "object": (dict,),
+    "array": (list, tuple),
+    "null": (type(None),),
+}
+_TYPE_NAMES = {"object": "a mapping", "array": "a list"}
+
+
+def _same(a, b):
+    return type(a) is type(b) and a == b
+
+
+class _Compiler:
+    def __init__(self, root):
+        self.root = root
+        self.refs = {}      # "#/definitions/name" -> (check, valid)
+
+    def ref(self, ref):
+        if not ref.startswith("#/"):
+            raise ValueError(f"unsupported $ref {ref!r} (only #/... is bundled)")
+        if ref not in self.refs:
+            self.refs[ref] = None   # placeholder while compiling recursive refs
+            node = self.root
+            for part in ref[2:].split("/"):
+                node = node[part]
+            self.refs[ref] = self.compile(node)
+        refs = self.refs
+        return (lambda value, path, problems: refs[ref][0](value, path, problems),
+                lambda value: refs[ref][1](value))
+
+    def _type(self, node):
+        """valid(value) for node's type keyword, and its message; or (None, None)."""
+        types = node.get("type")
+        if types is None:
+            return None, None
+        names = [types] if isinstance(types, str) else list(types)
+        allowed = tuple(t for name in names for t in _TYPES[name])
+        # bool is an int subclass, but not a number in a schema
+        no_bool = "boolean" not in names
+        text = "must be " + " or ".join(_TYPE_NAMES.get(name, f"a {name}") for name in names)
+        if no_bool:
+            return (lambda v: isinstance(v, allowed) and type(v) is not bool), text
+        return (lambda v: isinstance(v, allowed)), text
+
+    def _rules(self, node):
+        """The node's own keywords: functions value -> message, or None if satisfied."""
+        rules = []
+        if "enum" in node:
+            allowed = node["enum"]
+            text = "must be one of " + ", ".join(map(str, allowed))
+            rules.append(lambda v: None if any(_same(v, a) for a in allowed) else text)
+        if "const" in node:
+            const = node["const"]
+            rules.append(lambda v: None if _same(v, const) else f"must be {const}")
+        if "pattern" in node:
+            pattern = re.compile(node["pattern"])
+            rules.append(lambda v: None if not isinstance(v, str) or pattern.search(v)
+                         else f"must match {pattern.pattern}")
+        for keyword, kind, noun in (("minLength", str, "character"),
+                                    ("minItems", (list, tuple), "item"),
+                                    ("minProperties", dict, "key")):
+            if keyword in node:
+                low = node[keyword]
+                text = f"must have at least {low} {noun}{'s' if low != 1 else ''}"
+                rules.append(lambda v, low=low, kind=kind, text=text:
+                             None if not isinstance(v, kind) or len(v) >= low else text)
+        if "required" in node:
+            required = node["required"]
+            rules.append(lambda v: None if not isinstance(v, dict) else next(
+                (f"missing required key {key!r}" for key in required if key not in v), None
+            ))
+        if "anyOf" in node:
+            options = [self.compile(option)[1] for option in node["anyOf"]]
+            rules.append(lambda v: None if any(valid(v) for valid in options)
+                         else "does not match any allowed form")
+        if "not" in node:
+            negated = self.compile(node["not"])[1]
+            rules.append(lambda v: "is not allowed here" if negated(v) else None)
+        return rules
+
+    def _mapping(self, node):
+        properties = {key: self.compile(sub) for key, sub in node.get("properties", {}).items()}
+        checks = {key: pair[0] for key, pair in properties.items()}
+        valids = {key: pair[1] for key, pair in properties.items()}
+        additional = node.get("additionalProperties", True)
+        if isinstance(additional, dict):
+            additional_check, additional_valid = self.compile(additional)
+        else:
+            additional_check = additional_valid = None
+        closed = additional is False
+        known = sorted(properties)
+
+        def valid(v):
+            if not isinstance(v, dict):
+                return True
+            for key, item in v.items():
+                sub = valids.get(key)
+                if sub is not None:
+                    if not sub(item):
+                        return False
+                elif closed or (additional_valid is not None and not additional_valid(item)):
+                    return False
+            return True
+
+        def check(v, path, problems):
+            if not isinstance(v, dict):
+                return
+            for key, item in v.items():
+                sub = checks.get(key)
+                if sub is not None:
+                    sub(item, path + (key,), problems)
+                elif closed:
+                    import difflib      # only needed for (rare) unknown keys
+                    hint = difflib.get_close_matches(str(key), known, n=1)
+                    problems.append(Problem(
+                        path + (key,),
+                        f"unknown key {key!r}" + (f" (did you mean {hint[0]!r}?)" if hint else "")
+                    ))
+                elif additional_check is not None:
+                    additional_check(item, path + (key,), problems)
+        return check, valid
+
+    def _items(self, node):
+        item_check, item_valid = self.compile(node["items"])
+
+        def valid(v):
+            return not isinstance(v, (list, tuple)) or all(item_valid(item) for item in v)
+
+        def check(v, path, problems):
+            if isinstance(v, (list, tuple)):
+                for i, item in enumerate(v):
+                    item_check(item, path + (i,), problems)
+        return check, valid
+
+    def compile(self, node):
+        """(check, valid) for a schema node."""
+        message = node.get("message")
+        type_ok, type_text = self._type(node)
+        rules = self._rules(node)
+        nested = []
+        if "$ref" in node:
+            nested.append(self.ref(node["$ref"]))
+        if "properties" in node or "additionalProperties" in node:
+            nested.append(self._mapping(node))
+        if "items" in node:
+            nested.append(self._items(node))
+        nested_checks = [pair[0] for pair in nested]
+        valid = _all_of(
+            ([type_ok] if type_ok is not None else [])
+            + [lambda v, rule=rule: rule(v) is None for rule in rules]
+            + [pair[1] for pair in nested]
+        )
+
+        def check(value, path, problems):
+            if valid(value):
+                return
+            if type_ok is not None and not type_ok(value):
+                problems.append(Problem(path, message or type_text))
+                return
+            for rule in rules:
+                text = rule(value)
+                if text is not None:
+                    problems.append(Problem(path, message or text))
+                    break
+            for sub in nested_checks:
+                sub(value, path, problems)
+        return check, valid
+
+
+def _all_of(tests):
+    """valid(value) that is True when every test is; unrolled for the usual few."""
+    if not tests:
+        return lambda v: True
+    if len(tests) == 1:
+        return tests[0]
+    if len(tests) == 2:
+        first, second = tests
+        return lambda v: first(v) and second(v)
+    return lambda v: all(test(v) for test in tests)
+
+
+def compile_schema(schema):
+    """Compile a schema (parsed JSON) into check(value, path, problems)."""
+    return _Compiler(schema).compile(schema)[0]
+
+
+# ----------------------------------------------------------------------
+# Expressions
+# ----------------------------------------------------------------------
+CONTEXTS = {
+    "github", "env", "vars", "job", "jobs", "steps", "runner", "secrets",
+    "strategy", "matrix", "needs", "inputs",
+}
+FUNCTIONS = {
+    "contains", "startswith", "endswith", "format", "join", "tojson", "fromjson",
+    "hashfiles", "success", "always", "cancelled", "failure",
+}
+_TOKEN = re.compile(r"""
+    \s*(?:
+      (?P<number>-?(?:0x[0-9a-fA-F]+|\d+(?:\.\d+)?(?:[eE][-+]?\d+)?))
+    | (?P<string>'(?:[^']|'')*')
+    | (?P<name>[A-Za-z_][A-Za-z0-9_-]*)
+    | (?P<op>==|!=|<=|>=|&&|\|\||[<>!.\[\](),*])
+    )""", re.VERBOSE)
+_EXPRESSION = re.compile(r"\$\{\{(.*?)\}\}", re.DOTALL)
+
+
+class ExpressionError(Exception):
+    pass
+
+
+def _tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None or match.end() == pos:
+            raise ExpressionError(f"unexpected {text[pos:].strip()[:10]!r}")
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    """Recursive descent over the expression grammar; only checks syntax."""
+
+    _BINARY = [("||",), ("&&",), ("==", "!="), ("<", "<=", ">", ">=")]
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self, value=None):
+        kind, text = self.peek()
+        if kind is None:
+            raise ExpressionError("unexpected end of expression")
+        if value is not None and text != value:
+            raise ExpressionError(f"expected {value!r}, found {text!r}")
+        self.pos += 1
+        return kind, text
+
+    def parse(self):
+        if not self.tokens:
+            raise ExpressionError("empty expression")
+        self.binary(0)
+        if self.pos != len(self.tokens):
+            raise ExpressionError(f"unexpected {self.peek()[1]!r}")
+
+    def binary(self, level):
+        if level == len(self._BINARY):
+            return self.unary()
+        self.binary(level + 1)
+        while self.peek()[0] == "op" and self.peek()[1] in self._BINARY[level]:
+            self.take()
+            self.binary(level + 1)
+
+    def unary(self):
+        if self.peek() == ("op", "!"):
+            self.take()
+            return self.unary()
+        return self.primary()
+
+    def primary(self):
+        kind, text = self.take()
+        if kind in ("number", "string"):
+            return
+        if (kind, text) == ("op", "("):
+            self.binary(0)
+            self.take(")")
+        elif kind == "name":
+            lowered = text.lower()
+            if self.peek() == ("op", "("):
+                if lowered not in FUNCTIONS:
+                    raise ExpressionError(f"unknown function {text!r}")
+                self.take()
+                if self.peek() != ("op", ")"):
+                    self.binary(0)
+                    while self.peek() == ("op", ","):
+                        self.take()
+                        self.binary(0)
+                self.take(")")
+            elif lowered in ("true", "false", "null"):
+                return
+            elif lowered not in CONTEXTS:
+                raise ExpressionError(f"unknown context {text!r}")
+        else:
+            raise ExpressionError(f"unexpected {text!r}")
+        self.postfix()
+
+    def postfix(self):
+        while self.peek()[0] == "op" and self.peek()[1] in (".", "["):
+            if self.take()[1] == ".":
+                kind, text = self.take()
+                if kind != "name" and text != "*":
+                    raise ExpressionError(f"expected a property name after '.', found {text!r}")
+            else:
+                if self.peek() == ("op", "*"):
+                    self.take()
+                else:
+                    self.binary(0)
+                self.take("]")
+
+
+def check_expression(text):
+    """Raise ExpressionError if text (without ${{ }}) is not a valid expression."""
+    _Parser(_tokenize(text)).parse()
+
+
+def _expression_problems(value, path, problems, condition=False):
+    """Check every ${{ }} in value (and whole `if:` conditions)."""
+    if isinstance(value, str):
+        if "${{" not in value:
+            if condition and value.strip():
+                expressions = [value]
+            else:
+                return
+        else:
+            expressions = _EXPRESSION.findall(value)
+            if value.count("${{") != len(expressions):
+                problems.append(Problem(path, "unterminated ${{ expression"))
+        for expression in expressions:
+            try:
+                check_expression(expression)
+            except ExpressionError as e:
+                problems.append(Problem(path, f"expression: {e}"))
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            # A job's or step's `if:` is an expression even without ${{ }}
+            _expression_problems(item, path + (key,), problems, key == "if" and len(path) in (0, 2))
+    elif isinstance(value, (list, tuple)):
+        for i, item in enumerate(value):
+            _expression_problems(item, path + (i,), problems)
+
+
+# ----------------------------------------------------------------------
+# Validators
+# ----------------------------------------------------------------------
+_validators = {}
+_validators_lock = threading.Lock()
+
+
+def job_validator(schema_path=DEFAULT_SCHEMA_PATH):
+    """
+    The compiled check of schema_path's job schema; compiled on first use
+    and kept for the life of the process.
+    """
+    check = _validators.get(schema_path)
+    if check is None:
+        with _validators_lock:
+            check = _validators.get(schema_path)
+            if check is None:
+                with open(schema_path, "r", encoding="utf-8") as f:
+                    check = compile_schema(json.load(f))
+                _validators[schema_path] = check
+    return check
+
+
+def validate_job_data(data, schema_path=DEFAULT_SCHEMA_PATH):
+    """Problems of one job given as parsed YAML (a dict), as a tuple."""
+    problems = []
+    job_validator(schema_path)(data, (), problems)
+    _expression_problems(data, (), problems)
+    return tuple(problems)
+
+
+def _validate_shard(schema_path, shard):
+    """Worker entry point; must stay top-level so it can be pickled."""
+    return [validate_job_data(data, schema_path) for data in shard]
+
+
+def job_content_hash(data):
+    return hashlib.blake2b(repr(data).encode("utf-8"), digest_size=16).digest()
+
+
+# ----------------------------------------------------------------------
+# ValidationCache
+#    - Problems per job: by object identity (jobs are immutable, so an
+#      unchanged job is never hashed again) and by content hash (equal
+#      jobs in other presets, or after a reload)
+#    - Thread safe; bounded, least recently used entries dropped first
+# ----------------------------------------------------------------------
+class ValidationCache:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._by_id = OrderedDict()     # id(job) -> (job, problems)
+        self._by_hash = OrderedDict()   # content hash -> problems
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._by_hash)
+
+    def lookup(self, job):
+        """(problems, None) on a hit, else (None, (data, content hash))."""
+        with self._lock:
+            known = self._by_id.get(id(job))
+            if known is not None and known[0] is job:
+                self._by_id.move_to_end(id(job))
+                return known[1], None
+        data = job.to_dict()
+        key = job_content_hash(data)
+        with self._lock:
+            problems = self._by_hash.get(key)
+            if problems is not None:
+                self._by_hash.move_to_end(key)
+                self._put_id(job, problems)
+                return problems, None
+        return None, (data, key)
+
+    def put(self, job, key, problems):
+        with self._lock:
+            self._by_hash[key] = problems
+            self._by_hash.move_to_end(key)
+            self._put_id(job, problems)
+            while len(self._by_hash) > self.max_entries:
+                self._by_hash.popitem(last=False)
+
+    def _put_id(self, job, problems):
+        self._by_id[id(job)] = (job, problems)
+        self._by_id.move_to_end(id(job))
+        while len(self._by_id) > self.max_entries:
+            self._by_id.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._by_id.clear()
+            self._by_hash.clear()
+
+
+# ----------------------------------------------------------------------
+# PresetValidator
+#    - Validates whole presets through a ValidationCache; jobs missing
+#      from it are checked in-process or, for many jobs, sharded across a
+#      process pool started on first need and kept for later runs (each
+#      worker compiles the schema once)
+# ----------------------------------------------------------------------
+class PresetValidator:
+    def __init__(self, workers=None, schema_path=DEFAULT_SCHEMA_PATH, cache=None,
+                 shard_size=SHARD_SIZE):
+        self.workers = workers
+        self.schema_path = schema_path
+        self.cache = cache if cache is not None else ValidationCache()
+        self.shard_size = shard_size
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
+    def validate_job(self, job):
+        """Problems of one Job, as a tuple."""
+        problems, missing = self.cache.lookup(job)
+        if problems is None:
+            data, key = missing
+            problems = validate_job_data(data, self.schema_path)
+            self.cache.put(job, key, problems)
+        return problems
+
+    def validate(self, jobs, check_cancelled=None):
+        """Problems of each job in jobs: a list of tuples, in order."""
+        results = [None] * len(jobs)
+        todo = []       # (index, data, content hash)
+        for i, job in enumerate(jobs):
+            problems, missing = self.cache.lookup(job)
+            if problems is None:
+                todo.append((i,) + missing)
+            else:
+                results[i] = problems
+            if check_cancelled is not None and i % 1000 == 0:
+                check_cancelled()
+
+        workers = self.workers or os.cpu_count() or 1
+        if len(todo) < 2 * self.shard_size or workers == 1:
+            found = []
+            for n, (_i, data, _key) in enumerate(todo):
+                found.append(validate_job_data(data, self.schema_path))
+                if check_cancelled is not None and n % 1000 == 0:
+                    check_cancelled()
+        else:
+            shards = [
+                [data for _i, data, _key in todo[start:start + self.shard_size]]
+                for start in range(0, len(todo), self.shard_size)
+            ]
+            pool = self._executor()
+            found = []
+            for shard_problems in pool.map(
+                _validate_shard, [self.schema_path] * len(shards), shards
+            ):
+                found.extend(shard_problems)
+                if check_cancelled is not None:
+                    check_cancelled()
+
+        for (i, _data, key), problems in zip(todo, found):
+            results[i] = problems
+            self.cache.put(jobs[i], key, problems)
+        return results
+
+    def _executor(self):
+        with self._pool_lock:
+            if self._pool is None:
+                # Imported here: most runs never need a pool, and the
+                # editor should not pay for these at startup
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                # Spawned, not forked: the parent may be a GUI with threads
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    def close(self):
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+
+def summarize(results):
+    """'N problem(s) in M job(s)' for PresetValidator.validate() results."""
+    jobs = sum(1 for problems in results if problems)
+    count = sum(len(problems) for problems in results)
+    if not count:
+        return "no schema problems"
+    return f"{count} schema problem(s) in {jobs} job(s)"
@@ -0,0 +1,266 @@
+import re
+from bisect import bisect_left, insort
+
+# ----------------------------------------------------------------------
+# search_index
+#    - Inverted index over the jobs of every loaded preset
+#    - Indexed fields: job names, step names, `uses:` references, `run:`
+#      tokens and env keys (job and step env)
+#    - Updated one job at a time (add/remove/replace) so loads, saves and
+#      removals never rebuild it
+#    - No Qt imports
+#
+# Query syntax: whitespace separated terms, all of which must match.
+#    checkout          any field, by token prefix
+#    uses:actions/checkout@v4   one field: name, step, uses, run or env
+#    "npm ci"          the last term is a prefix; earlier terms must match
+#                      whole tokens unless they end with *
+#    A prefix that starts more than MAX_PREFIX_KEYS indexed tokens (e.g.
+#    "1" among thousands of numbered jobs) matches whole tokens only until
+#    more of it is typed
+# ----------------------------------------------------------------------
+
+FIELDS = ("name", "step", "uses", "run", "env")
+
+# Most index keys a prefix term is expanded to
+MAX_PREFIX_KEYS = 512
+
+# Sorts after every key that starts with a given prefix
+_KEY_END = "\U0010ffff"
+
+_WORD = re.compile(r"[a-z0-9_]+")
+_RUN_TOKEN = re.compile(r"[a-z0-9_./@=+-]+")
+_USES_PARTS = re.compile(r"[/@]")
+
+
+def _words(text):
+    return _WORD.findall(text.lower())
+
+
+def job_tokens(job):
+    """Set of "field:token" keys for a Job."""
+    keys = set()
+    if isinstance(job.name, str):
+        keys.update("name:" + w for w in _words(job.name))
+
+    env = job.get("env")
+    if isinstance(env, dict):
+        keys.update("env:" + str(k).lower() for k in env)
+
+    steps = job.get("steps")
+    if not isinstance(steps, tuple):
+        return keys
+    for step in steps:
+        if not hasattr(step, "uses"):
+            continue    # not a mapping in the preset file
+        if isinstance(step.name, str):
+            keys.update("step:" + w for w in _words(step.name))
+        if isinstance(step.uses, str):
+            ref = step.uses.lower().strip()
+            keys.add("uses:" + ref)
+            keys.update("uses:" + part for part in _USES_PARTS.split(ref) if part)
+        if isinstance(step.run, str):
+            keys.update("run:" + t for t in _RUN_TOKEN.findall(step.run.lower()))
+        if isinstance(step.env, dict):
+            keys.update("env:" + str(k).lower() for k in step.env)
+    return keys
+
+
+def parse_query(text):
+    """Return [(fields, token, prefix)] for a query string."""
+    terms = []
+    words = text.lower().split()
+    for i, word in enumerate(words):
+        fields = FIELDS
+        field, sep, rest = word.partition(":")
+        if sep and field in FIELDS:
+            fields = (field,)
+            word = rest
+        prefix = i == len(words) - 1
+        if word.endswith("*"):
+            word = word[:-1]
+            prefix = True
+        if word:
+            terms.append((fields, word, prefix))
+        elif fields != FIELDS:
+            terms.append((fields, "", True))    # "env:" = has any env key
+    return terms
+
+
+class _PresetIndex:
+    """Postings of one preset: "field:token" -> set of id(job)."""
+
+    def __init__(self):
+        self.postings = {}
+        self.keys = []        # sorted posting keys, for prefix lookups
+        self.jobs = {}        # id(job) -> (job, its keys)
+
+    @classmethod
+    def build(cls, jobs):
+        """Index a whole job list at once (sorting the keys once at the end)."""
+        index = cls()
+        postings = index.postings
+        for job in jobs:
+            if id(job) in index.jobs:
+                continue
+            tokens = job_tokens(job)
+            index.jobs[id(job)] = (job, tokens)
+            for token in tokens:
+                ids = postings.get(token)
+                if ids is None:
+                    postings[token] = ids = set()
+                ids.add(id(job))
+        index.keys = sorted(postings)
+        return index
+
+    def add(self, job):
+        if id(job) in self.jobs:
+            return
+        tokens = job_tokens(job)
+        self.jobs[id(job)] = (job, tokens)
+        postings = self.postings
+        for token in tokens:
+            ids = postings.get(token)
+            if ids is None:
+                postings[token] = ids = set()
+                insort(self.keys, token)
+            ids.add(id(job))
+
+    def remove(self, job):
+        entry = self.jobs.get(id(job))
+        if entry is None or entry[0] is not job:
+            return
+        del self.jobs[id(job)]
+        for token in entry[1]:
+            ids = self.postings[token]
+            ids.discard(id(job))
+            if not ids:
+                del self.postings[token]
+                del self.keys[bisect_left(self.keys, token)]
+
+    def term(self, fields, token, prefix):
+        if not prefix:
+            found = [self.postings.get(f"{field}:{token}") for field in fields]
+            found = [ids for ids in found if ids]
+            if len(found) == 1:
+                return found[0]
+            return set().union(*found)
+        keys = self.keys
+        ranges = []
+        for field in fields:
+            start = f"{field}:{token}"
+            ranges.append((bisect_left(keys, start), bisect_left(keys, start + _KEY_END)))
+        if sum(end - begin for begin, end in ranges) > MAX_PREFIX_KEYS:
+            return self.term(fields, token, False)
+        found = []
+        for begin, end in ranges:
+            found.extend(map(self.postings.__getitem__, keys[begin:end]))
+        if len(found) == 1:
+            return found[0]
+        return set().union(*found)
+
+    def match(self, terms):
+        # Whole-token terms are usually the most selective: intersect from them
+        matches = None
+        for fields, token, prefix in sorted(terms, key=lambda t: t[2]):
+            ids = self.term(fields, token, prefix)
+            if matches is None:
+                matches = ids
+            elif len(ids) < len(matches):
+                matches = {i for i in ids if i in matches}
+            else:
+                matches = matches & ids
+            if not matches:
+                return set()
+        return matches
+
+
+def build_preset_index(jobs):
+    """Index one preset's jobs; safe to call off the GUI thread."""
+    return _PresetIndex.build(jobs)
+
+
+class SearchIndex:
+    """
+    One set of postings per preset, so narrowing the current preset's job
+    list never looks at other presets. Jobs are keyed by identity: Jobs are
+    immutable, and an edited job is a new object that replaces the old one.
+    """
+
+    def __init__(self):
+        self._presets = {}    # preset name -> _PresetIndex
+
+    def __len__(self):
+        return sum(len(index.jobs) for index in self._presets.values())
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def add_job(self, preset_name, job):
+        index = self._presets.get(preset_name)
+        if index is None:
+            self._presets[preset_name] = index = _PresetIndex()
+        index.add(job)
+
+    def remove_job(self, preset_name, job):
+        index = self._presets.get(preset_name)
+        if index is not None:
+            index.remove(job)
+
+    def replace_job(self, preset_name, old_job, new_job):
+        self.remove_job(preset_name, old_job)
+        self.add_job(preset_name, new_job)
+
+    def set_preset(self, preset_name, jobs, prebuilt=None):
+        """
+        Index a (re)loaded preset's jobs, dropping whatever it had before.
+        prebuilt: the result of build_preset_index(jobs), e.g. from a worker.
+        """
+        self._presets[preset_name] = prebuilt if prebuilt is not None else _PresetIndex.build(jobs)
+
+    def remove_preset(self, preset_name):
+        self._presets.pop(preset_name, None)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def match_ids(self, query, preset_name):
+        """
+        Set of id(job) of the preset's jobs matching query, or None for an
+        empty query. The set may be the index's own: do not modify it.
+        """
+        terms = parse_query(query)
+        if not terms:
+            return None
+        index = self._presets.get(preset_name)
+        if index is None:
+            return set()
+        return index.match(terms)
+
+    def count(self, query, skip=None):
+        """
+        { preset name -> number of matching jobs } for presets with matches,
+        leaving out the preset named skip (e.g. the one already filtered).
+        """
+        terms = parse_query(query)
+        if not terms:
+            return {}
+        counts = {}
+        for preset_name, index in self._presets.items():
+            if preset_name == skip:
+                continue
+            n = len(index.match(terms))
+            if n:
+                counts[preset_name] = n
+        return counts
+
+    def search(self, query):
+        """Matching (preset name, Job) pairs across all presets."""
+        terms = parse_query(query)
+        if not terms:
+            return []
+        results = []
+        for preset_name, index in self._presets.items():
+            for job_id in index.match(terms):
+                results.append((preset_name, index.jobs[job_id][0]))
+        return results
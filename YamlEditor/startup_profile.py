@@ -0,0 +1,54 @@
+import contextlib
+import time
+
+# ----------------------------------------------------------------------
+# startup_profile
+#    - Times the phases of starting the editor (imports, QApplication,
+#      window construction, first event-loop turn) for --profile-startup
+#    - Phases nest; the report lists when each started (since the
+#      profile's origin, normally when main.py started) and how long
+#      it took
+#    - No Qt imports, so it can time importing Qt itself
+# ----------------------------------------------------------------------
+
+
+class StartupProfile:
+    def __init__(self, origin=None):
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.phases = []        # [name, depth, start, end], in start order
+        self._depth = 0
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        """Time the with block as a phase called name."""
+        entry = [name, self._depth, time.perf_counter(), None]
+        self.phases.append(entry)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            entry[3] = time.perf_counter()
+
+    def mark(self, name):
+        """Record that name happened now (a phase without duration)."""
+        now = time.perf_counter()
+        self.phases.append([name, self._depth, now, now])
+
+    def elapsed_ms(self):
+        return (time.perf_counter() - self.origin) * 1000
+
+    def report(self):
+        """The phases as text, one line each: start, duration, name."""
+        lines = [f"{'start':>9}  {'duration':>9}  phase"]
+        for name, depth, start, end in self.phases:
+            begin_ms = (start - self.origin) * 1000
+            if end is None:
+                duration = "(running)"
+            elif end == start:
+                duration = ""
+            else:
+                duration = f"{(end - start) * 1000:7.1f}ms"
+            lines.append(f"{begin_ms:7.1f}ms  {duration:>9}  {'  ' * depth}{name}")
+        lines.append(f"total {self.elapsed_ms():.1f} ms")
+        return "\n".join(lines)
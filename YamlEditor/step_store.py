@@ -0,0 +1,197 @@
+import hashlib
+import os
+import re
+from YamlEditor.job_data import Step, steps_from_data, steps_to_data
+
+# ----------------------------------------------------------------------
+# step_store
+#    - Content-addressed sharing of step sequences: jobs whose steps are
+#      equal share one tuple of Steps in memory
+#    - Writing repeated step sequences once: as YAML anchors/aliases
+#      (shared_steps_data) or as local composite actions that the jobs
+#      `uses:` (extract_composite_actions)
+#    - No Qt imports
+# ----------------------------------------------------------------------
+
+
+def steps_digest(data):
+    """Content address of a parsed steps list (key order and types included)."""
+    return hashlib.blake2b(repr(data).encode("utf-8"), digest_size=16).digest()
+
+
+# ----------------------------------------------------------------------
+# StepStore
+#    - One per load: maps each distinct steps list to a shared tuple
+#    - Lists YAML aliases already share are recognized by identity and
+#      not hashed again
+# ----------------------------------------------------------------------
+class StepStore:
+    __slots__ = ("_by_id", "_by_digest", "hits")
+
+    def __init__(self):
+        self._by_id = {}        # id(list) -> (list, steps); keeps the list alive
+        self._by_digest = {}    # digest -> steps
+        self.hits = 0
+
+    def __len__(self):
+        return len(self._by_digest)
+
+    def steps(self, data):
+        """The steps value of a Job for data, shared with equal earlier ones."""
+        if type(data) is not list:
+            return steps_from_data(data)
+        known = self._by_id.get(id(data))
+        if known is not None:
+            self.hits += 1
+            return known[1]
+        digest = steps_digest(data)
+        steps = self._by_digest.get(digest)
+        if steps is None:
+            steps = steps_from_data(data)
+            self._by_digest[digest] = steps
+        else:
+            self.hits += 1
+        self._by_id[id(data)] = (data, steps)
+        return steps
+
+
+# ----------------------------------------------------------------------
+# Anchors / aliases
+# ----------------------------------------------------------------------
+def shared_steps_data(jobs):
+    """
+    Job dicts (as Job.to_dict()) in which equal steps lists are the same
+    list object, so a dumper that keeps aliases writes each one once.
+    """
+    by_id = {}
+    by_digest = {}
+    result = []
+    for job in jobs:
+        data = job.to_dict()
+        steps = job.get("steps")
+        if type(steps) is tuple and steps:
+            shared = by_id.get(id(steps))
+            if shared is None:
+                shared = data["steps"]
+                shared = by_digest.setdefault(steps_digest(shared), shared)
+                by_id[id(steps)] = shared
+            data["steps"] = shared
+        result.append(data)
+    return result
+
+
+# ----------------------------------------------------------------------
+# Composite actions
+# ----------------------------------------------------------------------
+DEFAULT_ACTIONS_DIR = ".github/actions"
+
+# A step sequence needs this many steps and users to become an action
+MIN_ACTION_STEPS = 2
+MIN_ACTION_USES = 2
+
+# Step keys a composite action step accepts
+_COMPOSITE_KEYS = {"name", "id", "if", "uses", "with", "run", "shell", "env", "working-directory"}
+
+# Contexts not available inside composite actions
+_UNAVAILABLE_CONTEXT = re.compile(r"\b(?:secrets|matrix|needs|strategy|vars|inputs)\.")
+
+
+def _is_checkout(step):
+    return type(step) is Step and isinstance(step.uses, str) and step.uses.startswith(
+        "actions/checkout@"
+    )
+
+
+def _mentions_unavailable_context(value):
+    if isinstance(value, str):
+        return "${{" in value and _UNAVAILABLE_CONTEXT.search(value) is not None
+    if isinstance(value, (list, tuple)):
+        return any(_mentions_unavailable_context(v) for v in value)
+    if isinstance(value, dict):
+        return any(_mentions_unavailable_context(v) for v in value.values())
+    return False
+
+
+def _runs_on_windows(job):
+    labels = job.runs_on if isinstance(job.runs_on, tuple) else (job.runs_on,)
+    return any(isinstance(label, str) and "windows" in label.lower() for label in labels)
+
+
+def _split_block(job):
+    """
+    (checkout steps, block) if the job's steps after its leading checkout
+    could move into a composite action, else None. The action is read from
+    the checked out repository, so the checkout has to stay in the job.
+    """
+    steps = job.get("steps")
+    # defaults.run (shell, working-directory) does not reach the run steps
+    # of a composite action
+    if type(steps) is not tuple or "outputs" in job or "defaults" in job:
+        return None
+    n = 0
+    while n < len(steps) and _is_checkout(steps[n]):
+        n += 1
+    block = steps[n:]
+    if n == 0 or len(block) < MIN_ACTION_STEPS:
+        return None
+    for step in block:
+        if type(step) is not Step or _is_checkout(step):
+            return None
+        if not set(step.keys()) <= _COMPOSITE_KEYS:
+            return None
+        if _mentions_unavailable_context(step.to_dict()):
+            return None
+    return steps[:n], block
+
+
+def action_name(digest):
+    return "shared-steps-" + digest.hex()[:10]
+
+
+def extract_composite_actions(jobs, actions_dir=DEFAULT_ACTIONS_DIR):
+    """
+    Move step sequences repeated across jobs into composite actions.
+    Returns (jobs, actions): the jobs with each repeated sequence replaced
+    by one `uses: ./<actions_dir>/<name>` step, and { name -> action.yml
+    document }. actions_dir is relative to the repository root. Names are
+    derived from the steps' content, so equal sequences in different
+    presets map to the same action.
+    """
+    groups = {}     # digest -> [job index]
+    blocks = {}     # job index -> (checkout, block, digest)
+    for i, job in enumerate(jobs):
+        split = _split_block(job)
+        if split is None:
+            continue
+        checkout, block = split
+        digest = steps_digest(steps_to_data(block))
+        blocks[i] = (checkout, block, digest)
+        groups.setdefault(digest, []).append(i)
+
+    actions = {}
+    new_jobs = list(jobs)
+    uses_prefix = "./" + actions_dir.strip("/").replace(os.sep, "/") + "/"
+    for digest, users in groups.items():
+        if len(users) < MIN_ACTION_USES:
+            continue
+        checkout, block, _ = blocks[users[0]]
+        steps = steps_to_data(block)
+        if any("run" in s and "shell" not in s for s in steps):
+            # Composite run steps need a shell; bash matches the default
+            # of Linux and macOS runners only
+            if any(_runs_on_windows(jobs[i]) for i in users):
+                continue
+            steps = [dict(s, shell="bash") if "run" in s and "shell" not in s else s
+                     for s in steps]
+        name = action_name(digest)
+        actions[name] = {
+            "name": name,
+            "description": f"Steps shared by {len(users)} jobs (generated)",
+            "runs": {"using": "composite", "steps": steps},
+        }
+        for i in users:
+            checkout = blocks[i][0]
+            new_jobs[i] = jobs[i].replace(
+                steps=checkout + (Step.from_dict({"uses": uses_prefix + name}),)
+            )
+    return new_jobs, actions
@@ -0,0 +1,142 @@
+import sys
+from collections import deque, namedtuple
+from YamlEditor.job_data import Job, Step
+
+# ----------------------------------------------------------------------
+# undo_history
+#    - Undo/redo of edits to a preset's job list
+#    - Jobs are immutable, so an entry holds only the jobs it changed
+#      (shared with the job list and with other entries) and the
+#      positions; undoing or redoing it touches just those jobs
+#    - Bounded by entry count and by the approximate memory of the jobs
+#      held; the oldest entries are dropped first
+#    - No Qt imports
+# ----------------------------------------------------------------------
+
+# Defaults for the history of one preset
+DEFAULT_MAX_ENTRIES = 1000
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+# One change to a job list:
+#    "add"      new inserted at index (old is None)
+#    "remove"   old removed from index (new is None)
+#    "replace"  old at index replaced by new
+JobEdit = namedtuple("JobEdit", ["kind", "index", "old", "new"])
+
+
+def invert(edit):
+    """The JobEdit that undoes edit."""
+    kind, index, old, new = edit
+    if kind == "add":
+        return JobEdit("remove", index, new, None)
+    if kind == "remove":
+        return JobEdit("add", index, None, old)
+    return JobEdit("replace", index, new, old)
+
+
+def approx_size(value, _depth=0):
+    """Rough memory footprint of a job (or any parsed YAML value) in bytes."""
+    size = sys.getsizeof(value)
+    if _depth > 32:
+        return size
+    if type(value) in (Job, Step):
+        for slot in value.__slots__:
+            if slot != "shape":     # shapes are shared tables
+                size += approx_size(getattr(value, slot), _depth + 1)
+    elif type(value) in (list, tuple):
+        size += sum(approx_size(v, _depth + 1) for v in value)
+    elif type(value) is dict:
+        size += sum(approx_size(k, _depth + 1) + approx_size(v, _depth + 1)
+                    for k, v in value.items())
+    return size
+
+
+class _Entry:
+    __slots__ = ("label", "edits", "size")
+
+    def __init__(self, label, edits):
+        self.label = label
+        self.edits = tuple(edits)
+        # Each job is counted once even if the entry holds it twice
+        jobs = {id(j): j for e in self.edits for j in (e.old, e.new) if j is not None}
+        self.size = sum(approx_size(j) for j in jobs.values())
+
+
+# ----------------------------------------------------------------------
+# UndoHistory
+#    - record() adds an entry (a list of JobEdits applied in order) and
+#      clears the redo stack
+#    - undo()/redo() return the JobEdits to apply (in order) to go back
+#      or forward one entry; the caller applies them to the job list
+# ----------------------------------------------------------------------
+class UndoHistory:
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._undo = deque()
+        self._redo = []
+        self._size = 0
+
+    def __len__(self):
+        return len(self._undo)
+
+    @property
+    def size(self):
+        """Approximate bytes held by the undo and redo entries."""
+        return self._size
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def undo_label(self):
+        return self._undo[-1].label if self._undo else None
+
+    def redo_label(self):
+        return self._redo[-1].label if self._redo else None
+
+    def record(self, label, edits):
+        if not edits:
+            return
+        for entry in self._redo:
+            self._size -= entry.size
+        self._redo.clear()
+        entry = _Entry(label, edits)
+        self._undo.append(entry)
+        self._size += entry.size
+        self._evict()
+
+    def undo(self):
+        if not self._undo:
+            return None
+        entry = self._undo.pop()
+        self._redo.append(entry)
+        return [invert(edit) for edit in reversed(entry.edits)]
+
+    def redo(self):
+        if not self._redo:
+            return None
+        entry = self._redo.pop()
+        self._undo.append(entry)
+        return list(entry.edits)
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._size = 0
+
+    def set_limits(self, max_entries=None, max_bytes=None):
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self._evict()
+
+    def _evict(self):
+        # The newest entry is always kept, however large
+        while len(self._undo) > 1 and (
+            len(self._undo) > self.max_entries or self._size > self.max_bytes
+        ):
+            self._size -= self._undo.popleft().size
@@ -0,0 +1,68 @@
+import yaml
+
+# ----------------------------------------------------------------------
+# yaml_io
+#    - The one place that parses and emits YAML
+#    - Uses the libyaml C loader/dumper when PyYAML was built with it,
+#      and falls back to the pure-Python classes otherwise
+# ----------------------------------------------------------------------
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+    BACKEND = "libyaml"
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
+    BACKEND = "python"
+
+YAMLError = yaml.YAMLError
+
+
+class _Dumper(SafeDumper):
+    """Writes shared objects out in full instead of as anchors/aliases."""
+
+    def ignore_aliases(self, data):
+        return True
+
+
+# Output formatting shared by every dump
+DUMP_OPTIONS = {
+    "default_flow_style": False,
+    "sort_keys": False,
+    "indent": 2,
+    "width": 80,
+}
+
+
+def backend():
+    """Return the active backend name: 'libyaml' or 'python'."""
+    return BACKEND
+
+
+def load(stream):
+    """Parse a single YAML document from a string or file object."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def load_with_node(stream):
+    """
+    Parse a single YAML document, returning (node, data): the composed node
+    tree (with source positions) and the data built from it.
+    """
+    loader = SafeLoader(stream)
+    try:
+        node = loader.get_single_node()
+        data = loader.construct_document(node) if node is not None else None
+    finally:
+        loader.dispose()
+    return node, data
+
+
+def dump(data, stream=None, aliases=False):
+    """
+    Emit data as YAML with the editor's formatting.
+    Returns the text if stream is None, otherwise writes to stream.
+    Objects reached more than once (jobs share steps, for one) are written
+    in full each time, unless aliases is set: then they are written once
+    with an anchor and referred to by alias afterwards.
+    """
+    dumper = SafeDumper if aliases else _Dumper
+    return yaml.dump(data, stream, Dumper=dumper, **DUMP_OPTIONS)
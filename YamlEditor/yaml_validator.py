@@ -0,0 +1,180 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor, QTextCursor, QTextFormat
+from PyQt5.QtWidgets import QTextEdit
+from YamlEditor import yaml_io
+
+# Wait this long after the last keystroke before parsing
+DEBOUNCE_MS = 300
+
+
+# ----------------------------------------------------------------------
+# ParseResult / ParseCache
+#    - Parsed YAML keyed by a hash of the text, shared by live validation
+#      and the final save so the same text is never parsed twice
+#    - Cached data is shared: callers must treat it as read-only
+# ----------------------------------------------------------------------
+class ParseResult:
+    __slots__ = ("data", "error", "line", "column")
+
+    def __init__(self, data=None, error=None, line=None, column=None):
+        self.data = data
+        self.error = error      # message, or None if the text parsed
+        self.line = line        # 0-based line of the problem, if known
+        self.column = column
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+def text_key(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def parse_text(text):
+    """Parse YAML text into a ParseResult (never raises on bad YAML)."""
+    if not text.strip():
+        return ParseResult(None)
+    try:
+        return ParseResult(yaml_io.load(text))
+    except yaml_io.YAMLError as e:
+        mark = getattr(e, "problem_mark", None)
+        return ParseResult(
+            error=str(e),
+            line=mark.line if mark is not None else None,
+            column=mark.column if mark is not None else None,
+        )
+
+
+class ParseCache:
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()   # filled from worker threads
+
+    def get(self, key):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+            return result
+
+    def put(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def parse(self, text):
+        """Return the cached result for text, parsing (and caching) on a miss."""
+        key = text_key(text)
+        result = self.get(key)
+        if result is None:
+            result = parse_text(text)
+            self.put(key, result)
+        return result
+
+
+# ----------------------------------------------------------------------
+# ParseTask
+#    - Parses one snapshot of an editor's text on a QThreadPool worker
+# ----------------------------------------------------------------------
+class ParseSignals(QObject):
+    finished = pyqtSignal(int, object)   # (generation, ParseResult)
+
+
+class ParseTask(QRunnable):
+    def __init__(self, generation, text, cache):
+        super().__init__()
+        self.generation = generation
+        self.text = text
+        self.cache = cache
+        self.signals = ParseSignals()
+
+    def run(self):
+        self.signals.finished.emit(self.generation, self.cache.parse(self.text))
+
+
+# ----------------------------------------------------------------------
+# YamlFieldValidator
+#    - Watches a QPlainTextEdit, debounces edits and parses off-thread
+#    - Results for text that has since changed are discarded
+#    - Marks the offending line in the editor and reports a message
+# ----------------------------------------------------------------------
+class YamlFieldValidator(QObject):
+    validated = pyqtSignal(str)   # Emitted with an error message, or "" when valid
+
+    def __init__(self, text_edit, cache, check=None, parent=None):
+        """
+        check(data) may return an error message for YAML that parses but
+        has the wrong shape (e.g. env that is not a dict).
+        """
+        super().__init__(parent or text_edit)
+        self.text_edit = text_edit
+        self.cache = cache
+        self.check = check
+        self._generation = 0
+        self._tasks = {}
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(DEBOUNCE_MS)
+        self._timer.timeout.connect(self._start_parse)
+        self.text_edit.textChanged.connect(self._on_text_changed)
+
+    def _on_text_changed(self):
+        # Any result still in flight is for older text now
+        self._generation += 1
+        self._timer.start()
+
+    def _start_parse(self):
+        generation = self._generation
+        text = self.text_edit.toPlainText()
+        cached = self.cache.get(text_key(text))
+        if cached is not None:
+            self._apply(cached)
+            return
+        task = ParseTask(generation, text, self.cache)
+        task.signals.finished.connect(self._on_parsed)
+        self._tasks[generation] = task
+        QThreadPool.globalInstance().start(task)
+
+    def _on_parsed(self, generation, result):
+        self._tasks.pop(generation, None)
+        if generation != self._generation:
+            return  # stale: the text changed while this was parsing
+        self._apply(result)
+
+    def error_for(self, result):
+        """Return the message for a parse result, or None if it is valid."""
+        if not result.ok:
+            return result.error
+        if self.check is not None:
+            return self.check(result.data)
+        return None
+
+    def _apply(self, result):
+        message = self.error_for(result)
+        selections = []
+        if message and result.line is not None:
+            block = self.text_edit.document().findBlockByNumber(result.line)
+            if block.isValid():
+                selection = QTextEdit.ExtraSelection()
+                selection.format.setBackground(QColor("#FFD6D6"))
+                selection.format.setProperty(QTextFormat.FullWidthSelection, True)
+                selection.format.setToolTip(message)
+                selection.cursor = QTextCursor(block)
+                selections.append(selection)
+        self.text_edit.setExtraSelections(selections)
+        self.validated.emit(message or "")
+
+    def reset(self):
+        """Clear markers for freshly loaded text (known to be valid)."""
+        self._timer.stop()
+        self._generation += 1
+        self.text_edit.setExtraSelections([])
+        self.validated.emit("")
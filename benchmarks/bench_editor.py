@@ -0,0 +1,318 @@
+"""
+Benchmarks for the editor's main paths at realistic preset sizes.
+
+Runs headless (QT_QPA_PLATFORM=offscreen) and prints JSON results:
+
+    python benchmarks/bench_editor.py --output results.json
+    python benchmarks/bench_editor.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_editor.py --baseline benchmarks/baseline.json
+
+With --baseline, every benchmark that got slower (or used more peak
+memory) than the baseline by more than the threshold is reported and the
+exit status is 2.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+from YamlEditor import ci_advisor, preset_io, preset_patch, yaml_io  # noqa: E402
+from YamlEditor.edit_journal import EditJournal  # noqa: E402
+from YamlEditor.editor_window import GitHubActionsEditor  # noqa: E402
+from YamlEditor.job_editor_widget import JobEditorWidget  # noqa: E402
+from YamlEditor.job_list_widget import JobListWidget  # noqa: E402
+from YamlEditor.preset_library import PresetLibrary  # noqa: E402
+from YamlEditor.schema_validator import PresetValidator  # noqa: E402
+from YamlEditor.search_index import SearchIndex  # noqa: E402
+
+DEFAULT_SIZES = [10, 1000, 50000]
+DEFAULT_REPEAT = 5
+DEFAULT_TIME_THRESHOLD = 0.25     # 25% slower than baseline is a regression
+DEFAULT_MEMORY_THRESHOLD = 0.25
+
+
+# ----------------------------------------------------------------------
+# Synthetic presets
+# ----------------------------------------------------------------------
+def make_job(i):
+    steps = [
+        {"name": "Checkout", "uses": "actions/checkout@v4"},
+        {"name": "Set up Python", "uses": "actions/setup-python@v5",
+         "with": {"python-version": "3.12", "cache": "pip"}},
+        {"name": "Install", "run": "pip install -r requirements.txt"},
+        {"name": "Test", "run": f"pytest tests/shard_{i % 64} -k 'not slow' --maxfail=1"},
+    ]
+    job = {
+        "name": f"Job {i}",
+        "runs-on": ["ubuntu-latest", "windows-latest", "macos-latest"][i % 3],
+        "steps": steps,
+        "env": {"CI": "true", "SHARD": str(i % 64), "PYTHONUNBUFFERED": "1"},
+    }
+    if i % 10:
+        job["needs"] = [f"job-{i - (i % 10)}"]
+    return job
+
+
+def write_preset(directory, size):
+    path = os.path.join(directory, f"preset_{size}.yaml")
+    with open(path, "w") as f:
+        yaml_io.dump({"name": f"Bench{size}", "jobs": [make_job(i) for i in range(size)]}, f)
+    return path
+
+
+# ----------------------------------------------------------------------
+# Measurement
+# ----------------------------------------------------------------------
+def measure(func, setup=None, repeat=DEFAULT_REPEAT):
+    """
+    Time func() `repeat` times (setup() runs before each, untimed) and then
+    once more under tracemalloc for peak memory. Returns a result dict.
+    """
+    times = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        gc.collect()
+        start = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - start)
+
+    arg = setup() if setup else None
+    gc.collect()
+    tracemalloc.start()
+    func(arg)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": min(times),
+        "mean_seconds": sum(times) / len(times),
+        "repeat": repeat,
+        "peak_bytes": peak,
+    }
+
+
+def run_benchmarks(app, sizes, repeat):
+    results = []
+    tmp = tempfile.mkdtemp(prefix="gha-bench-")
+
+    def record(name, size, result):
+        result.update({"name": name, "jobs": size})
+        results.append(result)
+        print(f"{name:>14} {size:>7} jobs  {result['seconds'] * 1000:10.2f} ms  "
+              f"peak {result['peak_bytes'] / 1e6:8.2f} MB", file=sys.stderr)
+
+    # Opening the editor: the empty window, up to its first shown frame
+    journal_path = os.path.join(tmp, "journal_open.log")
+
+    def open_window(_):
+        window = GitHubActionsEditor(
+            library=PresetLibrary(":memory:"), journal=EditJournal(journal_path)
+        )
+        window.show()
+        app.processEvents()
+        window.close()
+    record("open_window", 0, measure(open_window, repeat=repeat))
+    for name in (journal_path, journal_path + ".lock"):
+        os.remove(name)
+
+    for size in sizes:
+        path = write_preset(tmp, size)
+        preset_name, jobs = preset_io.load_preset_file(path)
+        selection_count = min(size, 50)
+        small_repeat = repeat if size < 10000 else max(1, repeat // 2)
+
+        # _on_load_preset: read + parse + normalize (the load worker's path)
+        record("load", size, measure(
+            lambda _: preset_io.load_preset_file(path), repeat=small_repeat
+        ))
+
+        # JobListWidget.refresh_jobs (+ letting the view lay itself out)
+        job_list = JobListWidget()
+        job_list.resize(800, 600)
+        job_list.show()
+
+        def refresh(_):
+            job_list.refresh_jobs(jobs)
+            app.processEvents()
+        record("refresh_jobs", size, measure(refresh, repeat=repeat))
+
+        # Filter box: one keystroke on an indexed preset
+        index = SearchIndex()
+        index.set_preset(preset_name, jobs)
+        job_list.set_search_index(index)
+        job_list.refresh_jobs(jobs, preset_name)
+
+        def filter_jobs(_):
+            job_list.filter_edit.setText(f"uses:actions/checkout name:{size // 2}")
+            job_list.filter_edit.clear()
+        record("filter_jobs", size, measure(filter_jobs, repeat=repeat))
+        job_list.close()
+
+        # JobEditorWidget.load_job: first view of each job, then revisits
+        editor = JobEditorWidget()
+
+        def select(widget):
+            for i in range(selection_count):
+                widget.load_job(jobs[i], i)
+        record("load_job_cold", size, measure(
+            select, setup=lambda: JobEditorWidget(), repeat=repeat
+        ))
+        select(editor)
+        record("load_job_warm", size, measure(lambda _: select(editor), repeat=repeat))
+        editor.close()
+
+        # _on_job_saved on a full editor window
+        window = GitHubActionsEditor(
+            library=PresetLibrary(":memory:"),
+            journal=EditJournal(os.path.join(tmp, f"journal_{size}.log"))
+        )
+        window.presets[preset_name] = list(jobs)
+        window.preset_manager.add_preset(preset_name)
+        window.preset_manager.set_current_preset(preset_name)
+        middle = size // 2
+
+        def save_job(_):
+            for k in range(selection_count):
+                job = window.presets[preset_name][middle]
+                window._on_job_saved(middle, job.replace(name=f"Renamed {k}"))
+        record("on_job_saved", size, measure(save_job, repeat=repeat))
+        window.writer.wait()
+        window.close()
+        for name in (window.journal.path, window.journal.path + ".lock"):
+            os.remove(name)
+
+        # _save_current_preset: the serialization the writer runs
+        record("save_dump", size, measure(
+            lambda _: preset_io.dump_preset(preset_name, jobs), repeat=small_repeat
+        ))
+
+        # Saving back to the loaded file after a one-job edit: only that
+        # job is re-emitted and spliced into the file
+        _name, patched_jobs, source = preset_io.load_preset_source(path)
+        patched_jobs[middle] = patched_jobs[middle].replace(name="Renamed")
+
+        def save_patch(_):
+            content, _written = preset_patch.render_preset(
+                path, preset_name, patched_jobs, source
+            )
+            for _chunk in content:
+                pass
+        record("save_patch", size, measure(save_patch, repeat=small_repeat))
+
+        # CI advice: the whole preset (CLI advise), and the job editor's
+        # view of one job with the preset-wide findings
+        record("advise", size, measure(
+            lambda _: ci_advisor.analyze(jobs), repeat=small_repeat
+        ))
+        record("advise_job", size, measure(
+            lambda _: ci_advisor.analyze(jobs, ci_advisor.JOB_KINDS, indices=[middle]),
+            repeat=repeat
+        ))
+
+        # Schema validation: a whole preset with nothing cached (in-process,
+        # so the numbers do not depend on the machine's cores), then again
+        # after a one-job edit, which only checks that job
+        record("validate", size, measure(
+            lambda validator: validator.validate(jobs),
+            setup=lambda: PresetValidator(workers=1), repeat=small_repeat
+        ))
+        validator = PresetValidator(workers=1)
+        validator.validate(jobs)
+        edited_jobs = list(jobs)
+
+        def revalidate(_):
+            edited_jobs[middle] = jobs[middle].replace(name=f"Renamed {time.perf_counter()}")
+            validator.validate(edited_jobs)
+        record("revalidate", size, measure(revalidate, repeat=repeat))
+
+        os.remove(path)
+    os.rmdir(tmp)
+    return results
+
+
+# ----------------------------------------------------------------------
+# Baseline comparison
+# ----------------------------------------------------------------------
+def compare(results, baseline, time_threshold, memory_threshold):
+    """Return a list of regression messages (empty if none)."""
+    base = {(r["name"], r["jobs"]): r for r in baseline.get("results", [])}
+    regressions = []
+    for r in results:
+        b = base.get((r["name"], r["jobs"]))
+        if b is None:
+            continue
+        if b["seconds"] > 0 and r["seconds"] > b["seconds"] * (1 + time_threshold):
+            regressions.append(
+                f"{r['name']} ({r['jobs']} jobs): {r['seconds'] * 1000:.2f} ms vs "
+                f"baseline {b['seconds'] * 1000:.2f} ms "
+                f"(+{(r['seconds'] / b['seconds'] - 1) * 100:.0f}%)"
+            )
+        if b["peak_bytes"] > 0 and r["peak_bytes"] > b["peak_bytes"] * (1 + memory_threshold):
+            regressions.append(
+                f"{r['name']} ({r['jobs']} jobs): peak {r['peak_bytes'] / 1e6:.2f} MB vs "
+                f"baseline {b['peak_bytes'] / 1e6:.2f} MB"
+            )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Editor benchmarks (headless).")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Job counts of the synthetic presets")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="Timed runs per benchmark (the fastest is reported)")
+    parser.add_argument("--output", help="Write JSON results here (default: stdout)")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Also write results as a baseline")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against a stored baseline")
+    parser.add_argument("--time-threshold", type=float, default=DEFAULT_TIME_THRESHOLD,
+                        help="Allowed slowdown as a fraction (default 0.25)")
+    parser.add_argument("--memory-threshold", type=float, default=DEFAULT_MEMORY_THRESHOLD,
+                        help="Allowed peak-memory growth as a fraction (default 0.25)")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    results = run_benchmarks(app, args.sizes, args.repeat)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "yaml_backend": yaml_io.backend(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.time_threshold, args.memory_threshold)
+        report["regressions"] = regressions
+        for message in regressions:
+            print(f"REGRESSION: {message}", file=sys.stderr)
+        if regressions:
+            status = 2
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            f.write(text + "\n")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,92 @@
 # main.py
-import sys
-from PyQt5.QtWidgets import QApplication
-from YamlEditor import GitHubActionsEditor
+import time
+STARTED = time.perf_counter()   # origin of the --profile-startup report
+
+import argparse     # noqa: E402
+import contextlib   # noqa: E402
+import os           # noqa: E402
+import sys          # noqa: E402
+from YamlEditor.startup_profile import StartupProfile   # noqa: E402
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="GitHub Actions preset editor")
+    parser.add_argument(
+        "--profile", metavar="TRACE_JSON", nargs="?", const="editor-trace.json",
+        default=os.environ.get("GHA_EDITOR_PROFILE"),
+        help="Time every handler and write a Chrome trace on exit "
+             "(default file: editor-trace.json; env: GHA_EDITOR_PROFILE)"
+    )
+    parser.add_argument(
+        "--profile-threshold", metavar="MS", type=float, default=None,
+        help="Log handlers and event-loop stalls longer than this"
+    )
+    parser.add_argument(
+        "--profile-startup", action="store_true",
+        help="Print how long each startup phase took (imports, window construction, "
+             "up to the first event-loop turn); per module: python -X importtime"
+    )
+    parser.add_argument(
+        "--undo-memory", metavar="MB", type=float, default=None,
+        help="Approximate memory each preset's undo history may use (default 32)"
+    )
+    parser.add_argument(
+        "--share-steps", action="store_true",
+        help="Save steps lists repeated across jobs once, as YAML anchors"
+    )
+    # Leave Qt's own options (-style, ...) to QApplication
+    args, _unknown = parser.parse_known_args(argv)
+    return args
+
+
+def _no_phase(_name):
+    return contextlib.nullcontext()
+
+
 def main():
-    app = QApplication(sys.argv)
-    window = GitHubActionsEditor()
-    window.show()
-    sys.exit(app.exec_())
+    args = parse_args(sys.argv[1:])
+    startup = StartupProfile(STARTED) if args.profile_startup else None
+    phase = startup.phase if startup is not None else _no_phase
+
+    # Imported here rather than at the top, so their cost shows up as phases
+    with phase("import PyQt5"):
+        from PyQt5.QtCore import QTimer
+        from PyQt5.QtWidgets import QApplication
+    with phase("import editor"):
+        from YamlEditor.editor_window import GitHubActionsEditor
+    with phase("QApplication"):
+        app = QApplication(sys.argv)
+
+    profiler = None
+    if args.profile:
+        import logging
+        from YamlEditor.profiler import SlotProfiler, DEFAULT_THRESHOLD_MS
+        logging.basicConfig(level=logging.INFO)
+        threshold = args.profile_threshold
+        profiler = SlotProfiler(threshold if threshold is not None else DEFAULT_THRESHOLD_MS)
+        profiler.start()
+
+    options = {"share_steps": args.share_steps}
+    if args.undo_memory is not None:
+        options["undo_max_bytes"] = int(args.undo_memory * 1024 * 1024)
+    with phase("GitHubActionsEditor"):
+        window = GitHubActionsEditor(profiler=profiler, startup=startup, **options)
+    with phase("show"):
+        window.show()
+
+    if startup is not None:
+        # Runs on the first turn of the event loop, once the window is up
+        def report():
+            startup.mark("event loop running")
+            print(startup.report(), file=sys.stderr)
+        QTimer.singleShot(0, report)
+    status = app.exec_()
+
+    if profiler is not None:
+        profiler.stop()
+        profiler.export_chrome_trace(args.profile)
+        print(f"Wrote trace to {args.profile}", file=sys.stderr)
+    sys.exit(status)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,23 @@
+from YamlEditor import ci_advisor
+from YamlEditor.job_data import Job
+
+
+def test_concurrency_groups_name_each_job():
+    jobs = [
+        Job.from_dict({"name": "Lint", "runs-on": "ubuntu-latest", "steps": [{"run": "make lint"}]}),
+        Job.from_dict({"name": "Test", "runs-on": "ubuntu-latest", "steps": [{"run": "make test"}],
+                       "strategy": {"matrix": {"python": ["3.12", "3.13"]}}}),
+        Job.from_dict({"name": "Lint", "runs-on": "ubuntu-latest", "steps": [{"run": "make docs"}]}),
+    ]
+    fixed, applied = ci_advisor.fix_all(jobs, ("concurrency",))
+    assert len(applied) == 3
+    groups = [job.get("concurrency")["group"] for job in fixed]
+    assert groups == [
+        "${{ github.workflow }}-${{ github.ref }}-lint",
+        "${{ github.workflow }}-${{ github.ref }}-test-${{ strategy.job-index }}",
+        "${{ github.workflow }}-${{ github.ref }}-lint-2",
+    ]
+    assert all("github.job" not in group for group in groups)
+    assert fixed[0].get("concurrency")["cancel-in-progress"] == (
+        "${{ github.event_name == 'pull_request' }}"
+    )
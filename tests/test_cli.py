@@ -0,0 +1,43 @@
+import hashlib
+import json
+import pytest
+from YamlEditor import cli, preset_io
+
+PRESET = "name: CI\njobs:\n  - name: Build\n    runs-on: ubuntu-latest\n"
+
+
+def test_workers_must_be_positive(capsys):
+    for value in ("0", "-2"):
+        with pytest.raises(SystemExit):
+            cli.build_parser().parse_args(["compile", "src", "out", "-j", value])
+    assert "must be at least 1" in capsys.readouterr().err
+    args = cli.build_parser().parse_args(["validate", "a.yaml", "-j", "2"])
+    assert args.workers == 2
+
+
+def test_manifest_records_the_compiled_content(tmp_path, monkeypatch):
+    src = tmp_path / "src"
+    out = tmp_path / "out"
+    src.mkdir()
+    preset = src / "ci.yaml"
+    preset.write_text(PRESET)
+    edited = PRESET.replace("Build", "Edited")
+
+    # The preset changes on disk right after the compile read it
+    compile_preset_file = preset_io.compile_preset_file
+
+    def compile_then_edit(*args, **kwargs):
+        result = compile_preset_file(*args, **kwargs)
+        preset.write_text(edited)
+        return result
+    monkeypatch.setattr(preset_io, "compile_preset_file", compile_then_edit)
+
+    assert cli.compile_directory(str(src), str(out), workers=1, log=None) == (1, 0, 0)
+    manifest = json.loads((out / cli.MANIFEST_NAME).read_text())
+    assert manifest["ci.yml"]["digest"] == hashlib.sha256(PRESET.encode()).hexdigest()
+
+    # So the next run rebuilds the stale output
+    monkeypatch.setattr(preset_io, "compile_preset_file", compile_preset_file)
+    assert cli.compile_directory(str(src), str(out), workers=1, log=None) == (1, 0, 0)
+    assert "edited" in (out / "ci.yml").read_text()
+    assert cli.compile_directory(str(src), str(out), workers=1, log=None) == (0, 1, 0)
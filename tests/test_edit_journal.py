@@ -0,0 +1,85 @@
+from YamlEditor import edit_journal
+from YamlEditor.edit_journal import EditJournal, encode_record, read_records
+from YamlEditor.job_data import Job
+
+
+def _job(name, **extra):
+    return Job.from_dict(dict({"name": name, "runs-on": "ubuntu-latest"}, **extra))
+
+
+def test_read_records_stops_at_torn_or_corrupt_line(tmp_path):
+    path = tmp_path / "journal.log"
+    good = encode_record(["new", "A", 1]) + encode_record(["rm", "A", 2, 0])
+    corrupt = bytearray(encode_record(["rm", "A", 3, 0]))
+    corrupt[-3] ^= 1
+    path.write_bytes(good + bytes(corrupt) + b"0000")
+    records, size = read_records(str(path))
+    assert records == [["new", "A", 1], ["rm", "A", 2, 0]]
+    assert size == len(good)
+
+
+def test_recovery_replays_unsaved_edits(tmp_path):
+    path = str(tmp_path / "journal.log")
+    journal = EditJournal(path)
+    journal.base("CI", 0, "/presets/ci.yaml", "hash")
+    journal.add_job("CI", 1, 1, _job("Test"))
+    # YAML-only data (non-string keys) survives the round trip
+    journal.set_job("CI", 2, 0, _job("Build", env={1: "one"}))
+    journal.remove_job("CI", 3, 2)
+    journal.new_preset("Draft", 1)
+    journal.close()
+
+    journal = EditJournal(path)
+    recovered = {r.name: r for r in journal.recovered()}
+    journal.close()
+    ci = recovered["CI"]
+    assert (ci.path, ci.content_hash, ci.saved_revision, ci.revision) == (
+        "/presets/ci.yaml", "hash", 0, 3
+    )
+    jobs = ci.apply([_job("Old Build"), _job("Lint")])
+    assert [job.name for job in jobs] == ["Build", "Test"]
+    assert jobs[0].get("env") == {1: "one"}
+    assert recovered["Draft"].apply([]) == []
+
+
+def test_torn_tail_is_truncated_on_open(tmp_path):
+    path = tmp_path / "journal.log"
+    good = encode_record(["new", "A", 1])
+    path.write_bytes(good + b"deadbeef {\"torn")
+    journal = EditJournal(str(path))
+    journal.rename_preset("A", "B")
+    journal.close()
+    records, size = read_records(str(path))
+    assert records == [["new", "A", 1], ["mv", "A", "B"]]
+    assert size == path.stat().st_size
+
+
+def test_save_drops_covered_edits_and_compaction_keeps_the_rest(tmp_path, monkeypatch):
+    monkeypatch.setattr(edit_journal, "COMPACT_MIN_BYTES", 1)
+    path = str(tmp_path / "journal.log")
+    journal = EditJournal(path)
+    journal.base("CI", 0, "/ci.yaml", "h0")
+    journal.set_job("CI", 1, 0, _job("One"))
+    journal.set_job("CI", 2, 0, _job("Two"))
+    journal.base("CI", 1, "/ci.yaml", "h1")     # saved at revision 1
+    journal.delete_preset("Gone")
+    journal.close()
+    records, _size = read_records(path)
+    assert [r[0] for r in records] == ["base", "set"]
+    assert records[1][2] == 2
+
+
+def test_second_journal_on_same_path_uses_its_own_file(tmp_path):
+    path = str(tmp_path / "journal.log")
+    first = EditJournal(path)
+    second = EditJournal(path)
+    try:
+        assert first.path == path
+        assert second.path == str(tmp_path / "journal-2.log")
+    finally:
+        second.close()
+        first.close()
+    # Once closed, the first file is free again
+    third = EditJournal(path)
+    third.close()
+    assert third.path == path
@@ -0,0 +1,73 @@
+from YamlEditor import job_graph
+from YamlEditor.job_data import Job
+
+
+def _jobs(*specs):
+    """specs: (name, needs) pairs."""
+    return [Job.from_dict({"name": name, "needs": needs} if needs else {"name": name})
+            for name, needs in specs]
+
+
+def test_needs_resolve_by_id_or_name():
+    graph = job_graph.JobGraph(_jobs(
+        ("Build App", None),
+        ("Test", "build-app"),
+        ("Deploy", ["Build App", "Test", "nope"]),
+    ))
+    assert graph.ids == ["build-app", "test", "deploy"]
+    assert sorted(graph.edges()) == [(0, 1), (0, 2), (1, 2)]
+    assert graph.missing == [(2, "nope")]
+    assert graph.order == [0, 1, 2]
+    assert graph.cycles == []
+
+
+def test_cycles_are_found_and_left_unscheduled():
+    graph = job_graph.JobGraph(_jobs(
+        ("a", "c"), ("b", "a"), ("c", "b"),     # a -> b -> c -> a
+        ("d", "d"),                             # needs itself
+        ("e", "a"),                             # behind the cycle
+        ("f", None),
+    ))
+    assert sorted(graph.cycles) == [[0, 1, 2], [3]]
+    assert graph.order == [5]
+    analysis = graph.analyze(durations={"f": 10})
+    assert analysis.critical_path == [5]
+    assert "2 cycle(s)!" in analysis.summary()
+
+
+def test_critical_path_and_slack():
+    # build -> (unit, lint) -> deploy; unit is the long branch
+    jobs = _jobs(("build", None), ("unit", "build"), ("lint", "build"),
+                 ("deploy", ["unit", "lint"]))
+    durations = {"build": 60, "unit": 300, "lint": 30, "deploy": 120}
+    analysis = job_graph.analyze_jobs(jobs, durations)
+    assert analysis.critical_path == [0, 1, 3]
+    assert analysis.serializing_edges == [(0, 1), (1, 3)]
+    assert analysis.critical_length == 480
+    assert analysis.earliest_start == [0, 60, 60, 360]
+    assert analysis.slack == [0, 0, 270, 0]
+    assert analysis.estimated_total == 480
+    assert analysis.peak_parallelism == 2
+
+
+def test_limited_runners():
+    jobs = _jobs(("a", None), ("b", None), ("c", None), ("d", ["a", "b", "c"]))
+    durations = {"a": 100, "b": 100, "c": 50, "d": 10}
+    assert job_graph.analyze_jobs(jobs, durations).estimated_total == 110
+    one = job_graph.analyze_jobs(jobs, durations, concurrency=1)
+    assert one.estimated_total == 260
+    assert one.peak_parallelism == 1
+    two = job_graph.analyze_jobs(jobs, durations, concurrency=2)
+    assert two.estimated_total == 160
+    assert two.parallelism == 260 / 160
+    assert two.max_parallelism == 260 / 110
+
+
+def test_estimate_and_format_duration():
+    job = Job.from_dict({"name": "t", "steps": [{"uses": "actions/checkout@v4"}, {"run": "make"}]})
+    assert job_graph.estimate_duration(job) == (
+        job_graph.JOB_OVERHEAD_SECONDS + job_graph.USES_STEP_SECONDS + job_graph.RUN_STEP_SECONDS
+    )
+    assert job_graph.format_duration(45) == "45s"
+    assert job_graph.format_duration(750) == "12m 30s"
+    assert job_graph.format_duration(3725) == "1h 02m"
@@ -0,0 +1,71 @@
+import pytest
+from YamlEditor import matrix
+from YamlEditor.job_data import Job
+
+
+def _count(m):
+    count = matrix.count_combinations(m)
+    assert count == len(list(matrix.iter_combinations(m)))
+    return count
+
+
+def test_cartesian_product():
+    assert _count({"os": ["ubuntu", "windows"], "python": ["3.11", "3.12", "3.13"]}) == 6
+
+
+def test_exclude_removes_matching_combinations():
+    m = {
+        "os": ["ubuntu", "windows", "macos"],
+        "python": ["3.11", "3.12"],
+        "exclude": [{"os": "windows"}, {"os": "macos", "python": "3.11"}],
+    }
+    assert _count(m) == 3
+
+
+def test_include_extends_or_adds_combinations():
+    m = {
+        "os": ["ubuntu", "windows"],
+        "python": ["3.12"],
+        "include": [
+            {"os": "windows", "experimental": True},   # merged into windows
+            {"os": "macos", "python": "3.12"},         # fits none: its own job
+        ],
+    }
+    assert _count(m) == 3
+    combos = list(matrix.iter_combinations(m))
+    assert {"os": "windows", "python": "3.12", "experimental": True} in combos
+    assert combos[-1] == {"os": "macos", "python": "3.12"}
+
+
+def test_include_matching_only_excluded_combinations_is_added():
+    m = {
+        "os": ["ubuntu", "windows"],
+        "exclude": [{"os": "windows"}],
+        "include": [{"os": "windows", "arch": "arm64"}],
+    }
+    assert _count(m) == 2
+
+
+def test_matrix_without_axes_runs_the_includes():
+    assert _count({"include": [{"a": 1}, {"a": 2}]}) == 2
+
+
+def test_dynamic_matrix():
+    with pytest.raises(matrix.DynamicMatrix):
+        matrix.count_combinations("${{ fromJSON(needs.setup.outputs.matrix) }}")
+    job = Job.from_dict({"name": "Test", "strategy": {"matrix": {"os": "${{ fromJSON(x) }}"}}})
+    assert matrix.effective_job_count(job) is None
+
+
+def test_preset_job_count():
+    jobs = [
+        Job.from_dict({"name": "Lint"}),
+        Job.from_dict({"name": "Test", "strategy": {"matrix": {"n": list(range(300))}}}),
+        Job.from_dict({"name": "Dyn", "strategy": {"matrix": "${{ fromJSON(x) }}"}}),
+    ]
+    count = matrix.PresetJobCount(jobs)
+    assert count.total == 301
+    assert count.dynamic == [2]
+    assert count.over_budget == [(1, 300)]
+    assert count.exceeds_budget
+    assert count.summary() == "301 runner job(s) + 1 dynamic matrix — over budget (256)"
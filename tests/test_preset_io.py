@@ -0,0 +1,61 @@
+import hashlib
+from YamlEditor import preset_io, yaml_io
+from YamlEditor.job_data import Job
+
+
+def _jobs(*dicts):
+    return [Job.from_dict(d) for d in dicts]
+
+
+def test_job_ids_are_unique_slugs():
+    jobs = _jobs({"name": "Build App"}, {"name": "Build App"}, {"name": "1st"}, {})
+    assert preset_io.job_ids(jobs) == ["build-app", "build-app-2", "_1st", "job"]
+
+
+def test_workflow_needs_use_job_ids():
+    jobs = _jobs(
+        {"name": "Build", "runs-on": "ubuntu-latest"},
+        {"name": "Unit Tests", "runs-on": "ubuntu-latest", "needs": "Build"},
+        {"name": "Deploy", "runs-on": "ubuntu-latest", "needs": ["build", "Unit Tests"]},
+        {"name": "Other", "runs-on": "ubuntu-latest", "needs": ["missing"]},
+    )
+    workflow = preset_io.preset_to_workflow("CI", jobs)
+    assert list(workflow["jobs"]) == ["build", "unit-tests", "deploy", "other"]
+    assert workflow["jobs"]["unit-tests"]["needs"] == "build"
+    assert workflow["jobs"]["deploy"]["needs"] == ["build", "unit-tests"]
+    # Unknown entries are left for GitHub (and job_graph) to report
+    assert workflow["jobs"]["other"]["needs"] == ["missing"]
+    # The preset's own jobs are not changed
+    assert jobs[1].get("needs") == "Build"
+
+
+def test_compile_preset_file_writes_needs_ids(tmp_path):
+    source = tmp_path / "preset.yaml"
+    source.write_text(
+        "name: CI\n"
+        "jobs:\n"
+        "  - name: Build\n"
+        "    runs-on: ubuntu-latest\n"
+        "  - name: Test\n"
+        "    runs-on: ubuntu-latest\n"
+        "    needs: [Build]\n"
+    )
+    output = tmp_path / "ci.yml"
+    preset_io.compile_preset_file(str(source), str(output))
+    workflow = yaml_io.load(output.read_text())
+    assert workflow["jobs"]["test"]["needs"] == ["build"]
+
+
+def test_load_preset_source_hashes_the_bytes_it_parsed(tmp_path):
+    source = tmp_path / "preset.yaml"
+    content = b"name: CI\njobs:\n  - name: Build\n    runs-on: ubuntu-latest\n"
+    source.write_bytes(content)
+    info = {}
+    name, jobs, _source = preset_io.load_preset_source(str(source), info=info)
+    assert (name, [job.name for job in jobs]) == ("CI", ["Build"])
+    assert info["content_hash"] == hashlib.sha256(content).hexdigest()
+    assert info["mtime"] == source.stat().st_mtime
+    # Known content is not parsed again
+    assert preset_io.load_preset_source(
+        str(source), info={}, known_hash=info["content_hash"]
+    ) is None
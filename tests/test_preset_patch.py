@@ -0,0 +1,109 @@
+from YamlEditor import preset_io, preset_patch
+
+
+def _save(path, preset_name, jobs, source):
+    """Write a preset the way the editor does; returns the written source."""
+    content, written = preset_patch.render_preset(str(path), preset_name, jobs, source)
+    data = content if isinstance(content, bytes) else b"".join(bytes(c) for c in content)
+    path.write_bytes(data)
+    return written
+
+
+def _load(path):
+    return preset_io.load_preset_source(str(path))
+
+
+def test_patch_keeps_comments_crlf_and_indentless_lists(tmp_path):
+    path = tmp_path / "preset.yaml"
+    original = (
+        "# CI preset\r\n"
+        "name: CI\r\n"
+        "jobs:\r\n"
+        "- name: Build   # first job\r\n"
+        "  runs-on: ubuntu-latest\r\n"
+        "\r\n"
+        "# tests below\r\n"
+        "- name: Test\r\n"
+        "  runs-on: ubuntu-latest\r\n"
+        "- name: Deploy\r\n"
+        "  runs-on: ubuntu-latest  # prod\r\n"
+    )
+    path.write_bytes(original.encode())
+    name, jobs, source = _load(path)
+    assert source is not None and source.newline == "\r\n"
+
+    jobs = list(jobs)
+    jobs[1] = jobs[1].replace(runs_on="windows-latest")
+    written = _save(path, name, jobs, source)
+
+    data = path.read_bytes().decode()
+    assert data == original.replace(
+        "- name: Test\r\n  runs-on: ubuntu-latest\r\n",
+        "- name: Test\r\n  runs-on: windows-latest\r\n",
+    )
+    # The spans recorded for the written file match what a reload finds
+    _name, reloaded, rescanned = _load(path)
+    assert [job.runs_on for job in reloaded] == ["ubuntu-latest", "windows-latest", "ubuntu-latest"]
+    assert written.spans == rescanned.spans
+
+
+def test_patch_with_growing_job_shifts_later_spans(tmp_path):
+    path = tmp_path / "preset.yaml"
+    path.write_text(
+        "name: CI\n"
+        "jobs:\n"
+        "  - name: Build\n"
+        "    runs-on: ubuntu-latest\n"
+        "  - name: Test\n"
+        "    runs-on: ubuntu-latest\n"
+    )
+    name, jobs, source = _load(path)
+    jobs = list(jobs)
+    jobs[0] = jobs[0].replace(env={"CI": "1", "MODE": "release"})
+    written = _save(path, name, jobs, source)
+    _name, reloaded, rescanned = _load(path)
+    assert reloaded[0].env == {"CI": "1", "MODE": "release"}
+    assert reloaded[1].name == "Test"
+    assert written.spans == rescanned.spans
+    assert path.read_text().startswith("name: CI\njobs:\n  - name: Build\n")
+
+
+def test_full_dump_when_jobs_are_added_or_file_changed(tmp_path):
+    path = tmp_path / "preset.yaml"
+    path.write_text("name: CI\njobs:\n  - name: Build  # kept only by patches\n")
+    name, jobs, source = _load(path)
+    assert preset_patch.plan_patch(source, name, list(jobs)) == []
+    assert preset_patch.plan_patch(source, name, list(jobs) * 2) is None
+    assert preset_patch.plan_patch(source, "Renamed", list(jobs)) is None
+
+    path.write_text("name: CI\njobs:\n  - name: Build  # edited elsewhere\n")
+    content, _written = preset_patch.render_preset(str(path), name, list(jobs), source)
+    assert isinstance(content, bytes) and b"#" not in content
+
+
+def test_aliases_are_not_patched(tmp_path):
+    path = tmp_path / "preset.yaml"
+    path.write_text(
+        "name: CI\n"
+        "jobs:\n"
+        "  - name: A\n"
+        "    steps: &steps\n"
+        "      - run: make\n"
+        "  - name: B\n"
+        "    steps: *steps\n"
+    )
+    _name, jobs, source = _load(path)
+    assert len(jobs) == 2
+    assert source is None
+
+
+def test_full_dump_spans_match_the_dumped_file(tmp_path):
+    path = tmp_path / "preset.yaml"
+    name, jobs = preset_io.parse_preset({"name": "CI", "jobs": [
+        {"name": "Build", "steps": [{"run": "make"}]},
+        {"name": "Test", "env": {"A": "1"}},
+    ]})
+    written = _save(path, name, jobs, None)
+    _name, _jobs, rescanned = _load(path)
+    assert written.spans == rescanned.spans
+    assert written.columns == rescanned.columns
@@ -0,0 +1,18 @@
+import functools
+import pytest
+
+pytest.importorskip("PyQt5")
+from YamlEditor.profiler import slot_name  # noqa: E402
+
+
+class _Window:
+    def _on_preset_validated(self, task, preset_name):
+        pass
+
+
+def test_partials_are_named_after_their_function():
+    window = _Window()
+    first = functools.partial(window._on_preset_validated, object())
+    second = functools.partial(window._on_preset_validated, object())
+    assert slot_name(first) == slot_name(second) == "_on_preset_validated"
+    assert slot_name(functools.partial(first, "CI")) == "_on_preset_validated"
@@ -0,0 +1,29 @@
+from YamlEditor.job_data import Job
+from YamlEditor.render_cache import RenderCache
+
+
+def _job(name):
+    return Job.from_dict({"name": name, "steps": [{"run": f"echo {name}"}], "env": {"A": "1"}})
+
+
+def test_render_is_cached_per_job_object():
+    cache = RenderCache()
+    job = _job("a")
+    steps_yaml, env_yaml = cache.render(job)
+    assert "echo a" in steps_yaml and "A:" in env_yaml
+    assert cache.render(job) == (steps_yaml, env_yaml)
+    assert (cache.hits, cache.misses) == (1, 1)
+    # An edited job is a new object, rendered afresh
+    edited = job.replace(steps=[{"run": "echo b"}])
+    assert "echo b" in cache.render(edited)[0]
+    cache.discard(job)
+    assert len(cache) == 1
+
+
+def test_eviction_keeps_size_under_bound():
+    cache = RenderCache(max_bytes=1000)
+    jobs = [_job(str(i)) for i in range(20)]
+    for job in jobs:
+        cache.render(job)
+    assert cache.size <= 1000
+    assert 0 < len(cache) < 20
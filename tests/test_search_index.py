@@ -0,0 +1,44 @@
+from YamlEditor import search_index
+from YamlEditor.job_data import Job
+from YamlEditor.search_index import SearchIndex
+
+
+def _index(**presets):
+    index = SearchIndex()
+    for name, jobs in presets.items():
+        index.set_preset(name, jobs)
+    return index
+
+
+def _numbered(n):
+    return [Job.from_dict({"name": f"Job {i}"}) for i in range(n)]
+
+
+def test_prefix_and_whole_token_terms():
+    jobs = [
+        Job.from_dict({"name": "Build", "steps": [{"uses": "actions/checkout@v4"}, {"run": "npm ci"}]}),
+        Job.from_dict({"name": "Builder", "steps": [{"run": "npm install"}]}),
+    ]
+    index = _index(ci=jobs)
+    assert index.match_ids("buil", "ci") == {id(jobs[0]), id(jobs[1])}
+    assert index.match_ids("build npm", "ci") == {id(jobs[0])}
+    assert index.match_ids("uses:actions/checkout", "ci") == {id(jobs[0])}
+    assert index.match_ids("", "ci") is None
+
+
+def test_broad_prefix_matches_whole_tokens(monkeypatch):
+    monkeypatch.setattr(search_index, "MAX_PREFIX_KEYS", 5)
+    jobs = _numbered(30)
+    index = _index(ci=jobs)
+    # "1" starts 11 name tokens (1, 10-19): too many to expand
+    assert index.match_ids("job 1", "ci") == {id(jobs[1])}
+    # A longer prefix starts few enough tokens again
+    assert index.match_ids("job 25", "ci") == {id(jobs[25])}
+    monkeypatch.setattr(search_index, "MAX_PREFIX_KEYS", 512)
+    assert len(index.match_ids("job 1", "ci")) == 11
+
+
+def test_count_skips_the_filtered_preset():
+    index = _index(a=_numbered(3), b=_numbered(2), c=[Job.from_dict({"name": "Lint"})])
+    assert index.count("job") == {"a": 3, "b": 2}
+    assert index.count("job", skip="a") == {"b": 2}
@@ -0,0 +1,35 @@
+from YamlEditor.job_data import Job
+from YamlEditor.step_store import extract_composite_actions
+
+
+def _job(name, **extra):
+    data = {
+        "name": name,
+        "runs-on": "ubuntu-latest",
+        "steps": [
+            {"uses": "actions/checkout@v4"},
+            {"run": "npm ci"},
+            {"run": "npm test"},
+        ],
+    }
+    data.update(extra)
+    return Job.from_dict(data)
+
+
+def test_repeated_steps_become_one_composite_action():
+    jobs, actions = extract_composite_actions([_job("a"), _job("b")], "actions")
+    assert len(actions) == 1
+    (name, action), = actions.items()
+    assert [s.get("shell") for s in action["runs"]["steps"]] == ["bash", "bash"]
+    for job in jobs:
+        assert [s.to_dict() for s in job.steps] == [
+            {"uses": "actions/checkout@v4"}, {"uses": f"./actions/{name}"}
+        ]
+
+
+def test_jobs_with_run_defaults_keep_their_steps():
+    defaults = {"run": {"working-directory": "web", "shell": "sh"}}
+    jobs = [_job("a", defaults=defaults), _job("b", defaults=defaults), _job("c")]
+    new_jobs, actions = extract_composite_actions(jobs, "actions")
+    assert actions == {}
+    assert new_jobs == jobs